@@ -0,0 +1,840 @@
+# AIG_async_runners.py
+# asyncio versions of the runners in AIG_runners.py.
+#
+# Same tiers, same generation strategies (GENERATION_STRATEGY,
+# CANDIDATES_PER_CALL), same output files; the difference is that every LLM
+# call is awaited on one event loop (AsyncOpenAI, AsyncAnthropic, Gemini's
+# *_async methods, httpx.AsyncClient) instead of parking a thread.
+#
+# Responses are not streamed here: STREAM_RESPONSES only applies to the
+# threads backend, so async items carry no TTFT, generation time or
+# tokens/sec.
+
+import asyncio
+import time
+from datetime import datetime
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Optional,
+    Dict,
+    List,
+    Callable,
+    Awaitable,
+    Tuple,
+)
+
+from AIG_clients import LazyImport, AsyncOpenAIClient, AsyncAnthropicClient, GenAI
+from AIG_output import PrintToFileAndScreen, AppendToFile
+from AIG_ratelimit import GetRateLimiter, EstimateTokens, RetryAfterSeconds
+from AIG_retry import (
+    CallWithRetryAsync,
+    RetryableHTTPError,
+    RaiseIfMaybeDelivered,
+    RETRYABLE_STATUS,
+)
+from AIG_hedge import CallWithHedgeAsync
+from AIG_runners import (
+    GetCopilotAuth,
+    ClaudeRequestMessages,
+    ClaudeUsage,
+    GeminiTierModel,
+    GeminiUsage,
+    MessagesText,
+    SampleResult,
+    GPTSampleResults,
+    GPTChatSampleResults,
+    GeminiSampleResults,
+    ClaudeSampleResults,
+    IndependentTierUsage,
+    StartIndependentTier,
+    WriteIndependentCall,
+    WriteIndependentError,
+    FinishIndependentTier,
+)
+from AIG_config import (
+    GPT_MODEL,
+    CLAUDE_MODEL,
+    GEMINI_MODEL,
+    FIRST_ITEM_TEMP,
+    NEXT_ITEM_TEMP,
+    FOLLOWUP_PROMPT,
+    GEMINI_SAFETY_SETTINGS,
+    COPILOT_CHAT_TIMEOUT,
+    TIER_CONCURRENCY,
+    GENERATION_STRATEGY,
+    INDEPENDENT_ITEM_CONCURRENCY,
+    STREAM_RESPONSES,
+)
+
+if TYPE_CHECKING:
+    import httpx
+
+
+# ---------------------------------------------------------------------------
+#  Tier scheduling (shared by all async runners)
+# ---------------------------------------------------------------------------
+
+async def RunTiersAsync(
+    LLM: str,
+    run_tier: Callable[[str, str, str, int, str], Awaitable[None]],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Await run_tier(...) for every tier, with at most TIER_CONCURRENCY[LLM]
+    tiers in flight. Async counterpart of RunTiersConcurrently.
+    """
+    limit = asyncio.Semaphore(max(1, TIER_CONCURRENCY.get(LLM, 1)))
+
+    async def limited(tier_code: str, prompt_text: str, file_name: str) -> None:
+        async with limit:
+            await run_tier(
+                tier_code, prompt_text, file_name, item_per_tier, passage_name
+            )
+
+    await asyncio.gather(
+        *(
+            limited(tier_code, prompt_text, file_name)
+            for tier_code, prompt_text, file_name in tiers
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+#  Rate-limited, retried LLM calls (async counterparts of CallGPT etc.)
+# ---------------------------------------------------------------------------
+
+async def _CallGPTOnceAsync(**kwargs: Any) -> Any:
+    limiter = GetRateLimiter("GPT", GPT_MODEL)
+    estimate = EstimateTokens(kwargs.get("input"))
+    await limiter.AcquireAsync(estimate)
+
+    raw = await AsyncOpenAIClient().responses.with_raw_response.create(**kwargs)
+    limiter.UpdateFromHeaders(raw.headers)
+    response = await raw.parse()
+
+    limiter.RecordUsage(
+        estimate, response.usage.input_tokens, response.usage.output_tokens
+    )
+    return response
+
+
+async def _CallGPTChatOnceAsync(**kwargs: Any) -> Any:
+    limiter = GetRateLimiter("GPT", GPT_MODEL)
+    estimate = EstimateTokens(MessagesText(kwargs["messages"])) * kwargs.get("n", 1)
+    await limiter.AcquireAsync(estimate)
+
+    raw = await AsyncOpenAIClient().chat.completions.with_raw_response.create(**kwargs)
+    limiter.UpdateFromHeaders(raw.headers)
+    completion = await raw.parse()
+
+    limiter.RecordUsage(
+        estimate, completion.usage.prompt_tokens, completion.usage.completion_tokens
+    )
+    return completion
+
+
+async def _CallClaudeOnceAsync(**kwargs: Any) -> Any:
+    limiter = GetRateLimiter("Claude", CLAUDE_MODEL)
+    estimate = EstimateTokens(MessagesText(kwargs["messages"]))
+    await limiter.AcquireAsync(estimate)
+
+    raw = await AsyncAnthropicClient().messages.with_raw_response.create(**kwargs)
+    limiter.UpdateFromHeaders(raw.headers)
+    response = await raw.parse()
+
+    limiter.RecordUsage(
+        estimate, response.usage.input_tokens, response.usage.output_tokens
+    )
+    return response
+
+
+async def _CallGeminiOnceAsync(
+    send: Callable[..., Awaitable[Any]], message: str, **kwargs: Any
+) -> Any:
+    limiter = GetRateLimiter("Gemini", GEMINI_MODEL)
+    estimate = EstimateTokens(message)
+    await limiter.AcquireAsync(estimate)
+
+    response = await send(message, **kwargs)
+
+    in_tokens, out_tokens, _ = GeminiUsage(response)
+    limiter.RecordUsage(estimate, in_tokens, out_tokens)
+    return response
+
+
+async def CallGPTAsync(**kwargs: Any) -> Tuple[Any, int]:
+    return await CallWithRetryAsync(
+        "GPT", GPT_MODEL, CallWithHedgeAsync, "GPT", _CallGPTOnceAsync, **kwargs
+    )
+
+
+async def CallGPTChatAsync(**kwargs: Any) -> Tuple[Any, int]:
+    return await CallWithRetryAsync(
+        "GPT", GPT_MODEL, CallWithHedgeAsync, "GPT", _CallGPTChatOnceAsync, **kwargs
+    )
+
+
+async def CallClaudeAsync(**kwargs: Any) -> Tuple[Any, int]:
+    return await CallWithRetryAsync(
+        "Claude",
+        CLAUDE_MODEL,
+        CallWithHedgeAsync,
+        "Claude",
+        _CallClaudeOnceAsync,
+        **kwargs,
+    )
+
+
+async def CallGeminiAsync(
+    send: Callable[..., Awaitable[Any]], message: str, **kwargs: Any
+) -> Tuple[Any, int]:
+    return await CallWithRetryAsync(
+        "Gemini", GEMINI_MODEL, _CallGeminiOnceAsync, send, message, **kwargs
+    )
+
+
+# ---------------------------------------------------------------------------
+#  Independent-sample strategy (async counterpart of RunIndependentTier)
+# ---------------------------------------------------------------------------
+
+AsyncSampleFn = Callable[[str, float, int, int], Awaitable[List[SampleResult]]]
+
+
+async def _TimedSampleAsync(
+    sample: AsyncSampleFn, prompt_text: str, temp: float, seed: int, count: int
+) -> Tuple[List[SampleResult], float]:
+    start_time = time.time()
+    results = await sample(prompt_text, temp, seed, count)  # LLM call
+    return results, time.time() - start_time
+
+
+async def RunIndependentTierAsync(
+    LLM: str,
+    sample: AsyncSampleFn,
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier independent items for a single tier, with at
+    most INDEPENDENT_ITEM_CONCURRENCY calls in flight; items are written in
+    #1..#N order, as in RunIndependentTier.
+    """
+    calls = StartIndependentTier(LLM, tier_code, file_name, item_per_tier)
+    usage = IndependentTierUsage()
+    limit = asyncio.Semaphore(max(1, INDEPENDENT_ITEM_CONCURRENCY))
+
+    async def limited(temp: float, seed: int, count: int) -> Any:
+        async with limit:
+            return await _TimedSampleAsync(sample, prompt_text, temp, seed, count)
+
+    tasks = [
+        (first, temp, asyncio.ensure_future(limited(temp, seed, count)))
+        for first, count, temp, seed in calls
+    ]
+
+    for first, temp, task in tasks:
+        try:
+            results, elapsed = await task
+        except Exception as e:
+            WriteIndependentError(LLM, tier_code, first, e, file_name)
+            continue
+
+        WriteIndependentCall(
+            LLM,
+            tier_code,
+            first,
+            temp,
+            results,
+            elapsed,
+            file_name,
+            passage_name,
+            usage,
+        )
+
+    FinishIndependentTier(LLM, tier_code, len(calls), usage)
+
+
+def TierFunctionAsync(
+    LLM: str,
+    followup_tier: Callable[[str, str, str, int, str], Awaitable[None]],
+    sample: AsyncSampleFn,
+) -> Callable[[str, str, str, int, str], Awaitable[None]]:
+    """
+    Pick the per-tier coroutine for GENERATION_STRATEGY.
+    """
+    if GENERATION_STRATEGY == "independent":
+        return partial(RunIndependentTierAsync, LLM, sample)
+    return followup_tier
+
+
+# ---------------------------------------------------------------------------
+#  GPT runner
+# ---------------------------------------------------------------------------
+
+async def RunGPTAsync(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Run OpenAI GPT on all tiers using AsyncOpenAI.
+    """
+
+    print("\n\n********************* Starting GPT tiers (async)... ")
+
+    run_tier = TierFunctionAsync("GPT", _RunGPTTierAsync, _GPTSampleAsync)
+    await RunTiersAsync("GPT", run_tier, tiers, item_per_tier, passage_name)
+
+
+async def _GPTSampleAsync(
+    prompt_text: str, temp: float, seed: int, count: int
+) -> List[SampleResult]:
+    """
+    Async counterpart of _GPTSample.
+    """
+    if count == 1:
+        response, retries = await CallGPTAsync(
+            model=GPT_MODEL,
+            input=prompt_text,
+            temperature=temp,
+            store=False,
+        )
+        return GPTSampleResults(response, retries)
+
+    completion, retries = await CallGPTChatAsync(
+        model=GPT_MODEL,
+        messages=[{"role": "user", "content": prompt_text}],
+        temperature=temp,
+        seed=seed,
+        n=count,
+    )
+    return GPTChatSampleResults(completion, retries)
+
+
+async def _RunGPTTierAsync(
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier GPT items for a single tier.
+    """
+
+    # Append a header for this new run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n\n=============== NEW RUN GPT - {timestamp} ===============\n\n",
+    )
+
+    try:
+        # -------- first item generation --------
+        print(f"\n\nGenerating {tier_code} (GPT) #1 (Temp = {FIRST_ITEM_TEMP})...\n")
+
+        start_time = time.time()
+        response, retries = await CallGPTAsync(  # LLM call
+            model=GPT_MODEL,
+            input=prompt_text,
+            temperature=FIRST_ITEM_TEMP,
+            store=item_per_tier > 1,
+        )
+        elapsed = time.time() - start_time
+
+        PrintToFileAndScreen(
+            "GPT",
+            tier_code,
+            1,
+            response.output_text,
+            file_name,
+            passage_name,
+            elapsed,
+            response.usage.input_tokens,
+            response.usage.output_tokens,
+            retries=retries,
+        )
+
+        prev_ID = response.id
+
+        # -------- ITEMS 2..N --------
+        for index in range(2, item_per_tier + 1):
+            is_last = index == item_per_tier
+
+            print(
+                f"\n\nGenerating {tier_code} (GPT) #{index} "
+                f"(Temp = {NEXT_ITEM_TEMP})..."
+            )
+
+            start_time = time.time()
+            response, retries = await CallGPTAsync(  # LLM call
+                model=GPT_MODEL,
+                previous_response_id=prev_ID,
+                input=FOLLOWUP_PROMPT,
+                temperature=NEXT_ITEM_TEMP,
+                store=not is_last,
+            )
+            elapsed = time.time() - start_time
+
+            PrintToFileAndScreen(
+                "GPT",
+                tier_code,
+                index,
+                response.output_text,
+                file_name,
+                passage_name,
+                elapsed,
+                response.usage.input_tokens,
+                response.usage.output_tokens,
+                retries=retries,
+            )
+
+            prev_ID = response.id
+
+    except Exception as e:
+        print(f"An error occurred while processing Tier {tier_code} (GPT): {e}")
+        AppendToFile(
+            file_name,
+            "\n\n========== ERROR ==========\n\n"
+            f"An error occurred while processing this tier (GPT): {e}\n",
+        )
+
+
+# ---------------------------------------------------------------------------
+#  Gemini runner
+# ---------------------------------------------------------------------------
+
+async def RunGeminiAsync(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Run Google's Gemini on all tiers using the SDK's *_async calls.
+    """
+
+    print("\n\n********************* Starting Gemini tiers (async)... ")
+
+    run_tier = TierFunctionAsync("Gemini", _RunGeminiTierAsync, _GeminiSampleAsync)
+    await RunTiersAsync("Gemini", run_tier, tiers, item_per_tier, passage_name)
+
+
+async def _GeminiSampleAsync(
+    prompt_text: str, temp: float, seed: int, count: int
+) -> List[SampleResult]:
+    """
+    Async counterpart of _GeminiSample.
+    """
+    # Cache creation/lookup is a blocking SDK call; keep it off the loop
+    model, first_message, cache_write = await asyncio.to_thread(
+        GeminiTierModel, prompt_text
+    )
+    response, retries = await CallGeminiAsync(
+        model.generate_content_async,
+        first_message,
+        generation_config=GenAI().types.GenerationConfig(
+            temperature=temp, seed=seed, candidate_count=count
+        ),
+        safety_settings=GEMINI_SAFETY_SETTINGS,
+    )
+    return GeminiSampleResults(response, retries, cache_write)
+
+
+async def _RunGeminiTierAsync(
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier Gemini items for a single tier.
+    """
+    try:
+        # Append a header for this new run
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        AppendToFile(
+            file_name,
+            f"\n\n\n=============== NEW RUN (Gemini) - {timestamp} "
+            f"==============="
+            f"\n\n",
+        )
+
+        # Cache creation/lookup is a blocking SDK call; keep it off the loop
+        model, first_message, cache_write = await asyncio.to_thread(
+            GeminiTierModel, prompt_text
+        )
+        chat = model.start_chat(history=[])
+
+        for index in range(1, item_per_tier + 1):
+            temp = FIRST_ITEM_TEMP if index == 1 else NEXT_ITEM_TEMP
+            prompt = first_message if index == 1 else FOLLOWUP_PROMPT
+
+            print(f"Generating {tier_code} (Gemini) #{index} (Temp = {temp})...")
+
+            start_time = time.time()
+            response, retries = await CallGeminiAsync(  # LLM call
+                chat.send_message_async,
+                prompt,
+                generation_config=GenAI().types.GenerationConfig(temperature=temp),
+                safety_settings=GEMINI_SAFETY_SETTINGS,
+            )
+            elapsed = time.time() - start_time
+
+            in_tokens, out_tokens, cache_read = GeminiUsage(response)
+
+            PrintToFileAndScreen(
+                "Gemini",
+                tier_code,
+                index,
+                response.text,
+                file_name,
+                passage_name,
+                elapsed,
+                in_tokens,
+                out_tokens,
+                cache_write_tokens=cache_write if index == 1 else 0,
+                cache_read_tokens=cache_read,
+                retries=retries,
+            )
+
+    except Exception as e:
+        print(f"An error occurred while processing Tier {tier_code} (Gemini): {e}")
+        print("Moving to the next tier.")
+        AppendToFile(
+            file_name,
+            "\n\n========== ERROR ==========\n\n"
+            f"An error occurred: {e}\n",
+        )
+
+
+# ---------------------------------------------------------------------------
+#  Claude runner
+# ---------------------------------------------------------------------------
+
+async def RunClaudeAsync(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Run Anthropic Claude on all tiers using AsyncAnthropic.
+    """
+
+    print("\n\n********************* Starting Claude tiers (async)... ")
+
+    run_tier = TierFunctionAsync("Claude", _RunClaudeTierAsync, _ClaudeSampleAsync)
+    await RunTiersAsync("Claude", run_tier, tiers, item_per_tier, passage_name)
+
+
+async def _ClaudeSampleAsync(
+    prompt_text: str, temp: float, seed: int, count: int
+) -> List[SampleResult]:
+    """
+    Async counterpart of _ClaudeSample (always one item per call).
+    """
+    response, retries = await CallClaudeAsync(
+        model=CLAUDE_MODEL,
+        max_tokens=4096,
+        temperature=temp,
+        messages=ClaudeRequestMessages([{"role": "user", "content": prompt_text}]),
+    )
+    return ClaudeSampleResults(response, retries)
+
+
+async def _RunClaudeTierAsync(
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier Claude items for a single tier.
+    """
+
+    # Append a header for this new run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n\n=============== NEW RUN (Claude) - {timestamp} "
+        f"==============="
+        f"\n\n",
+    )
+
+    try:
+        messages: List[Dict[str, str]] = [{"role": "user", "content": prompt_text}]
+
+        for index in range(1, item_per_tier + 1):
+            temp = FIRST_ITEM_TEMP if index == 1 else NEXT_ITEM_TEMP
+
+            print(f"Generating {tier_code} (Claude) #{index} (Temp = {temp})...")
+
+            if index > 1:
+                messages.append({"role": "user", "content": FOLLOWUP_PROMPT})
+
+            start_time = time.time()
+            response, retries = await CallClaudeAsync(  # LLM call
+                model=CLAUDE_MODEL,
+                max_tokens=4096,
+                temperature=temp,
+                messages=ClaudeRequestMessages(messages),
+            )
+            elapsed = time.time() - start_time
+
+            response_text = response.content[0].text
+            in_tokens, out_tokens, cache_write, cache_read = ClaudeUsage(response)
+
+            PrintToFileAndScreen(
+                "Claude",
+                tier_code,
+                index,
+                response_text,
+                file_name,
+                passage_name,
+                elapsed,
+                in_tokens,
+                out_tokens,
+                cache_write_tokens=cache_write,
+                cache_read_tokens=cache_read,
+                retries=retries,
+            )
+
+            messages.append({"role": "assistant", "content": response_text})
+
+    except Exception as e:
+        print(f"An error occurred while processing Tier {tier_code} (Claude): {e}")
+        AppendToFile(
+            file_name,
+            "\n\n========== ERROR ==========\n\n"
+            f"An error occurred while processing this tier (Claude): {e}\n",
+        )
+
+
+# ---------------------------------------------------------------------------
+#  Copilot runner
+# ---------------------------------------------------------------------------
+
+async def RunCopilotAsync(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Run Microsoft Copilot (via Graph) on all tiers using httpx.AsyncClient.
+    """
+
+    # Signed in and checked by the preflight stage; GetCopilotAuth only
+    # blocks if it has not run yet, so keep it off the event loop
+    auth = await asyncio.to_thread(GetCopilotAuth)
+    if auth is None:
+        print("Skipping Copilot runs: auth initialization failed.")
+        return
+
+    base_url, headers = auth
+
+    httpx = LazyImport("httpx")
+
+    print("\n\n********************* Starting Copilot tiers (async)... ")
+
+    async with httpx.AsyncClient(timeout=COPILOT_CHAT_TIMEOUT) as client:
+
+        async def run_tier(
+            tier_code: str,
+            prompt_text: str,
+            file_name: str,
+            item_per_tier: int,
+            passage_name: str,
+        ) -> None:
+            await _RunCopilotTierAsync(
+                client,
+                base_url,
+                headers,
+                tier_code,
+                prompt_text,
+                file_name,
+                item_per_tier,
+                passage_name,
+            )
+
+        await RunTiersAsync("Copilot", run_tier, tiers, item_per_tier, passage_name)
+
+
+async def _RunCopilotTierAsync(
+    client: "httpx.AsyncClient",
+    base_url: str,
+    headers: Dict[str, str],
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier Copilot items for a single tier, in its own
+    conversation.
+    """
+    conv_resp = await client.post(
+        f"{base_url}/copilot/conversations",
+        headers=headers,
+        json={},
+    )
+    conversation_id = (
+        conv_resp.json().get("id") if conv_resp.status_code == 201 else None
+    )
+    if not conversation_id:
+        print(f"\nERROR creating conversation for tier {tier_code}.")
+        print("Status code:", conv_resp.status_code)
+        print("Raw response:", conv_resp.text)
+        return
+
+    # Header for this run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n=============== NEW RUN (Copilot) - {timestamp}  "
+        f"==============="
+        f"\n\n",
+    )
+
+    async def post_chat(chat_payload: Dict[str, Any]) -> "httpx.Response":
+        limiter = GetRateLimiter("Copilot", "graph")
+        await limiter.AcquireAsync()
+
+        # The server stores every turn it receives, so a timeout after the
+        # request went out must not be retried (it would ask twice)
+        try:
+            chat_resp = await client.post(
+                f"{base_url}/copilot/conversations/{conversation_id}/chat",
+                headers=headers,
+                json=chat_payload,
+            )
+        except Exception as e:
+            RaiseIfMaybeDelivered(e)
+            raise
+
+        # Graph answers throttling with 429 + Retry-After
+        limiter.UpdateFromHeaders(chat_resp.headers)
+
+        if chat_resp.status_code in RETRYABLE_STATUS:
+            raise RetryableHTTPError(
+                chat_resp.status_code,
+                RetryAfterSeconds(chat_resp.headers),
+                chat_resp.text,
+            )
+        return chat_resp
+
+    async def send_chat(prompt: str) -> Tuple[Optional[str], int]:
+        chat_payload = {
+            "message": {"text": prompt},
+            "locationHint": {"timeZone": "America/New_York"},
+        }
+
+        try:
+            chat_resp, retries = await CallWithRetryAsync(
+                "Copilot", "graph", post_chat, chat_payload
+            )
+        except Exception as e:
+            print(f"ERROR during chat send (tier {tier_code}): {e}")
+            return None, 0
+
+        if chat_resp.status_code == 200:
+            messages = chat_resp.json().get("messages")
+            if not messages:
+                print(f"ERROR: No messages returned (tier {tier_code}).")
+                print("Raw JSON:", chat_resp.text)
+                return None, retries
+            return messages[-1].get("text", ""), retries
+
+        print(f"ERROR during chat send (tier {tier_code}).")
+        print("Status:", chat_resp.status_code)
+        print("Raw JSON:", chat_resp.text)
+        return None, retries
+
+    for index in range(1, item_per_tier + 1):
+        print(f"Generating {tier_code} (Copilot) #{index}...")
+
+        start_time = time.time()
+        prompt = prompt_text if index == 1 else FOLLOWUP_PROMPT
+        text, retries = await send_chat(prompt)
+        elapsed = time.time() - start_time
+
+        if text is None:
+            print(f"Stopping tier {tier_code} after #{index-1} due to chat error.")
+            break
+
+        PrintToFileAndScreen(
+            "Copilot",
+            tier_code,
+            index,
+            text,
+            file_name,
+            passage_name,
+            elapsed,
+            0,
+            0,
+            retries=retries,
+        )
+
+
+# ---------------------------------------------------------------------------
+#  Cross-LLM scheduling
+# ---------------------------------------------------------------------------
+
+ASYNC_LLM_RUNNERS: Dict[
+    str, Callable[[List[tuple[str, str, str]], int, str], Awaitable[None]]
+] = {
+    "GPT": RunGPTAsync,
+    "Gemini": RunGeminiAsync,
+    "Claude": RunClaudeAsync,
+    "Copilot": RunCopilotAsync,
+}
+
+
+async def _RunSelectedLLMsAsync(
+    LLMs_selected: List[str],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    selected = [name for name in ASYNC_LLM_RUNNERS if name in LLMs_selected]
+
+    results = await asyncio.gather(
+        *(
+            ASYNC_LLM_RUNNERS[name](tiers, item_per_tier, passage_name)
+            for name in selected
+        ),
+        return_exceptions=True,
+    )
+
+    for name, result in zip(selected, results):
+        if isinstance(result, Exception):
+            print(f"{name} run stopped with an unexpected error: {result}")
+
+
+def RunSelectedLLMsAsync(
+    LLMs_selected: List[str],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Drop-in replacement for RunSelectedLLMs that runs everything on a single
+    asyncio event loop. Responses are not streamed.
+    """
+    if STREAM_RESPONSES:
+        print(
+            "Note: the asyncio backend does not stream responses; "
+            "STREAM_RESPONSES is ignored and items are logged without TTFT, "
+            "generation time or tokens/sec."
+        )
+    asyncio.run(
+        _RunSelectedLLMsAsync(LLMs_selected, tiers, item_per_tier, passage_name)
+    )
@@ -0,0 +1,522 @@
+# AIG_batch.py
+# Offline batch mode: submit the whole tier x item matrix as one OpenAI Batch
+# and one Anthropic Message Batch, poll until they finish, then write every
+# item back through PrintToFileAndScreen exactly like a live run.
+#
+# Batch requests cannot see each other's answers, so every item is an
+# independent sample of its tier prompt rather than a follow-up in a
+# conversation, with the temperature (and, for GPT, the seed) the
+# independent strategy would give it (see IndependentSampleSettings). GPT
+# batches go to /v1/chat/completions, since the Responses API takes no seed.
+#
+# Submitted batches are saved in BATCH_PENDING_FILE until their results are
+# written, so a restart during the 24-hour window does not lose them: the
+# next batch run picks them up, or python AIG_batch.py collects them alone.
+#
+# The clients come from AIG_clients and honor OPENAI_BASE_URL and
+# ANTHROPIC_BASE_URL, so a local stand-in server can play either provider
+# (see AIG_batch_standin.py).
+
+import io
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from AIG_output import PrintToFileAndScreen, AppendToFile
+from AIG_retry import CallWithRetry
+from AIG_clients import OpenAIClient, AnthropicClient
+from AIG_runners import (
+    ClaudeRequestMessages,
+    ClaudeUsage,
+    IndependentSampleSettings,
+)
+from AIG_config import (
+    GPT_MODEL,
+    CLAUDE_MODEL,
+    BATCH_POLL_SECONDS,
+    BATCH_LLMS,
+    BATCH_PENDING_FILE,
+)
+
+# Terminal states of an OpenAI batch (Anthropic just reports "ended")
+_OPENAI_DONE = {"completed", "failed", "expired", "cancelled"}
+
+
+# ---------------------------------------------------------------------------
+#  Request matrix
+# ---------------------------------------------------------------------------
+
+def BatchCustomID(tier_code: str, index: int) -> str:
+    """
+    ID that ties a batch result back to its tier and item number.
+    """
+    return f"tier-{tier_code}-item-{index}"
+
+
+def ParseBatchCustomID(custom_id: str) -> Tuple[str, int]:
+    """
+    Inverse of BatchCustomID: return (tier_code, index). Tier codes may
+    contain "-" themselves.
+    """
+    prefix, index = custom_id.rsplit("-item-", 1)
+    return prefix[len("tier-"):], int(index)
+
+
+def BuildBatchMatrix(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+) -> List[Tuple[str, str, float, int]]:
+    """
+    Expand the tiers into (custom_id, prompt_text, temperature, seed) rows,
+    one per item to generate.
+    """
+    rows: List[Tuple[str, str, float, int]] = []
+    for tier_code, prompt_text, _ in tiers:
+        for index in range(1, item_per_tier + 1):
+            temp, seed = IndependentSampleSettings(index)
+            rows.append((BatchCustomID(tier_code, index), prompt_text, temp, seed))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+#  OpenAI Batch API
+# ---------------------------------------------------------------------------
+
+def SubmitGPTBatch(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+) -> str:
+    """
+    Upload the request matrix as a JSONL file and start an OpenAI batch
+    against /v1/chat/completions. Returns the batch ID.
+    """
+    lines = [
+        json.dumps(
+            {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": GPT_MODEL,
+                    "messages": [{"role": "user", "content": prompt_text}],
+                    "temperature": temp,
+                    "seed": seed,
+                },
+            }
+        )
+        for custom_id, prompt_text, temp, seed in BuildBatchMatrix(tiers, item_per_tier)
+    ]
+
+    batch_file = OpenAIClient().files.create(
+        file=("AIG_batch.jsonl", io.BytesIO("\n".join(lines).encode("utf-8"))),
+        purpose="batch",
+    )
+
+    batch = OpenAIClient().batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def PollGPTBatch(batch_id: str) -> Optional[Any]:
+    """
+    Return the batch once it has reached a terminal state, or None while it
+    is still running.
+    """
+    batch = OpenAIClient().batches.retrieve(batch_id)
+    return batch if batch.status in _OPENAI_DONE else None
+
+
+def GPTBatchResults(batch: Any) -> List[Tuple[str, Optional[str], int, int, str]]:
+    """
+    Download a finished OpenAI batch and return
+    (custom_id, text, input_tokens, output_tokens, error) per request.
+    text is None when that request failed.
+    """
+    results: List[Tuple[str, Optional[str], int, int, str]] = []
+
+    # A failed batch (e.g. an invalid input file) has no output file, only
+    # batch-level errors; an expired one may have partial output
+    if batch.status != "completed":
+        errors = (batch.errors.data if batch.errors else None) or []
+        details = "; ".join(
+            f"{e.code}: {e.message}" + (f" (line {e.line})" if e.line else "")
+            for e in errors
+        )
+        print(f"OpenAI batch {batch.id} {batch.status}: {details or 'no error details'}")
+
+    if batch.output_file_id:
+        raw = OpenAIClient().files.content(batch.output_file_id).text
+        for line in raw.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+
+            if response.get("status_code") != 200:
+                results.append(
+                    (record["custom_id"], None, 0, 0, json.dumps(body or record))
+                )
+                continue
+
+            choices = body.get("choices") or [{}]
+            text = (choices[0].get("message") or {}).get("content") or ""
+            usage = body.get("usage") or {}
+            results.append(
+                (
+                    record["custom_id"],
+                    text,
+                    usage.get("prompt_tokens", 0),
+                    usage.get("completion_tokens", 0),
+                    "",
+                )
+            )
+
+    if batch.error_file_id:
+        raw = OpenAIClient().files.content(batch.error_file_id).text
+        failed = 0
+        for line in raw.splitlines():
+            if line.strip():
+                record = json.loads(line)
+                body = (record.get("response") or {}).get("body") or {}
+                error = record.get("error") or body.get("error") or record
+                results.append((record["custom_id"], None, 0, 0, json.dumps(error)))
+                failed += 1
+        print(
+            f"{failed} requests in OpenAI batch {batch.id} failed "
+            f"(error file {batch.error_file_id})."
+        )
+
+    return results
+
+
+# ---------------------------------------------------------------------------
+#  Anthropic Message Batches API
+# ---------------------------------------------------------------------------
+
+def SubmitClaudeBatch(
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+) -> str:
+    """
+    Start an Anthropic message batch for the request matrix. Returns the
+    batch ID.
+    """
+    requests = [
+        {
+            "custom_id": custom_id,
+            "params": {
+                "model": CLAUDE_MODEL,
+                "max_tokens": 4096,
+                "temperature": temp,
+                # Every item of a tier shares its prompt, so cache it
+                "messages": ClaudeRequestMessages(
+                    [{"role": "user", "content": prompt_text}]
+                ),
+            },
+        }
+        # The Messages API takes no seed; the temperature schedule still varies
+        for custom_id, prompt_text, temp, _ in BuildBatchMatrix(tiers, item_per_tier)
+    ]
+
+    batch = AnthropicClient().messages.batches.create(requests=requests)
+    return batch.id
+
+
+def PollClaudeBatch(batch_id: str) -> Optional[Any]:
+    """
+    Return the batch once processing has ended, or None while it is still
+    running.
+    """
+    batch = AnthropicClient().messages.batches.retrieve(batch_id)
+    return batch if batch.processing_status == "ended" else None
+
+
+def ClaudeBatchResults(batch: Any) -> List[Tuple[str, Optional[str], int, int, str]]:
+    """
+    Stream the results of a finished Anthropic batch and return
+    (custom_id, text, input_tokens, output_tokens, error) per request.
+    """
+    results: List[Tuple[str, Optional[str], int, int, str]] = []
+
+    for entry in AnthropicClient().messages.batches.results(batch.id):
+        if entry.result.type != "succeeded":
+            results.append((entry.custom_id, None, 0, 0, str(entry.result)))
+            continue
+
+        message = entry.result.message
+        in_tokens, out_tokens, _, _ = ClaudeUsage(message)
+        results.append(
+            (entry.custom_id, message.content[0].text, in_tokens, out_tokens, "")
+        )
+
+    return results
+
+
+# ---------------------------------------------------------------------------
+#  Pending batches
+# ---------------------------------------------------------------------------
+
+# Absolute, because AIG_main chdirs into the standard's directory
+_PENDING_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), BATCH_PENDING_FILE
+)
+
+
+def LoadPendingBatches() -> Dict[str, Dict[str, Any]]:
+    """
+    Batches submitted but not yet written back, by batch ID.
+    """
+    try:
+        with open(_PENDING_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _SavePendingBatches(pending: Dict[str, Dict[str, Any]]) -> None:
+    temp_path = _PENDING_PATH + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(pending, f, indent=2)
+    os.replace(temp_path, _PENDING_PATH)
+
+
+def SavePendingBatch(
+    batch_id: str,
+    LLM: str,
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Record a submitted batch with what writing its results back needs (tier
+    files as absolute paths, so any working directory will do).
+    """
+    pending = LoadPendingBatches()
+    pending[batch_id] = {
+        "llm": LLM,
+        "passage": passage_name,
+        "item_per_tier": item_per_tier,
+        "tiers": [
+            [tier_code, os.path.abspath(file_name)] for tier_code, _, file_name in tiers
+        ],
+        "submitted": datetime.now().isoformat(timespec="seconds"),
+    }
+    _SavePendingBatches(pending)
+
+
+def ForgetPendingBatch(batch_id: str) -> None:
+    pending = LoadPendingBatches()
+    if pending.pop(batch_id, None) is not None:
+        _SavePendingBatches(pending)
+
+
+# ---------------------------------------------------------------------------
+#  Writing results back
+# ---------------------------------------------------------------------------
+
+def MissingBatchResults(
+    results: List[Tuple[str, Optional[str], int, int, str]],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+) -> List[Tuple[str, Optional[str], int, int, str]]:
+    """
+    Failure entries for the requested items a batch returned nothing for
+    (e.g. when the whole batch failed), so none goes unreported.
+    """
+    returned = {result[0] for result in results}
+    missing: List[Tuple[str, Optional[str], int, int, str]] = []
+    for tier_code, _, _ in tiers:
+        for index in range(1, item_per_tier + 1):
+            custom_id = BatchCustomID(tier_code, index)
+            if custom_id not in returned:
+                missing.append((custom_id, None, 0, 0, "no result returned by the batch"))
+    return missing
+
+
+def WriteBatchResults(
+    LLM: str,
+    batch_id: str,
+    results: List[Tuple[str, Optional[str], int, int, str]],
+    tiers: List[tuple[str, str, str]],
+    passage_name: str,
+) -> None:
+    """
+    Append batch results to the tier files in tier and item order, in the
+    same format as a live run.
+    """
+    by_tier: Dict[str, List[Tuple[int, Optional[str], int, int, str]]] = {}
+    for custom_id, text, in_tokens, out_tokens, error in results:
+        tier_code, index = ParseBatchCustomID(custom_id)
+        by_tier.setdefault(tier_code, []).append(
+            (index, text, in_tokens, out_tokens, error)
+        )
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    for tier_code, _, file_name in tiers:
+        if tier_code not in by_tier:
+            continue
+
+        AppendToFile(
+            file_name,
+            f"\n\n\n=============== NEW RUN ({LLM} batch {batch_id}) - "
+            f"{timestamp} ===============\n\n",
+        )
+
+        for index, text, in_tokens, out_tokens, error in sorted(by_tier[tier_code]):
+            if text is None:
+                print(f"Batch request failed for Tier {tier_code} ({LLM}) #{index}.")
+                AppendToFile(
+                    file_name,
+                    "\n\n========== ERROR ==========\n\n"
+                    f"Batch request #{index} failed ({LLM}): {error}\n",
+                )
+                continue
+
+            # Batch items have no per-call latency, so elapsed is logged as
+            # unknown (N/A) rather than 0, which would skew the percentiles
+            temp, _ = IndependentSampleSettings(index)
+            PrintToFileAndScreen(
+                LLM,
+                tier_code,
+                index,
+                text,
+                file_name,
+                passage_name,
+                None,
+                in_tokens,
+                out_tokens,
+                temperature=temp,
+            )
+
+
+# ---------------------------------------------------------------------------
+#  Batch runner
+# ---------------------------------------------------------------------------
+
+_BATCH_APIS = {
+    "GPT": (GPT_MODEL, SubmitGPTBatch, PollGPTBatch, GPTBatchResults),
+    "Claude": (CLAUDE_MODEL, SubmitClaudeBatch, PollClaudeBatch, ClaudeBatchResults),
+}
+
+
+def WaitForBatches(
+    pending: Dict[str, Dict[str, Any]],
+    poll_seconds: float = BATCH_POLL_SECONDS,
+) -> None:
+    """
+    Poll pending batches (as saved by SavePendingBatch) every poll_seconds
+    and write each batch's items as soon as it finishes; it is then no
+    longer pending. Stopping early (Ctrl+C), or failing to download, leaves
+    batches saved for python AIG_batch.py.
+    """
+    pending = dict(pending)
+
+    try:
+        while pending:
+            for batch_id, info in list(pending.items()):
+                name = info["llm"]
+                model, _, poll, collect = _BATCH_APIS[name]
+                try:
+                    batch = poll(batch_id)
+                except Exception as e:
+                    print(f"Could not poll {name} batch {batch_id} (will retry): {e}")
+                    continue
+
+                if batch is None:
+                    continue
+
+                del pending[batch_id]
+                waited = datetime.now() - datetime.fromisoformat(info["submitted"])
+                minutes = waited.total_seconds() / 60
+                print(f"\n{name} batch {batch_id} finished after {minutes:.1f} min.")
+
+                try:
+                    results, _ = CallWithRetry(name, model, collect, batch)
+                except Exception as e:
+                    print(f"Could not download {name} batch {batch_id} results: {e}")
+                    print("It stays pending; collect it later with python AIG_batch.py.")
+                    continue
+
+                tiers = [(tier_code, "", file_name) for tier_code, file_name in info["tiers"]]
+                results += MissingBatchResults(results, tiers, info["item_per_tier"])
+                WriteBatchResults(name, batch_id, results, tiers, info["passage"])
+                ForgetPendingBatch(batch_id)
+
+            if pending:
+                waiting = ", ".join(f"{info['llm']} {b}" for b, info in pending.items())
+                print(f"Still waiting on: {waiting}")
+                time.sleep(poll_seconds)
+
+    except KeyboardInterrupt:
+        print(
+            f"\nStopped waiting; {len(pending)} batch(es) still pending. "
+            "Collect them later with python AIG_batch.py."
+        )
+
+
+def RunSelectedLLMsBatch(
+    LLMs_selected: List[str],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+    poll_seconds: float = BATCH_POLL_SECONDS,
+) -> None:
+    """
+    Submit one batch per selected batch-capable LLM, save each as pending,
+    then wait for them and for any batches still pending from earlier runs.
+    """
+    for name in LLMs_selected:
+        if name not in BATCH_LLMS:
+            print(f"{name} has no batch API; skipping it in batch mode.")
+
+    earlier = len(LoadPendingBatches())
+
+    for name in BATCH_LLMS:
+        if name not in LLMs_selected:
+            continue
+
+        model, submit, _, _ = _BATCH_APIS[name]
+        try:
+            batch_id, _ = CallWithRetry(name, model, submit, tiers, item_per_tier)
+        except Exception as e:
+            print(f"{name} batch submission failed: {e}")
+            continue
+
+        SavePendingBatch(batch_id, name, tiers, item_per_tier, passage_name)
+        print(
+            f"\nSubmitted {name} batch {batch_id} "
+            f"({len(tiers) * item_per_tier} requests)."
+        )
+
+    if earlier:
+        print(f"Also collecting {earlier} batch(es) submitted in earlier runs.")
+
+    WaitForBatches(LoadPendingBatches(), poll_seconds)
+
+
+def CollectPendingBatches(poll_seconds: float = BATCH_POLL_SECONDS) -> None:
+    """
+    Wait for every saved pending batch and write its items back, without
+    submitting anything (e.g. after a restart during the 24-hour window).
+    """
+    pending = LoadPendingBatches()
+    if not pending:
+        print("No pending batches.")
+        return
+
+    print(f"Collecting {len(pending)} pending batch(es):")
+    for batch_id, info in pending.items():
+        print(f"  {info['llm']} {batch_id} (submitted {info['submitted']}, {info['passage']})")
+
+    WaitForBatches(pending, poll_seconds)
+
+
+if __name__ == "__main__":
+    CollectPendingBatches()
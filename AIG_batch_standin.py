@@ -0,0 +1,511 @@
+# AIG_batch_standin.py
+# A local stand-in for the OpenAI Batch and Anthropic Message Batches APIs,
+# so batch mode's submit / poll / results path can be exercised without API
+# keys or cost. Every batch reports "in progress" on its first poll and is
+# finished on the next, with a canned item per request.
+#
+#   python AIG_batch_standin.py             serve on 127.0.0.1:8765; point
+#                                           AIG_main.py at it with the
+#                                           environment variables it prints
+#   python AIG_batch_standin.py --selftest  run batch mode against it in a
+#                                           temporary folder and check the
+#                                           tier files it writes
+#
+# --gpt-outcome failed|expired and --claude-outcome errored|expired make
+# every batch end that way instead, to see how failures are reported.
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_PORT = 8765
+
+
+# ---------------------------------------------------------------------------
+#  Canned results
+# ---------------------------------------------------------------------------
+
+def StandinItem(custom_id: str) -> str:
+    """
+    A small, unique multiple-choice item for one batch request.
+    """
+    return (
+        f"Item: stand-in item for {custom_id}\n\n"
+        f"Question: Which detail best supports the central idea ({custom_id})?\n"
+        "A. The first detail\n"
+        "B. The second detail\n"
+        "C. The third detail\n"
+        "D. The fourth detail\n\n"
+        "Correct answer: A"
+    )
+
+
+def _Now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _IsoTime(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StandinState:
+    """
+    Files and batches the stand-in has been given, and how batches end.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.files: Dict[str, bytes] = {}
+        self.openai_batches: Dict[str, Dict[str, Any]] = {}
+        self.claude_batches: Dict[str, Dict[str, Any]] = {}
+        self.claude_results: Dict[str, bytes] = {}
+        self.requests: Dict[str, List[Dict[str, Any]]] = {}
+        self.polls: Dict[str, int] = {}
+        self.outcomes = {"GPT": "completed", "Claude": "succeeded"}
+        self.next_id = 0
+
+    def NewID(self, prefix: str) -> str:
+        self.next_id += 1
+        return f"{prefix}_standin{self.next_id:04d}"
+
+
+# ---------------------------------------------------------------------------
+#  OpenAI Batch API (/v1/files, /v1/batches)
+# ---------------------------------------------------------------------------
+
+def _UploadedFile(content_type: str, body: bytes) -> bytes:
+    """
+    The "file" part of a multipart/form-data upload.
+    """
+    boundary = content_type.split("boundary=", 1)[1].strip('"').encode()
+    for part in body.split(b"--" + boundary):
+        headers, _, content = part.partition(b"\r\n\r\n")
+        if b'name="file"' in headers:
+            return content[:-2] if content.endswith(b"\r\n") else content
+    return b""
+
+
+def _FinishOpenAIBatch(state: StandinState, batch: Dict[str, Any]) -> None:
+    """
+    End an OpenAI batch the way state.outcomes["GPT"] says.
+    """
+    outcome = state.outcomes["GPT"]
+    requests = state.requests[batch["id"]]
+    now = int(time.time())
+
+    if outcome == "failed":
+        batch.update(
+            status="failed",
+            failed_at=now,
+            errors={
+                "object": "list",
+                "data": [
+                    {
+                        "code": "invalid_request",
+                        "message": "Stand-in rejected the batch input file.",
+                        "param": None,
+                        "line": 1,
+                    }
+                ],
+            },
+        )
+        batch["request_counts"]["failed"] = len(requests)
+        return
+
+    # An expired batch only got through the first half of its requests
+    done = len(requests) if outcome == "completed" else len(requests) // 2
+    output_lines, error_lines = [], []
+    for number, request in enumerate(requests):
+        custom_id = request["custom_id"]
+        if number < done:
+            text = StandinItem(custom_id)
+            body = {
+                "id": f"chatcmpl_{number}",
+                "object": "chat.completion",
+                "model": request["body"]["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1000,
+                    "completion_tokens": len(text.split()),
+                    "total_tokens": 1000 + len(text.split()),
+                },
+            }
+            output_lines.append(
+                {
+                    "id": f"batch_req_{number}",
+                    "custom_id": custom_id,
+                    "response": {"status_code": 200, "request_id": f"req_{number}", "body": body},
+                    "error": None,
+                }
+            )
+        else:
+            error_lines.append(
+                {
+                    "id": f"batch_req_{number}",
+                    "custom_id": custom_id,
+                    "response": None,
+                    "error": {
+                        "code": "batch_expired",
+                        "message": "This request could not be executed before the completion window expired.",
+                    },
+                }
+            )
+
+    for key, lines in (("output_file_id", output_lines), ("error_file_id", error_lines)):
+        if lines:
+            file_id = state.NewID("file")
+            state.files[file_id] = "\n".join(json.dumps(line) for line in lines).encode("utf-8")
+            batch[key] = file_id
+
+    batch["status"] = outcome
+    batch[f"{outcome}_at"] = now
+    batch["request_counts"]["completed"] = len(output_lines)
+    batch["request_counts"]["failed"] = len(error_lines)
+
+
+# ---------------------------------------------------------------------------
+#  Anthropic Message Batches API (/v1/messages/batches)
+# ---------------------------------------------------------------------------
+
+def _ClaudeResult(custom_id: str, params: Dict[str, Any], outcome: str) -> Dict[str, Any]:
+    if outcome == "errored":
+        result: Dict[str, Any] = {
+            "type": "errored",
+            "error": {
+                "type": "error",
+                "error": {"type": "invalid_request_error", "message": "Stand-in rejected this request."},
+            },
+        }
+    elif outcome == "expired":
+        result = {"type": "expired"}
+    else:
+        text = StandinItem(custom_id)
+        result = {
+            "type": "succeeded",
+            "message": {
+                "id": f"msg_{custom_id}",
+                "type": "message",
+                "role": "assistant",
+                "model": params["model"],
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": 50,
+                    "cache_creation_input_tokens": 0,
+                    "cache_read_input_tokens": 950,
+                    "output_tokens": len(text.split()),
+                },
+            },
+        }
+    return {"custom_id": custom_id, "result": result}
+
+
+def _FinishClaudeBatch(state: StandinState, batch: Dict[str, Any], base_url: str) -> None:
+    outcome = state.outcomes["Claude"]
+    lines = [
+        _ClaudeResult(request["custom_id"], request["params"], outcome)
+        for request in state.requests[batch["id"]]
+    ]
+    state.claude_results[batch["id"]] = "\n".join(json.dumps(line) for line in lines).encode("utf-8")
+
+    counts = batch["request_counts"]
+    counts[outcome] = counts.pop("processing")
+    counts["processing"] = 0
+    batch.update(
+        processing_status="ended",
+        ended_at=_IsoTime(_Now()),
+        results_url=f"{base_url}/v1/messages/batches/{batch['id']}/results",
+    )
+
+
+# ---------------------------------------------------------------------------
+#  HTTP server
+# ---------------------------------------------------------------------------
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    Routes the handful of endpoints batch mode uses.
+    """
+
+    server: "StandinServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _Send(self, status: int, payload: Any, content_type: str = "application/json") -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _NotFound(self) -> None:
+        self._Send(404, {"error": {"type": "not_found_error", "message": f"No route for {self.path}"}})
+
+    def _Body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def do_POST(self) -> None:
+        state = self.server.state
+        path = self.path.split("?")[0]
+        body = self._Body()
+
+        with state.lock:
+            if path == "/v1/files":
+                file_id = state.NewID("file")
+                state.files[file_id] = _UploadedFile(self.headers["Content-Type"], body)
+                self._Send(
+                    200,
+                    {
+                        "id": file_id,
+                        "object": "file",
+                        "bytes": len(state.files[file_id]),
+                        "created_at": int(time.time()),
+                        "filename": "AIG_batch.jsonl",
+                        "purpose": "batch",
+                        "status": "processed",
+                    },
+                )
+
+            elif path == "/v1/batches":
+                params = json.loads(body)
+                lines = state.files[params["input_file_id"]].decode("utf-8").splitlines()
+                batch_id = state.NewID("batch")
+                state.requests[batch_id] = [json.loads(line) for line in lines if line.strip()]
+                state.openai_batches[batch_id] = {
+                    "id": batch_id,
+                    "object": "batch",
+                    "endpoint": params["endpoint"],
+                    "errors": None,
+                    "input_file_id": params["input_file_id"],
+                    "completion_window": params["completion_window"],
+                    "status": "in_progress",
+                    "output_file_id": None,
+                    "error_file_id": None,
+                    "created_at": int(time.time()),
+                    "request_counts": {"total": len(state.requests[batch_id]), "completed": 0, "failed": 0},
+                }
+                self._Send(200, state.openai_batches[batch_id])
+
+            elif path == "/v1/messages/batches":
+                params = json.loads(body)
+                batch_id = state.NewID("msgbatch")
+                state.requests[batch_id] = params["requests"]
+                created = _Now()
+                state.claude_batches[batch_id] = {
+                    "id": batch_id,
+                    "type": "message_batch",
+                    "processing_status": "in_progress",
+                    "request_counts": {
+                        "processing": len(params["requests"]),
+                        "succeeded": 0,
+                        "errored": 0,
+                        "canceled": 0,
+                        "expired": 0,
+                    },
+                    "created_at": _IsoTime(created),
+                    "expires_at": _IsoTime(created + timedelta(hours=24)),
+                    "ended_at": None,
+                    "archived_at": None,
+                    "cancel_initiated_at": None,
+                    "results_url": None,
+                }
+                self._Send(200, state.claude_batches[batch_id])
+
+            else:
+                self._NotFound()
+
+    def do_GET(self) -> None:
+        state = self.server.state
+        parts = self.path.split("?")[0].strip("/").split("/")
+
+        with state.lock:
+            # /v1/batches/{id}: in progress on the first poll, done after
+            if parts[:2] == ["v1", "batches"] and len(parts) == 3:
+                batch = state.openai_batches.get(parts[2])
+                if batch is None:
+                    return self._NotFound()
+                state.polls[batch["id"]] = state.polls.get(batch["id"], 0) + 1
+                if batch["status"] == "in_progress" and state.polls[batch["id"]] > 1:
+                    _FinishOpenAIBatch(state, batch)
+                self._Send(200, batch)
+
+            # /v1/files/{id}/content
+            elif parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content":
+                content = state.files.get(parts[2])
+                if content is None:
+                    return self._NotFound()
+                self._Send(200, content, "application/octet-stream")
+
+            # /v1/messages/batches/{id} and .../{id}/results
+            elif parts[:3] == ["v1", "messages", "batches"] and len(parts) in (4, 5):
+                batch = state.claude_batches.get(parts[3])
+                if batch is None:
+                    return self._NotFound()
+                if len(parts) == 5:
+                    self._Send(200, state.claude_results[batch["id"]], "application/binary")
+                    return
+                state.polls[batch["id"]] = state.polls.get(batch["id"], 0) + 1
+                if batch["processing_status"] == "in_progress" and state.polls[batch["id"]] > 1:
+                    _FinishClaudeBatch(state, batch, f"http://{self.headers['Host']}")
+                self._Send(200, batch)
+
+            else:
+                self._NotFound()
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, verbose: bool = False) -> None:
+        super().__init__(("127.0.0.1", port), StandinHandler)
+        self.state = StandinState()
+        self.verbose = verbose
+
+    def Environment(self) -> Dict[str, str]:
+        """
+        Environment variables that point the OpenAI and Anthropic SDKs here.
+        """
+        base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        return {
+            "OPENAI_BASE_URL": f"{base_url}/v1",
+            "OPENAI_API_KEY": "standin",
+            "ANTHROPIC_BASE_URL": base_url,
+            "ANTHROPIC_API_KEY": "standin",
+        }
+
+
+# ---------------------------------------------------------------------------
+#  Self-test
+# ---------------------------------------------------------------------------
+
+def _CountInFiles(tiers: List[Tuple[str, str, str]], marker: str) -> int:
+    total = 0
+    for _, _, file_name in tiers:
+        if os.path.isfile(file_name):
+            with open(file_name, "r", encoding="utf-8") as f:
+                total += f.read().count(marker)
+    return total
+
+
+def SelfTest() -> bool:
+    """
+    Run batch mode against a stand-in on a free port, in a temporary folder,
+    and check the items and errors it writes. Returns True if all passed.
+    """
+    server = StandinServer(0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ.update(server.Environment())
+
+    # Imported after the environment is set, since clients are built once
+    import AIG_batch
+
+    start_dir = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="aig_batch_standin_")
+    os.chdir(work_dir)
+    # Keep the real pending-batch list out of it
+    AIG_batch._PENDING_PATH = os.path.join(work_dir, "pending_batches.json")
+
+    tiers = [
+        (tier_code, f"Stand-in prompt for tier {tier_code}.", f"Tier {tier_code} Item Output.txt")
+        # "2-b" checks that tier codes containing "-" survive the custom IDs
+        for tier_code in ("1a", "2-b")
+    ]
+    items_per_tier = 2
+    passage = "Stand-in Passage.txt"
+    new_item = "================= NEW ITEM ================="
+    error_block = "========== ERROR =========="
+    results: List[Tuple[str, bool]] = []
+
+    def Check(name: str, passed: bool) -> None:
+        results.append((name, passed))
+
+    try:
+        # Submit, poll and collect both LLMs
+        AIG_batch.RunSelectedLLMsBatch(["GPT", "Claude"], tiers, items_per_tier, passage, poll_seconds=0.1)
+        Check("GPT and Claude items written", _CountInFiles(tiers, new_item) == 2 * len(tiers) * items_per_tier)
+        Check("elapsed logged as unknown", _CountInFiles(tiers, "(N/A secs)") == 2 * len(tiers) * items_per_tier)
+        settings = [
+            (request["body"]["temperature"], request["body"]["seed"])
+            for requests in server.state.requests.values()
+            for request in requests
+            if "body" in request
+        ]
+        Check("GPT items sampled with their own temperature and seed", len(set(settings)) == items_per_tier)
+        Check("nothing left pending", AIG_batch.LoadPendingBatches() == {})
+
+        # Submit, "restart", and collect the saved batch
+        batch_id = AIG_batch.SubmitGPTBatch(tiers, items_per_tier)
+        AIG_batch.SavePendingBatch(batch_id, "GPT", tiers, items_per_tier, passage)
+        Check("batch saved as pending", batch_id in AIG_batch.LoadPendingBatches())
+        AIG_batch.CollectPendingBatches(poll_seconds=0.1)
+        Check("pending batch collected", _CountInFiles(tiers, new_item) == 3 * len(tiers) * items_per_tier)
+        Check("collected batch forgotten", AIG_batch.LoadPendingBatches() == {})
+
+        # A failed batch writes an error for every request
+        server.state.outcomes["GPT"] = "failed"
+        AIG_batch.RunSelectedLLMsBatch(["GPT"], tiers, items_per_tier, passage, poll_seconds=0.1)
+        Check("failed batch reported per request", _CountInFiles(tiers, error_block) == len(tiers) * items_per_tier)
+
+        # An expired batch writes what finished and reports the rest
+        server.state.outcomes["GPT"] = "expired"
+        AIG_batch.RunSelectedLLMsBatch(["GPT"], tiers, items_per_tier, passage, poll_seconds=0.1)
+        half = len(tiers) * items_per_tier // 2
+        Check("expired batch: finished items written", _CountInFiles(tiers, new_item) == 3 * len(tiers) * items_per_tier + half)
+        Check("expired batch: the rest reported", _CountInFiles(tiers, error_block) == len(tiers) * items_per_tier + half)
+
+    finally:
+        os.chdir(start_dir)
+        server.shutdown()
+
+    print("\n" + "═" * 45)
+    print("   Batch Stand-in Self-Test")
+    print("═" * 45)
+    for name, passed in results:
+        print(f"  {'PASS' if passed else 'FAIL'}  {name}")
+    print(f"  Tier files: {work_dir}")
+    print("═" * 45)
+    return all(passed for _, passed in results)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI and Anthropic batch APIs.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--selftest", action="store_true", help="run batch mode against the stand-in and check it")
+    parser.add_argument("--gpt-outcome", choices=["completed", "failed", "expired"], default="completed")
+    parser.add_argument("--claude-outcome", choices=["succeeded", "errored", "expired"], default="succeeded")
+    args = parser.parse_args(argv)
+
+    if args.selftest:
+        return 0 if SelfTest() else 1
+
+    server = StandinServer(args.port, verbose=True)
+    server.state.outcomes = {"GPT": args.gpt_outcome, "Claude": args.claude_outcome}
+    print("Batch stand-in listening. Run AIG_main.py (batch backend) with:")
+    for name, value in server.Environment().items():
+        print(f"  {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
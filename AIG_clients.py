@@ -0,0 +1,123 @@
+# AIG_clients.py
+# Provider SDKs and API clients, loaded on first use.
+#
+# Importing openai, anthropic, google.generativeai and azure.identity takes
+# seconds, and building a client fails when its API key is missing. Runners
+# get SDKs and clients from here, so a run only pays for (and only needs keys
+# for) the providers that were actually selected.
+
+import importlib
+import os
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict
+
+_lock = threading.RLock()
+_clients: Dict[str, Any] = {}
+_import_times: Dict[str, float] = {}
+
+
+# ---------------------------------------------------------------------------
+#  Lazy imports
+# ---------------------------------------------------------------------------
+
+def LazyImport(name: str) -> ModuleType:
+    """
+    Import a module on first use, recording how long the import took.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _import_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+def SDKImportTimes() -> Dict[str, float]:
+    """
+    Seconds spent importing each lazily loaded SDK so far.
+    """
+    with _lock:
+        return dict(_import_times)
+
+
+def PrintImportTimes() -> None:
+    """
+    Print the cold-start cost of every SDK this run loaded.
+    """
+    times = SDKImportTimes()
+    if not times:
+        return
+
+    print("\n" + "═" * 45)
+    print("   SDK Import Times")
+    print("═" * 45)
+    for name, seconds in times.items():
+        print(f"  {name}: {seconds:.2f}s")
+    print(f"  Total: {sum(times.values()):.2f}s")
+    print("═" * 45)
+
+
+# ---------------------------------------------------------------------------
+#  Clients (one shared instance each)
+# ---------------------------------------------------------------------------
+
+def _Client(key: str, build: Callable[[], Any]) -> Any:
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = build()
+            _clients[key] = client
+        return client
+
+
+# max_retries=0 everywhere: AIG_retry does all retrying, so each retry is
+# counted
+
+def OpenAIClient() -> Any:
+    return _Client("openai", lambda: LazyImport("openai").OpenAI(max_retries=0))
+
+
+def AsyncOpenAIClient() -> Any:
+    return _Client(
+        "openai-async", lambda: LazyImport("openai").AsyncOpenAI(max_retries=0)
+    )
+
+
+def AnthropicClient() -> Any:
+    return _Client(
+        "anthropic", lambda: LazyImport("anthropic").Anthropic(max_retries=0)
+    )
+
+
+def AsyncAnthropicClient() -> Any:
+    return _Client(
+        "anthropic-async",
+        lambda: LazyImport("anthropic").AsyncAnthropic(max_retries=0),
+    )
+
+
+def GenAI() -> ModuleType:
+    """
+    google.generativeai, configured with GOOGLE_API_KEY on first use.
+    """
+
+    def build() -> ModuleType:
+        genai = LazyImport("google.generativeai")
+        genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
+        return genai
+
+    return _Client("genai", build)
+
+
+def GeminiCaching() -> ModuleType:
+    """
+    google.generativeai.caching (context caches), after configuring GenAI.
+    """
+    GenAI()
+    return LazyImport("google.generativeai.caching")
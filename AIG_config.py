@@ -11,7 +11,7 @@ item validity are out of scope and not acceptable.
 # Central configuration for model names, file requirements, prompts, directories,
 # temperatures, and service-specific settings.
 
-from typing import Final, List, Dict
+from typing import Final, List, Dict, Tuple
 
 
 # ---------------------------------------------------------------------------
@@ -61,6 +61,10 @@ REQUIRED_FILES: Final[List[str]] = [
 # So you can uniformly build: f"{standard_code}{RESULTS_SUFFIX}"
 RESULTS_SUFFIX: Final[str] = " Results"
 
+# Every tier file "X.txt" gets a structured sidecar "X.jsonl": one JSON
+# record per item, with all of its metadata as typed fields
+ITEM_RECORDS_EXTENSION: Final[str] = ".jsonl"
+
 
 # ---------------------------------------------------------------------------
 #  Generation behavior (temperatures, messages)
@@ -74,6 +78,186 @@ FOLLOWUP_PROMPT: Final[str] = (
 )
 
 
+# ---------------------------------------------------------------------------
+#  Rate limiting
+# ---------------------------------------------------------------------------
+
+# Starting (requests per minute, tokens per minute) budget for each LLM; 0
+# means no limit. These are conservative defaults: once a provider sends its
+# rate-limit headers (OpenAI, Anthropic), its real limits take over.
+RATE_LIMITS: Final[Dict[str, Tuple[int, int]]] = {
+    "GPT": (500, 500_000),
+    "Gemini": (60, 1_000_000),
+    "Claude": (50, 30_000),
+    "Copilot": (30, 0),
+}
+
+# Starting output tokens per minute for LLMs whose provider limits output
+# separately from input (Anthropic's input / output tokens per minute). For
+# these, the RATE_LIMITS tokens budget counts input tokens only.
+OUTPUT_TOKEN_RATE_LIMITS: Final[Dict[str, int]] = {
+    "Claude": 8_000,
+}
+
+# Tokens to reserve for the answer when estimating a call's cost up front
+RATE_LIMIT_OUTPUT_ESTIMATE: Final[int] = 1_000
+
+
+# ---------------------------------------------------------------------------
+#  Retries
+# ---------------------------------------------------------------------------
+
+# Attempts per LLM call, counting the first one
+RETRY_MAX_ATTEMPTS: Final[int] = 5
+
+# Backoff window: retry k waits a random 0..min(MAX, BASE * 2**(k-1)) seconds,
+# or longer if the provider sent Retry-After
+RETRY_BASE_DELAY: Final[float] = 1.0
+RETRY_MAX_DELAY: Final[float] = 60.0
+
+# Each LLM may retry at most RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO * calls
+# times per run, so an outage does not turn into a retry storm
+RETRY_BUDGET_RATIO: Final[float] = 0.2
+RETRY_BUDGET_MIN: Final[int] = 10
+
+
+# ---------------------------------------------------------------------------
+#  Streaming
+# ---------------------------------------------------------------------------
+
+# Stream every item (#1 and the follow-ups) token by token: the text is
+# echoed as it arrives (each line tagged with tier, LLM and item), and every
+# item header records time-to-first-token, generation time and output
+# tokens/sec. Threads backend only; the asyncio backend does not stream.
+STREAM_RESPONSES: Final[bool] = True
+
+
+# ---------------------------------------------------------------------------
+#  Preflight health checks
+# ---------------------------------------------------------------------------
+
+# A passing check is trusted for this long, across runs, before it is redone
+PREFLIGHT_TTL_SECONDS: Final[int] = 300
+
+# Where passing checks are remembered (next to the AIG_*.py scripts)
+PREFLIGHT_CACHE_FILE: Final[str] = ".aig_preflight_cache.json"
+
+
+# ---------------------------------------------------------------------------
+#  Hedged requests
+# ---------------------------------------------------------------------------
+
+# LLMs whose slow calls get a duplicate request; the first answer wins.
+# Streamed calls (STREAM_RESPONSES) are hedged on time to first token, and
+# only the winning stream is echoed. Only stateless calls are hedged (Gemini
+# chats and Copilot conversations would record both answers), so only GPT
+# and Claude belong here.
+HEDGE_LLMS: Final[List[str]] = []
+
+# Hedge once a call has run longer than this percentile of recent latencies
+# (or, streamed, waited longer than this percentile for its first token)
+HEDGE_PERCENTILE: Final[float] = 95.0
+
+# Recent latencies kept per LLM, and how many are needed before hedging
+HEDGE_HISTORY: Final[int] = 100
+HEDGE_MIN_SAMPLES: Final[int] = 10
+
+
+# ---------------------------------------------------------------------------
+#  Generation strategy
+# ---------------------------------------------------------------------------
+
+# "followup":    item #1 gets the tier prompt, items #2..#N get FOLLOWUP_PROMPT
+#                in the same conversation (each waits for the one before it,
+#                and every call re-sends the whole conversation so far).
+# "independent": every item is a fresh call with just the tier prompt, fired
+#                concurrently; diversity comes from the schedule below.
+#                Applies to GPT, Gemini and Claude, with either the threads
+#                or the asyncio backend; Copilot always follows up.
+GENERATION_STRATEGY: Final[str] = "followup"
+
+# Independent items cycle through these temperatures (#1 gets the first one)
+INDEPENDENT_TEMP_SCHEDULE: Final[List[float]] = [0.7, 0.8, 0.9, 1.0]
+
+# Item #k is sent seed INDEPENDENT_SEED_BASE + k where the API accepts a seed
+# (Gemini, and GPT's Chat Completions path when CANDIDATES_PER_CALL["GPT"] > 1
+# or in batch mode); the Responses API and Claude rely on the temperature
+# schedule alone.
+INDEPENDENT_SEED_BASE: Final[int] = 1000
+
+# How many calls for one tier may be in flight at once
+INDEPENDENT_ITEM_CONCURRENCY: Final[int] = 4
+
+# Independent items to request per call. Values above 1 ask the API for that
+# many candidates in one round trip (Gemini candidate_count, GPT n via Chat
+# Completions); the candidates share the call's temperature, seed and time.
+# Claude's API returns a single answer, so Claude always makes one call per
+# item (run concurrently, per INDEPENDENT_ITEM_CONCURRENCY).
+CANDIDATES_PER_CALL: Final[Dict[str, int]] = {
+    "GPT": 1,
+    "Gemini": 1,
+}
+
+
+# ---------------------------------------------------------------------------
+#  Concurrency: how many tiers each LLM may work on at the same time
+# ---------------------------------------------------------------------------
+
+# Each tier's follow-up chain (#1, #2, ... #N) always runs in order; only
+# separate tiers overlap. Set an entry to 1 for the old one-tier-at-a-time run.
+TIER_CONCURRENCY: Final[Dict[str, int]] = {
+    "GPT": 4,
+    "Gemini": 4,
+    "Claude": 4,
+    "Copilot": 2,
+}
+
+
+# ---------------------------------------------------------------------------
+#  Batch mode (OpenAI Batch / Anthropic Message Batches)
+# ---------------------------------------------------------------------------
+
+# LLMs with a batch API; others are skipped when the batch backend is chosen
+BATCH_LLMS: Final[List[str]] = ["GPT", "Claude"]
+
+# How often to check on submitted batches (they can take up to 24 hours)
+BATCH_POLL_SECONDS: Final[float] = 60.0
+
+# Batches submitted but not yet collected (next to the AIG_*.py scripts), so
+# a restart can still collect them with python AIG_batch.py
+BATCH_PENDING_FILE: Final[str] = ".aig_pending_batches.json"
+
+
+# ---------------------------------------------------------------------------
+#  Claude: prompt caching
+# ---------------------------------------------------------------------------
+
+# Mark the tier prompt and the growing follow-up history as cacheable, so
+# items #2..#N re-read earlier turns from Anthropic's prompt cache instead of
+# paying full price for them again.
+CLAUDE_PROMPT_CACHING: Final[bool] = True
+
+
+# ---------------------------------------------------------------------------
+#  Gemini: explicit context caching
+# ---------------------------------------------------------------------------
+
+# Store each tier prompt (instructions + LBIDAT + passage) in a Gemini context
+# cache so the follow-up items, and re-runs of the same prompt within the TTL,
+# read it from the cache instead of re-sending it.
+GEMINI_CONTEXT_CACHING: Final[bool] = True
+GEMINI_CACHE_TTL_MINUTES: Final[int] = 60
+
+# A chat stays bound to its cache for the whole tier, so a cache is only
+# reused with at least this long left; otherwise its TTL is first extended
+# back to GEMINI_CACHE_TTL_MINUTES.
+GEMINI_CACHE_MIN_TTL_MINUTES: Final[int] = 30
+
+# Gemini refuses to cache small prompts; skip the attempt below roughly
+# 4,096 tokens (~4 characters per token).
+GEMINI_CACHE_MIN_CHARS: Final[int] = 16_384
+
+
 # ---------------------------------------------------------------------------
 #  Gemini: safety categories
 # ---------------------------------------------------------------------------
@@ -0,0 +1,391 @@
+# AIG_hedge.py
+# Hedged requests: when an LLM call runs past a high percentile of that LLM's
+# recent latencies, send the same request again and keep whichever answer
+# arrives first.
+#
+# Sync hedges cannot be cancelled (the SDK call holds its thread), so the
+# losing answer is discarded when it lands. Async hedges cancel the loser.
+#
+# Streamed calls race on time to first token instead: once an attempt has
+# gone past the percentile of recent first-token latencies without a token,
+# a duplicate is sent, and whichever attempt streams first is echoed; the
+# other's text is dropped.
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from AIG_config import (
+    HEDGE_LLMS,
+    HEDGE_PERCENTILE,
+    HEDGE_HISTORY,
+    HEDGE_MIN_SAMPLES,
+)
+
+# Primary and hedge calls run here so the caller can wait with a timeout
+_hedge_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="hedge")
+
+
+class LatencyTracker:
+    """
+    Recent call latencies for one LLM, plus hedge counters.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: Deque[float] = deque(maxlen=HEDGE_HISTORY)
+        self.first_tokens: Deque[float] = deque(maxlen=HEDGE_HISTORY)
+        self.calls = 0
+        self.hedged = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def Record(self, seconds: float) -> None:
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def RecordFirstToken(self, seconds: float) -> None:
+        with self._lock:
+            self.first_tokens.append(seconds)
+
+    def Threshold(self, first_token: bool = False) -> Optional[float]:
+        """
+        Seconds after which to hedge (a whole call, or a stream's first
+        token), or None while history is too short.
+        """
+        with self._lock:
+            history = self.first_tokens if first_token else self.latencies
+            if len(history) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(history)
+        rank = round(HEDGE_PERCENTILE / 100 * (len(ordered) - 1))
+        return ordered[rank]
+
+    def Count(self, hedged: bool = False, won: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.hedged += hedged
+            self.hedges_won += won
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def GetLatencyTracker(LLM: str) -> LatencyTracker:
+    with _trackers_lock:
+        tracker = _trackers.get(LLM)
+        if tracker is None:
+            tracker = LatencyTracker()
+            _trackers[LLM] = tracker
+        return tracker
+
+
+# ---------------------------------------------------------------------------
+#  Hedged calls
+# ---------------------------------------------------------------------------
+
+def _Timed(call: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    start = time.monotonic()
+    result = call(*args, **kwargs)
+    return result, time.monotonic() - start
+
+
+def CallWithHedge(
+    LLM: str,
+    call: Callable[..., Any],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run call(*args, **kwargs); if it outlasts the LLM's hedge threshold, run
+    it a second time and return whichever result comes back first.
+
+    Errors are only raised once no attempt is left that could still succeed.
+    """
+    tracker = GetLatencyTracker(LLM)
+    threshold = tracker.Threshold() if LLM in HEDGE_LLMS else None
+
+    if threshold is None:
+        result, seconds = _Timed(call, *args, **kwargs)
+        tracker.Record(seconds)
+        tracker.Count()
+        return result
+
+    primary = _hedge_executor.submit(_Timed, call, *args, **kwargs)
+    done, _ = wait([primary], timeout=threshold)
+    if done:
+        result, seconds = primary.result()
+        tracker.Record(seconds)
+        tracker.Count()
+        return result
+
+    print(f"{LLM} call past {threshold:.1f}s; sending a hedged request...")
+    hedge = _hedge_executor.submit(_Timed, call, *args, **kwargs)
+    pending = {primary, hedge}
+    winner: Optional[Future] = None
+
+    while pending and winner is None:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                winner = future
+                break
+
+    tracker.Count(hedged=True, won=winner is hedge)
+
+    if winner is None:
+        # Both failed: surface the original call's error
+        primary.result()
+
+    result, seconds = winner.result()
+    tracker.Record(seconds)
+    return result
+
+
+class _StreamRace:
+    """
+    Which of a streamed call's attempts got its first token out first.
+    """
+
+    def __init__(self, echo: Any) -> None:
+        self.echo = echo
+        self.started = False
+        self.winner: Optional["_RaceEcho"] = None
+        # Set whenever an attempt claims the race or ends
+        self.progress = threading.Event()
+        self._lock = threading.Lock()
+
+    def Start(self) -> None:
+        # The real echo times from the first attempt's request
+        with self._lock:
+            if not self.started:
+                self.started = True
+                self.echo.Start()
+
+    def Claim(self, attempt: "_RaceEcho") -> bool:
+        with self._lock:
+            if self.winner is None:
+                self.winner = attempt
+                self.progress.set()
+            return self.winner is attempt
+
+
+class _RaceEcho:
+    """
+    The echo one attempt streams into: passes its text on to the real echo
+    if it is the first to produce any, and drops it otherwise.
+    """
+
+    def __init__(self, race: _StreamRace) -> None:
+        self.race = race
+        self.started = 0.0
+        self.first_token: Optional[float] = None
+
+    def Start(self) -> None:
+        self.started = time.monotonic()
+        self.race.Start()
+
+    def Write(self, text: str) -> None:
+        if not text:
+            return
+        if self.first_token is None:
+            self.first_token = time.monotonic()
+        if self.race.Claim(self):
+            self.race.echo.Write(text)
+
+    def Finish(self) -> None:
+        if self.race.winner is self:
+            self.race.echo.Finish()
+
+    def FirstTokenSeconds(self) -> Optional[float]:
+        if self.first_token is None:
+            return None
+        return self.first_token - self.started
+
+
+def CallWithHedgeStreamed(
+    LLM: str,
+    call: Callable[..., Any],
+    echo: Any,
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run call(echo, *args, **kwargs), a call that streams into echo; if no
+    token has arrived by the LLM's first-token hedge threshold, run it a
+    second time and keep whichever attempt streams first.
+
+    Errors are only raised once no attempt is left that could still succeed.
+    """
+    tracker = GetLatencyTracker(LLM)
+    threshold = tracker.Threshold(first_token=True) if LLM in HEDGE_LLMS else None
+
+    race = _StreamRace(echo)
+    primary_echo = _RaceEcho(race)
+
+    def run(attempt_echo: _RaceEcho) -> Future:
+        future = _hedge_executor.submit(call, attempt_echo, *args, **kwargs)
+        future.add_done_callback(lambda _: race.progress.set())
+        return future
+
+    if threshold is None:
+        result = call(primary_echo, *args, **kwargs)
+        seconds = primary_echo.FirstTokenSeconds()
+        if seconds is not None:
+            tracker.RecordFirstToken(seconds)
+        tracker.Count()
+        return result
+
+    attempts: Dict[Future, _RaceEcho] = {run(primary_echo): primary_echo}
+    race.progress.wait(threshold)
+
+    if race.winner is None and not any(f.done() for f in attempts):
+        print(f"{LLM} stream silent past {threshold:.1f}s; sending a hedged request...")
+        hedge_echo = _RaceEcho(race)
+        attempts[run(hedge_echo)] = hedge_echo
+
+    # Until an attempt streams, the first one to succeed without any text
+    # (or the last to fail) settles it
+    while race.winner is None and not all(f.done() for f in attempts):
+        race.progress.wait()
+        race.progress.clear()
+        if any(f.done() and f.exception() is None for f in attempts):
+            break
+
+    hedged = len(attempts) > 1
+    winner: Optional[Future] = next(
+        (f for f, attempt_echo in attempts.items() if attempt_echo is race.winner),
+        None,
+    )
+    if winner is None:
+        succeeded: List[Future] = [
+            f for f in attempts if f.done() and f.exception() is None
+        ]
+        # Both failed: surface the original call's error
+        winner = succeeded[0] if succeeded else next(iter(attempts))
+
+    winner_echo = attempts[winner]
+    tracker.Count(hedged=hedged, won=hedged and winner_echo is not primary_echo)
+
+    result = winner.result()
+    seconds = winner_echo.FirstTokenSeconds()
+    if seconds is not None:
+        tracker.RecordFirstToken(seconds)
+    return result
+
+
+async def CallWithHedgeAsync(
+    LLM: str,
+    call: Callable[..., Awaitable[Any]],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    asyncio version of CallWithHedge; the losing request is cancelled.
+    """
+    tracker = GetLatencyTracker(LLM)
+    threshold = tracker.Threshold() if LLM in HEDGE_LLMS else None
+
+    async def timed() -> Any:
+        start = time.monotonic()
+        result = await call(*args, **kwargs)
+        return result, time.monotonic() - start
+
+    if threshold is None:
+        result, seconds = await timed()
+        tracker.Record(seconds)
+        tracker.Count()
+        return result
+
+    primary = asyncio.ensure_future(timed())
+    done, _ = await asyncio.wait([primary], timeout=threshold)
+    if done:
+        result, seconds = primary.result()
+        tracker.Record(seconds)
+        tracker.Count()
+        return result
+
+    print(f"{LLM} call past {threshold:.1f}s; sending a hedged request...")
+    hedge = asyncio.ensure_future(timed())
+    pending = {primary, hedge}
+    winner: Optional[asyncio.Future] = None
+
+    while pending and winner is None:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in done:
+            if task.exception() is None:
+                winner = task
+                break
+
+    for task in pending:
+        task.cancel()
+
+    tracker.Count(hedged=True, won=winner is hedge)
+
+    if winner is None:
+        primary.result()
+
+    result, seconds = winner.result()
+    tracker.Record(seconds)
+    return result
+
+
+# ---------------------------------------------------------------------------
+#  Metrics
+# ---------------------------------------------------------------------------
+
+def HedgeStats() -> Dict[str, Dict[str, Any]]:
+    """
+    Calls, hedges issued and hedges won per LLM, with the current threshold.
+    """
+    with _trackers_lock:
+        trackers = dict(_trackers)
+    stats: Dict[str, Dict[str, Any]] = {}
+    for LLM, tracker in trackers.items():
+        threshold = tracker.Threshold()
+        first_token = tracker.Threshold(first_token=True)
+        with tracker._lock:
+            stats[LLM] = {
+                "calls": tracker.calls,
+                "hedged": tracker.hedged,
+                "hedges_won": tracker.hedges_won,
+                "threshold": None if threshold is None else round(threshold, 2),
+                "first_token_threshold": (
+                    None if first_token is None else round(first_token, 2)
+                ),
+            }
+    return stats
+
+
+def PrintHedgeStatus() -> None:
+    """
+    Print hedges issued and won per hedged LLM.
+    """
+    stats = {LLM: s for LLM, s in HedgeStats().items() if LLM in HEDGE_LLMS}
+    if not stats:
+        return
+
+    print("\n" + "═" * 45)
+    print("   Hedged Requests")
+    print("═" * 45)
+    for LLM, s in stats.items():
+        threshold = "n/a" if s["threshold"] is None else f"{s['threshold']}s"
+        first_token = (
+            "n/a"
+            if s["first_token_threshold"] is None
+            else f"{s['first_token_threshold']}s"
+        )
+        print(
+            f"  {LLM}: {s['hedged']} hedged of {s['calls']} calls, "
+            f"{s['hedges_won']} won by the hedge (threshold {threshold}, "
+            f"first token {first_token})"
+        )
+    print("═" * 45)
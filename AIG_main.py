@@ -15,6 +15,7 @@ item validity are out of scope and not acceptable.
 # - run selected LLMs
 
 import os
+import time
 
 from AIG_ui import (
     SelectStandard,
@@ -22,10 +23,15 @@ from AIG_ui import (
     CheckRequiredFiles,
     AskLLMs,
     AskItemsPerTier,
+    AskRunnerBackend,
 )
 
 from AIG_prompts import BuildTiers
-from AIG_runners import RunGPT, RunGemini, RunClaude, RunCopilot
+from AIG_runners import RunSelectedLLMs
+from AIG_preflight import RunPreflight
+from AIG_ratelimit import PrintRateLimitStatus
+from AIG_hedge import PrintHedgeStatus
+from AIG_clients import PrintImportTimes
 from AIG_config import RESULTS_SUFFIX
 
 
@@ -61,18 +67,34 @@ def main() -> None:
     # 8. How many items per tier?
     item_per_tier = AskItemsPerTier()
 
-    # 9. Run selected LLMs
-    if "GPT" in LLMs_selected:
-        RunGPT(tiers, item_per_tier, passage_name)
+    # 9. Threads, asyncio or offline batch?
+    backend = AskRunnerBackend()
 
-    if "Gemini" in LLMs_selected:
-        RunGemini(tiers, item_per_tier, passage_name)
-
-    if "Claude" in LLMs_selected:
-        RunClaude(tiers, item_per_tier, passage_name)
+    # 10. Health-check the selected LLMs together, before any generation
+    LLMs_selected = RunPreflight(LLMs_selected)
+    if not LLMs_selected:
+        print("No selected LLM passed its preflight check.")
+        return
 
-    if "Copilot" in LLMs_selected:
-        RunCopilot(tiers, item_per_tier, passage_name)
+    # 11. Run selected LLMs (side by side when more than one is chosen)
+    start_time = time.time()
+    if backend == "async":
+        # Imported here so the threaded path never loads the other backends
+        from AIG_async_runners import RunSelectedLLMsAsync
+
+        RunSelectedLLMsAsync(LLMs_selected, tiers, item_per_tier, passage_name)
+    elif backend == "batch":
+        from AIG_batch import RunSelectedLLMsBatch
+
+        RunSelectedLLMsBatch(LLMs_selected, tiers, item_per_tier, passage_name)
+    else:
+        RunSelectedLLMs(LLMs_selected, tiers, item_per_tier, passage_name)
+    elapsed = time.time() - start_time
+
+    print(f"\n\nAll selected LLMs finished ({backend} backend) in {elapsed:.2f} secs.")
+    PrintRateLimitStatus()
+    PrintHedgeStatus()
+    PrintImportTimes()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,137 @@
 # AIG_output.py
 # Centralized helper for writing LLM results to both file and screen.
+#
+# Each item goes to the human-readable tier file and, as one JSON record, to
+# that file's append-only JSONL sidecar (see ItemRecordsFile).
 
-from AIG_config import FIRST_ITEM_TEMP, NEXT_ITEM_TEMP
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from AIG_config import (
+    FIRST_ITEM_TEMP,
+    NEXT_ITEM_TEMP,
+    STREAM_RESPONSES,
+    ITEM_RECORDS_EXTENSION,
+)
+
+# Bumped whenever a field of the JSONL item record changes meaning
+ITEM_RECORD_VERSION = 1
+
+# Serializes the multi-line screen echo when tiers run concurrently
+_screen_lock = threading.Lock()
+
+# One lock per tier file, so LLMs running side by side never split a block
+_file_locks: Dict[str, threading.Lock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _FileLock(file_name: str) -> threading.Lock:
+    """
+    Return the lock that guards appends to file_name (created on first use).
+    """
+    with _file_locks_guard:
+        lock = _file_locks.get(file_name)
+        if lock is None:
+            lock = threading.Lock()
+            _file_locks[file_name] = lock
+        return lock
+
+
+def _Append(file_name: str, text: str) -> int:
+    """
+    Append text and return the byte offset it starts at (caller holds the
+    file's lock).
+    """
+    with open(file_name, "a", encoding="utf-8") as f:
+        # Freshly opened for append, tell() is the file's size in bytes
+        offset = f.tell()
+        f.write(text)
+    return offset
+
+
+def AppendToFile(file_name: str, text: str) -> int:
+    """
+    Append text to a results file as one uninterrupted block, returning the
+    byte offset where the block starts.
+
+    Several LLMs may be writing to the same tier file at once; every header,
+    item and error block goes through here so blocks never interleave.
+    """
+    with _FileLock(file_name):
+        return _Append(file_name, text)
+
+
+def ItemRecordsFile(file_name: str) -> str:
+    """
+    The JSONL sidecar of a tier file ("X.txt" -> "X.jsonl").
+    """
+    return os.path.splitext(file_name)[0] + ITEM_RECORDS_EXTENSION
+
+
+class StreamEcho:
+    """
+    Live screen echo and timing for one streamed item.
+
+    The runner calls Start() when the request goes out, Write() for every
+    chunk of text, and Finish() when the stream ends. Complete lines are
+    printed as they arrive, tagged with the item's label, so several tiers
+    streaming at once stay readable.
+    """
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.started = 0.0
+        self.first_token: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._partial = ""
+
+    def Start(self) -> None:
+        # Called again on every retry, so timing covers the attempt that won
+        self.started = time.monotonic()
+        self.first_token = None
+        self.finished = None
+        self._partial = ""
+
+    def Write(self, text: str) -> None:
+        if not text:
+            return
+        if self.first_token is None:
+            self.first_token = time.monotonic()
+
+        self._partial += text
+        *lines, self._partial = self._partial.split("\n")
+        if lines:
+            with _screen_lock:
+                for line in lines:
+                    print(f"[{self.label}] {line}")
+
+    def Finish(self) -> None:
+        self.finished = time.monotonic()
+        if self._partial:
+            with _screen_lock:
+                print(f"[{self.label}] {self._partial}")
+            self._partial = ""
+
+    def Timing(self) -> Tuple[float, float]:
+        """
+        (time to first token, generation time) in seconds.
+        """
+        finished = self.finished if self.finished is not None else time.monotonic()
+        first = self.first_token if self.first_token is not None else finished
+        return first - self.started, finished - first
+
+
+def NewStreamEcho(LLM: str, tier_code: str, index: int) -> Optional[StreamEcho]:
+    """
+    A StreamEcho for this item, or None when STREAM_RESPONSES is off.
+    """
+    if not STREAM_RESPONSES:
+        return None
+    return StreamEcho(f"{tier_code} {LLM} #{index}")
 
 
 def PrintToFileAndScreen(
@@ -11,13 +141,21 @@ def PrintToFileAndScreen(
     response: str,
     file_name: str,
     passage_name: str,
-    elapsed: float,
+    elapsed: Optional[float],
     input_tokens: int,
     output_tokens: int,
+    cache_write_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    temperature: Optional[float] = None,
+    retries: int = 0,
+    stream: Optional[StreamEcho] = None,
 ) -> None:
     """
     Write a single generated item to the results file and echo it to stdout.
 
+    Safe to call from several tier and LLM threads at once: neither the file
+    block nor the screen echo for one item is interleaved with another's.
+
     Parameters
     ----------
     LLM : str
@@ -32,39 +170,120 @@ def PrintToFileAndScreen(
         Path to the output file for this tier.
     passage_name : str
         File name of the passage used (for reference in the log).
-    elapsed : float
-        Elapsed time in seconds for this call.
+    elapsed : float or None
+        Elapsed time in seconds for this call; None when unknown (batch
+        items), logged as N/A.
     input_tokens : int
         Number of input tokens (0 for models that don't report).
     output_tokens : int
         Number of output tokens (0 for models that don't report).
+    cache_write_tokens : int
+        Input tokens written to the provider's prompt cache (already counted
+        in input_tokens; 0 when caching is off or unsupported).
+    cache_read_tokens : int
+        Input tokens served from the provider's prompt cache (already counted
+        in input_tokens).
+    temperature : float, optional
+        Temperature actually used, when it differs from the usual
+        FIRST_ITEM_TEMP / NEXT_ITEM_TEMP rule (e.g. independent sampling).
+    retries : int
+        Number of failed attempts retried before this item came back.
+    stream : StreamEcho, optional
+        Set when the item was streamed: its text is already on screen, and
+        its TTFT, generation time and tokens/sec go in the header.
     """
 
     # Human-readable temperature label (for non-Copilot runs)
     if LLM == "Copilot":
         temperature_suffix = ""
     else:
-        temp = FIRST_ITEM_TEMP if index == 1 else NEXT_ITEM_TEMP
+        if temperature is not None:
+            temp = temperature
+        else:
+            temp = FIRST_ITEM_TEMP if index == 1 else NEXT_ITEM_TEMP
         temperature_suffix = f" (temp={temp})"
 
     total_tokens = input_tokens + output_tokens
 
-    # ---- Write to file ----
-    with open(file_name, "a", encoding="utf-8") as f:
-        f.write("\n\n\n================= NEW ITEM =================")
-        f.write(f"\nPassage: {passage_name}")
-        f.write(
-            f"\nTier {tier_code} ({LLM}) #{index}{temperature_suffix}. "
-            f"({elapsed:.2f} secs). "
-            f"({input_tokens} + {output_tokens} = {total_tokens} total tokens)\n\n"
+    elapsed_label = "N/A" if elapsed is None else f"{elapsed:.2f}"
+
+    # Only mention the prompt cache when it was actually used
+    if cache_write_tokens or cache_read_tokens:
+        cache_suffix = (
+            f" (cache: {cache_write_tokens} written, {cache_read_tokens} read)"
         )
-        f.write(response)
+    else:
+        cache_suffix = ""
 
-    # ---- Echo to screen ----
-    print("\n\n================= NEW ITEM =================")
-    print(
+    if retries:
+        retry_suffix = f" ({retries} {'retry' if retries == 1 else 'retries'})"
+    else:
+        retry_suffix = ""
+
+    if stream is not None:
+        ttft, generation = stream.Timing()
+        stream_suffix = f" (TTFT {ttft:.2f}s, gen {generation:.2f}s"
+        if output_tokens and generation > 0:
+            stream_suffix += f", {output_tokens / generation:.1f} tok/s"
+        stream_suffix += ")"
+    else:
+        stream_suffix = ""
+
+    # ---- Write to file (and its JSONL sidecar) ----
+    block = (
+        "\n\n\n================= NEW ITEM ================="
+        f"\nPassage: {passage_name}"
         f"\nTier {tier_code} ({LLM}) #{index}{temperature_suffix}. "
-        f"({elapsed:.2f} secs)\n"
+        f"({elapsed_label} secs). "
+        f"({input_tokens} + {output_tokens} = {total_tokens} total tokens)"
+        f"{cache_suffix}{retry_suffix}{stream_suffix}\n\n"
+        + response
     )
-    print(response)
-    print(f"\n\nTier {tier_code} #{index} complete, saved to {file_name}\n")
+
+    record: Dict[str, Any] = {
+        "version": ITEM_RECORD_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "passage": passage_name,
+        "tier": tier_code,
+        "llm": LLM,
+        "index": index,
+        "temperature": None if LLM == "Copilot" else temp,
+        "elapsed": None if elapsed is None else round(elapsed, 3),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": total_tokens,
+        "cache_write_tokens": cache_write_tokens,
+        "cache_read_tokens": cache_read_tokens,
+        "retries": retries,
+        "ttft": None,
+        "generation_seconds": None,
+        "tokens_per_sec": None,
+        "text_file": os.path.basename(file_name),
+        "text_offset": 0,
+        "text": response,
+    }
+    if stream is not None:
+        record["ttft"] = round(ttft, 3)
+        record["generation_seconds"] = round(generation, 3)
+        if output_tokens and generation > 0:
+            record["tokens_per_sec"] = round(output_tokens / generation, 1)
+
+    # One lock for both files, so the sidecar lists items in file order
+    with _FileLock(file_name):
+        record["text_offset"] = _Append(file_name, block)
+        _Append(
+            ItemRecordsFile(file_name),
+            json.dumps(record, ensure_ascii=False) + "\n",
+        )
+
+    # ---- Echo to screen ----
+    with _screen_lock:
+        print("\n\n================= NEW ITEM =================")
+        print(
+            f"\nTier {tier_code} ({LLM}) #{index}{temperature_suffix}. "
+            f"({elapsed_label} secs){cache_suffix}{retry_suffix}{stream_suffix}\n"
+        )
+        # A streamed item was already echoed line by line as it arrived
+        if stream is None:
+            print(response)
+        print(f"\n\nTier {tier_code} #{index} complete, saved to {file_name}\n")
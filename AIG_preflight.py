@@ -0,0 +1,182 @@
+# AIG_preflight.py
+# Preflight stage: check every selected LLM at once before generation starts,
+# instead of each runner pinging its provider just before its own tiers.
+#
+# Passing checks are remembered in PREFLIGHT_CACHE_FILE for
+# PREFLIGHT_TTL_SECONDS, so a run started again within minutes skips them.
+# Only successes are cached; a failed provider is checked again next time.
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from AIG_clients import OpenAIClient, AnthropicClient, GenAI
+from AIG_runners import GetCopilotAuth, TestCopilotStartup
+from AIG_config import (
+    GPT_MODEL,
+    CLAUDE_MODEL,
+    GEMINI_MODEL,
+    PREFLIGHT_TTL_SECONDS,
+    PREFLIGHT_CACHE_FILE,
+)
+
+# Absolute, because AIG_main chdirs into the standard's directory
+_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), PREFLIGHT_CACHE_FILE
+)
+
+
+# ---------------------------------------------------------------------------
+#  Health checks (raise on failure)
+# ---------------------------------------------------------------------------
+# Model lookups confirm the key and model access without generating tokens.
+
+def _CheckGPT() -> None:
+    OpenAIClient().models.retrieve(GPT_MODEL)
+
+
+def _CheckGemini() -> None:
+    GenAI().get_model(f"models/{GEMINI_MODEL}")
+
+
+def _CheckClaude() -> None:
+    AnthropicClient().models.retrieve(CLAUDE_MODEL)
+
+
+def _CheckCopilot() -> None:
+    if TestCopilotStartup() is None:
+        raise RuntimeError("Copilot startup test failed (see above)")
+
+
+# (check, model it is cached under)
+_CHECKS: Dict[str, Tuple[Callable[[], None], str]] = {
+    "GPT": (_CheckGPT, GPT_MODEL),
+    "Gemini": (_CheckGemini, GEMINI_MODEL),
+    "Claude": (_CheckClaude, CLAUDE_MODEL),
+    "Copilot": (_CheckCopilot, "graph"),
+}
+
+
+# ---------------------------------------------------------------------------
+#  Cache
+# ---------------------------------------------------------------------------
+
+def _LoadCache() -> Dict[str, Dict[str, float]]:
+    try:
+        with open(_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _SaveCache(cache: Dict[str, Dict[str, float]]) -> None:
+    try:
+        with open(_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Could not save preflight cache: {e}")
+
+
+def _CacheKey(LLM: str) -> str:
+    return f"{LLM}:{_CHECKS[LLM][1]}"
+
+
+def _Cached(cache: Dict[str, Dict[str, float]], LLM: str) -> Optional[float]:
+    """
+    Duration of the last passing check, if it is still within the TTL.
+    """
+    entry = cache.get(_CacheKey(LLM))
+    if entry and time.time() - entry["checked_at"] < PREFLIGHT_TTL_SECONDS:
+        return entry["seconds"]
+    return None
+
+
+# ---------------------------------------------------------------------------
+#  Preflight
+# ---------------------------------------------------------------------------
+
+def _TimedCheck(LLM: str) -> Tuple[Optional[str], float]:
+    """
+    Run one check; return (error or None, seconds).
+    """
+    start = time.time()
+    try:
+        _CHECKS[LLM][0]()
+        error = None
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    return error, time.time() - start
+
+
+def RunPreflight(LLMs_selected: List[str]) -> List[str]:
+    """
+    Health-check the selected LLMs concurrently and return the ones that
+    passed, in their original order.
+    """
+    selected = [name for name in LLMs_selected if name in _CHECKS]
+    if not selected:
+        return []
+
+    cache = _LoadCache()
+    skipped: Dict[str, float] = {}
+    for name in selected:
+        seconds = _Cached(cache, name)
+        if seconds is not None:
+            skipped[name] = seconds
+    to_check = [name for name in selected if name not in skipped]
+
+    # Copilot's device-code token lives only as long as the process, so a
+    # cached Copilot check still signs in (it just skips the ping)
+    to_check_auth = ["Copilot"] if "Copilot" in skipped else []
+
+    if to_check:
+        print(f"\n\nPreflight: checking {', '.join(to_check)}...")
+    else:
+        print("\n\nPreflight: every check is cached.")
+    start = time.time()
+
+    results: Dict[str, Tuple[Optional[str], float]] = {}
+    with ThreadPoolExecutor(
+        max_workers=max(1, len(to_check) + len(to_check_auth)),
+        thread_name_prefix="preflight",
+    ) as pool:
+        futures = {name: pool.submit(_TimedCheck, name) for name in to_check}
+        auth_futures = {name: pool.submit(GetCopilotAuth) for name in to_check_auth}
+
+        for name, future in futures.items():
+            results[name] = future.result()
+        for name, future in auth_futures.items():
+            if future.result() is None:
+                results[name] = ("Copilot auth initialization failed", 0.0)
+
+    wall = time.time() - start
+
+    healthy: List[str] = []
+    for name in selected:
+        error, seconds = results.get(name, (None, skipped.get(name, 0.0)))
+        if error is None:
+            healthy.append(name)
+            if name in to_check:
+                cache[_CacheKey(name)] = {
+                    "checked_at": time.time(),
+                    "seconds": round(seconds, 3),
+                }
+                print(f"  {name}: ok ({seconds:.2f}s)")
+            else:
+                print(f"  {name}: ok (cached)")
+        else:
+            cache.pop(_CacheKey(name), None)
+            print(f"  {name}: FAILED ({error}); skipping {name} this run.")
+
+    _SaveCache(cache)
+
+    # Serial pings would have cost the sum of every check's own time
+    serial = sum(results[name][1] for name in to_check) + sum(skipped.values())
+    print(
+        f"Preflight took {wall:.2f}s; serial, uncached checks would have "
+        f"taken ~{serial:.2f}s (saved ~{max(0.0, serial - wall):.2f}s)."
+    )
+
+    return healthy
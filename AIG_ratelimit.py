@@ -0,0 +1,342 @@
+# AIG_ratelimit.py
+# Shared per-provider rate limiting: a requests/min and a tokens/min token
+# bucket for every (LLM, model) pair (plus an output tokens/min bucket where
+# the provider limits output separately), tuned on the fly from the
+# providers' rate-limit response headers.
+#
+# Runners call Acquire() (or AcquireAsync()) before each LLM call, then
+# UpdateFromHeaders() and RecordUsage() after it. This replaces the old fixed
+# time.sleep(1) between Gemini and Copilot items.
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from AIG_config import RATE_LIMITS, OUTPUT_TOKEN_RATE_LIMITS, RATE_LIMIT_OUTPUT_ESTIMATE
+
+
+# Header names carrying (limit, remaining) for requests and tokens
+_HEADER_NAMES: Dict[str, Tuple[str, str, str, str]] = {
+    "openai": (
+        "x-ratelimit-limit-requests",
+        "x-ratelimit-remaining-requests",
+        "x-ratelimit-limit-tokens",
+        "x-ratelimit-remaining-tokens",
+    ),
+    "anthropic": (
+        "anthropic-ratelimit-requests-limit",
+        "anthropic-ratelimit-requests-remaining",
+        "anthropic-ratelimit-input-tokens-limit",
+        "anthropic-ratelimit-input-tokens-remaining",
+    ),
+}
+
+# (limit, remaining) for output tokens, where limited separately
+_OUTPUT_HEADER_NAMES: Tuple[str, str] = (
+    "anthropic-ratelimit-output-tokens-limit",
+    "anthropic-ratelimit-output-tokens-remaining",
+)
+
+
+class TokenBucket:
+    """
+    A bucket holding up to per_minute units that refills continuously.
+
+    Take() reserves units immediately (the level may go negative) and returns
+    how long the caller must wait before using them, so concurrent callers
+    are spaced out in arrival order. per_minute <= 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.per_minute = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _Refill(self, now: float) -> None:
+        if self.per_minute <= 0:
+            return
+        rate = self.per_minute / 60.0
+        self.level = min(self.per_minute, self.level + (now - self.updated) * rate)
+        self.updated = now
+
+    def Take(self, amount: float, now: float) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        self._Refill(now)
+        # A single call bigger than the whole bucket waits for a full bucket
+        self.level -= min(amount, self.per_minute)
+        if self.level >= 0:
+            return 0.0
+        return -self.level / (self.per_minute / 60.0)
+
+    def Resize(self, per_minute: float, now: float) -> None:
+        self._Refill(now)
+        self.per_minute = float(per_minute)
+        self.level = min(self.level, self.per_minute)
+
+    def Cap(self, remaining: float, now: float) -> None:
+        """Never believe we have more headroom than the provider reports."""
+        self._Refill(now)
+        self.level = min(self.level, remaining)
+
+    def Settle(self, reserved: float, actual: float, now: float) -> None:
+        """Charge (or refund) the difference between a reservation and use."""
+        if actual > reserved:
+            self.Take(actual - reserved, now)
+        elif self.per_minute > 0:
+            self._Refill(now)
+            self.level = min(self.per_minute, self.level + (reserved - actual))
+
+
+class RateLimiter:
+    """
+    Requests/min and tokens/min budgets for one LLM + model. For LLMs in
+    OUTPUT_TOKEN_RATE_LIMITS, tokens counts input tokens only and
+    output_tokens budgets the rest; otherwise output_tokens is unlimited and
+    tokens counts both.
+    """
+
+    def __init__(self, LLM: str, model: str) -> None:
+        requests_per_minute, tokens_per_minute = RATE_LIMITS.get(LLM, (0, 0))
+        self.LLM = LLM
+        self.model = model
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.separate_output = LLM in OUTPUT_TOKEN_RATE_LIMITS
+        self.output_tokens = TokenBucket(OUTPUT_TOKEN_RATE_LIMITS.get(LLM, 0))
+        self.blocked_until = 0.0
+        self.calls = 0
+        self.waited = 0.0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _SplitEstimate(self, estimated_tokens: int) -> Tuple[int, int]:
+        """
+        (input, output) parts of an EstimateTokens estimate: all input unless
+        output has its own budget, in which case the answer reserve is output.
+        """
+        if not self.separate_output:
+            return estimated_tokens, 0
+        output_estimate = min(estimated_tokens, RATE_LIMIT_OUTPUT_ESTIMATE)
+        return estimated_tokens - output_estimate, output_estimate
+
+    # ---- before the call ----
+
+    def Reserve(self, estimated_tokens: int) -> float:
+        """
+        Reserve one request and estimated_tokens, and return the seconds to
+        wait before making the call.
+        """
+        input_estimate, output_estimate = self._SplitEstimate(estimated_tokens)
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self.requests.Take(1, now),
+                self.tokens.Take(input_estimate, now),
+                self.output_tokens.Take(output_estimate, now),
+                self.blocked_until - now,
+                0.0,
+            )
+            self.calls += 1
+            self.waited += wait
+        return wait
+
+    def Acquire(self, estimated_tokens: int = 0) -> float:
+        """
+        Block until the call fits in the budget; returns the seconds waited.
+        """
+        wait = self.Reserve(estimated_tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def AcquireAsync(self, estimated_tokens: int = 0) -> float:
+        """
+        Non-blocking Acquire for the asyncio runners.
+        """
+        wait = self.Reserve(estimated_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    # ---- after the call ----
+
+    def RecordUsage(
+        self, estimated_tokens: int, input_tokens: int, output_tokens: int
+    ) -> None:
+        """
+        Charge (or refund) the difference between the estimate reserved in
+        Acquire and the tokens the provider actually reported, charging
+        output tokens to their own budget when the provider limits them
+        separately.
+        """
+        input_estimate, output_estimate = self._SplitEstimate(estimated_tokens)
+        with self._lock:
+            now = time.monotonic()
+            if self.separate_output:
+                self.tokens.Settle(input_estimate, input_tokens, now)
+                self.output_tokens.Settle(output_estimate, output_tokens, now)
+            else:
+                self.tokens.Settle(input_estimate, input_tokens + output_tokens, now)
+
+    def UpdateFromHeaders(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Adopt the provider's own view of the budget: its limits, what is
+        left of them, and any Retry-After pause.
+        """
+        if not headers:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+
+            for names in _HEADER_NAMES.values():
+                limit_req, left_req, limit_tok, left_tok = (
+                    _HeaderNumber(headers, name) for name in names
+                )
+                if limit_req:
+                    self.requests.Resize(limit_req, now)
+                if left_req is not None:
+                    self.requests.Cap(left_req, now)
+                if limit_tok:
+                    self.tokens.Resize(limit_tok, now)
+                if left_tok is not None:
+                    self.tokens.Cap(left_tok, now)
+
+            limit_out, left_out = (_HeaderNumber(headers, name) for name in _OUTPUT_HEADER_NAMES)
+            if limit_out:
+                self.output_tokens.Resize(limit_out, now)
+            if left_out is not None:
+                self.output_tokens.Cap(left_out, now)
+
+            retry_after = RetryAfterSeconds(headers)
+            if retry_after:
+                self.throttled += 1
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def Penalize(self, seconds: float) -> None:
+        """
+        Pause every caller for this LLM (e.g. after a 429 with no headers).
+        """
+        with self._lock:
+            self.throttled += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    # ---- monitoring ----
+
+    def State(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self.requests._Refill(now)
+            self.tokens._Refill(now)
+            self.output_tokens._Refill(now)
+            return {
+                "model": self.model,
+                "requests_per_min": self.requests.per_minute,
+                "requests_left": round(self.requests.level, 1),
+                "tokens_per_min": self.tokens.per_minute,
+                "tokens_left": round(self.tokens.level),
+                "output_tokens_per_min": self.output_tokens.per_minute,
+                "output_tokens_left": round(self.output_tokens.level),
+                "blocked_for": round(max(0.0, self.blocked_until - now), 1),
+                "calls": self.calls,
+                "seconds_waited": round(self.waited, 1),
+                "throttled": self.throttled,
+            }
+
+
+# ---------------------------------------------------------------------------
+#  Registry
+# ---------------------------------------------------------------------------
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def GetRateLimiter(LLM: str, model: str) -> RateLimiter:
+    """
+    Return the shared limiter for this LLM + model (created on first use).
+    """
+    with _limiters_lock:
+        limiter = _limiters.get((LLM, model))
+        if limiter is None:
+            limiter = RateLimiter(LLM, model)
+            _limiters[(LLM, model)] = limiter
+        return limiter
+
+
+def RateLimitSnapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Current state of every limiter, keyed by LLM name.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.LLM: limiter.State() for limiter in limiters}
+
+
+def PrintRateLimitStatus() -> None:
+    """
+    Print a one-line summary per LLM of calls made and time spent waiting.
+    """
+    snapshot = RateLimitSnapshot()
+    if not snapshot:
+        return
+
+    print("\n" + "═" * 45)
+    print("   Rate Limiter Status")
+    print("═" * 45)
+    for LLM, state in snapshot.items():
+        print(
+            f"  {LLM}: {state['calls']} calls, waited {state['seconds_waited']}s, "
+            f"{state['throttled']} throttled, "
+            f"{state['requests_left']}/{state['requests_per_min']:.0f} req left"
+        )
+    print("═" * 45)
+
+
+# ---------------------------------------------------------------------------
+#  Helpers
+# ---------------------------------------------------------------------------
+
+def EstimateTokens(text: Optional[str]) -> int:
+    """
+    Rough token cost of a call: ~4 characters per prompt token plus the
+    usual size of a generated item.
+    """
+    return len(text or "") // 4 + RATE_LIMIT_OUTPUT_ESTIMATE
+
+
+def RetryAfterSeconds(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Parse a Retry-After (seconds or HTTP date) or retry-after-ms header.
+    """
+    if not headers:
+        return None
+
+    millis = _HeaderNumber(headers, "retry-after-ms")
+    if millis is not None:
+        return millis / 1000.0
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _HeaderNumber(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,257 @@
+# AIG_retry.py
+# One retry policy for every LLM call: classify the error, back off
+# exponentially with full jitter (or as long as Retry-After says), and stop
+# when either the attempt limit or the per-LLM retry budget runs out.
+#
+# The SDK clients are created with max_retries=0 so that this layer is the
+# only one retrying, and so that each retry is counted in the item metadata.
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from AIG_ratelimit import GetRateLimiter, RetryAfterSeconds
+from AIG_config import (
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MIN,
+)
+
+# HTTP statuses worth another try (529 is Anthropic's "overloaded")
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Exception class names (from openai, anthropic, httpx, google.api_core) that
+# mean the request never got a proper answer
+_RETRYABLE_NAMES = (
+    "Timeout",
+    "Connection",
+    "ConnectError",
+    "RemoteProtocolError",
+    "ServiceUnavailable",
+    "ResourceExhausted",
+    "DeadlineExceeded",
+    "InternalServerError",
+)
+
+# httpx errors raised before the request reached the server, so retrying
+# them cannot send it twice
+_UNSENT_NAMES = ("ConnectTimeout", "ConnectError", "PoolTimeout")
+
+
+class RetryableHTTPError(Exception):
+    """
+    Raised for a retryable non-2xx reply from a raw HTTP API (Copilot).
+    """
+
+    def __init__(self, status_code: int, retry_after: Optional[float], text: str):
+        super().__init__(f"HTTP {status_code}: {text[:200]}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class DeliveredRequestError(Exception):
+    """
+    A request that must not be sent twice (a Copilot chat turn, which the
+    server keeps in the conversation) failed after it may already have been
+    delivered. Never retried.
+    """
+
+
+# ---------------------------------------------------------------------------
+#  Error classification
+# ---------------------------------------------------------------------------
+
+def _StatusCode(error: BaseException) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        # google.api_core exceptions carry the HTTP status as .code
+        code = getattr(error, "code", None)
+        status = code if isinstance(code, int) else None
+    return status
+
+
+def ClassifyError(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    Return (retryable, retry_after_seconds) for an exception raised by an
+    LLM call.
+    """
+    if isinstance(error, DeliveredRequestError):
+        return False, None
+
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        retry_after = RetryAfterSeconds(headers)
+
+    status = _StatusCode(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS, retry_after
+
+    name = type(error).__name__
+    return any(part in name for part in _RETRYABLE_NAMES), retry_after
+
+
+def RaiseIfMaybeDelivered(error: BaseException) -> None:
+    """
+    Call from the except block around a request that must not be sent
+    twice. A retryable transport error (e.g. a read timeout) that may have
+    come after the server got the request is raised as DeliveredRequestError
+    instead; otherwise this returns and the caller re-raises error as usual.
+    """
+    if type(error).__name__ in _UNSENT_NAMES:
+        return
+    retryable, _ = ClassifyError(error)
+    if retryable and _StatusCode(error) is None:
+        raise DeliveredRequestError(
+            f"{type(error).__name__}: {error} (not retried: the request may "
+            "already have been delivered)"
+        ) from error
+
+
+def BackoffDelay(retry: int, retry_after: Optional[float] = None) -> float:
+    """
+    Seconds to wait before retry number `retry` (1-based): full jitter over
+    an exponentially growing window, but never less than Retry-After.
+    """
+    window = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (retry - 1)))
+    delay = random.uniform(0, window)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, RETRY_MAX_DELAY))
+    return delay
+
+
+# ---------------------------------------------------------------------------
+#  Retry budget
+# ---------------------------------------------------------------------------
+
+class RetryBudget:
+    """
+    Caps retries for one LLM at RETRY_BUDGET_MIN plus RETRY_BUDGET_RATIO of
+    its calls, so a provider outage cannot multiply the load on it.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def RecordCall(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def TrySpend(self) -> bool:
+        with self._lock:
+            if self.retries >= RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO * self.calls:
+                return False
+            self.retries += 1
+            return True
+
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def GetRetryBudget(LLM: str) -> RetryBudget:
+    with _budgets_lock:
+        budget = _budgets.get(LLM)
+        if budget is None:
+            budget = RetryBudget()
+            _budgets[LLM] = budget
+        return budget
+
+
+def RetryStats() -> Dict[str, Tuple[int, int]]:
+    """
+    (calls, retries) per LLM so far.
+    """
+    with _budgets_lock:
+        return {LLM: (b.calls, b.retries) for LLM, b in _budgets.items()}
+
+
+def _NextDelay(
+    LLM: str, model: str, error: BaseException, retries: int
+) -> Optional[float]:
+    """
+    Decide whether to retry after error; return the delay, or None to give up.
+    """
+    retryable, retry_after = ClassifyError(error)
+    if not retryable or retries + 1 >= RETRY_MAX_ATTEMPTS:
+        return None
+    if not GetRetryBudget(LLM).TrySpend():
+        print(f"{LLM} retry budget exhausted; not retrying: {error}")
+        return None
+
+    delay = BackoffDelay(retries + 1, retry_after)
+
+    # Throttling affects every caller of this LLM, not just this one
+    if _StatusCode(error) == 429:
+        GetRateLimiter(LLM, model).Penalize(delay)
+
+    print(f"{LLM} call failed ({error}); retry #{retries + 1} in {delay:.1f}s...")
+    return delay
+
+
+# ---------------------------------------------------------------------------
+#  Retry wrappers
+# ---------------------------------------------------------------------------
+
+def CallWithRetry(
+    LLM: str,
+    model: str,
+    call: Callable[..., Any],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Tuple[Any, int]:
+    """
+    Run call(*args, **kwargs), retrying retryable failures.
+
+    Returns (result, retries). Re-raises the last error when it is not
+    retryable or no attempts/budget are left. The first three parameters
+    are positional-only so that call's own kwargs may include model=.
+    """
+    budget = GetRetryBudget(LLM)
+    retries = 0
+
+    while True:
+        budget.RecordCall()
+        try:
+            return call(*args, **kwargs), retries
+        except Exception as e:
+            delay = _NextDelay(LLM, model, e, retries)
+            if delay is None:
+                raise
+        time.sleep(delay)
+        retries += 1
+
+
+async def CallWithRetryAsync(
+    LLM: str,
+    model: str,
+    call: Callable[..., Awaitable[Any]],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> Tuple[Any, int]:
+    """
+    asyncio version of CallWithRetry.
+    """
+    budget = GetRetryBudget(LLM)
+    retries = 0
+
+    while True:
+        budget.RecordCall()
+        try:
+            return await call(*args, **kwargs), retries
+        except Exception as e:
+            delay = _NextDelay(LLM, model, e, retries)
+            if delay is None:
+                raise
+        await asyncio.sleep(delay)
+        retries += 1
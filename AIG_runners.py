@@ -2,17 +2,31 @@
 # All LLM-specific code: configuration, clients, and runner functions.
 
 import os
+import json
 import time
-from datetime import datetime
-from typing import Optional, Tuple, Dict, List
-
-import httpx
-from azure.identity import DeviceCodeCredential
-import google.generativeai as genai
-from openai import OpenAI
-from anthropic import Anthropic
-
-from AIG_output import PrintToFileAndScreen
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Dict, List, Callable
+
+from AIG_clients import (
+    LazyImport,
+    OpenAIClient,
+    AnthropicClient,
+    GenAI,
+    GeminiCaching,
+)
+from AIG_output import PrintToFileAndScreen, AppendToFile, StreamEcho, NewStreamEcho
+from AIG_ratelimit import GetRateLimiter, EstimateTokens, RetryAfterSeconds
+from AIG_retry import (
+    CallWithRetry,
+    RetryableHTTPError,
+    RaiseIfMaybeDelivered,
+    RETRYABLE_STATUS,
+)
+from AIG_hedge import CallWithHedge, CallWithHedgeStreamed
 from AIG_config import (
     GPT_MODEL,
     CLAUDE_MODEL,
@@ -24,15 +38,498 @@ from AIG_config import (
     COPILOT_PING_TIMEOUT,
     COPILOT_CHAT_TIMEOUT,
     COPILOT_SCOPES,
+    TIER_CONCURRENCY,
+    CLAUDE_PROMPT_CACHING,
+    GEMINI_CONTEXT_CACHING,
+    GEMINI_CACHE_TTL_MINUTES,
+    GEMINI_CACHE_MIN_TTL_MINUTES,
+    GEMINI_CACHE_MIN_CHARS,
+    GENERATION_STRATEGY,
+    INDEPENDENT_TEMP_SCHEDULE,
+    INDEPENDENT_SEED_BASE,
+    INDEPENDENT_ITEM_CONCURRENCY,
+    CANDIDATES_PER_CALL,
 )
 
-# Initialize clients for the LLMs that use simple API keys/env config
-openai_client = OpenAI()
-anthropic_client = Anthropic()
-genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
+if TYPE_CHECKING:
+    import httpx
+
+# SDKs and clients are loaded on first use (see AIG_clients), so a run only
+# imports and authenticates the providers that were selected.
 # Copilot auth is handled lazily via InitCopilotAuth / TestCopilotStartup
 
 
+# ---------------------------------------------------------------------------
+#  Tier scheduling (shared by all runners)
+# ---------------------------------------------------------------------------
+
+def RunTiersConcurrently(
+    LLM: str,
+    run_tier: Callable[[str, str, str, int, str], None],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Call run_tier(tier_code, prompt_text, file_name, item_per_tier, passage_name)
+    for every tier, with at most TIER_CONCURRENCY[LLM] tiers in flight.
+
+    Each run_tier call owns its tier's follow-up chain and output file, so the
+    items inside a tier file stay in #1, #2, ... #N order.
+    """
+    max_workers = max(1, TIER_CONCURRENCY.get(LLM, 1))
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix=f"{LLM}-tier"
+    ) as pool:
+        futures = [
+            pool.submit(
+                run_tier, tier_code, prompt_text, file_name, item_per_tier, passage_name
+            )
+            for tier_code, prompt_text, file_name in tiers
+        ]
+
+        # Surface anything the tier function did not already handle
+        for future in futures:
+            future.result()
+
+
+# ---------------------------------------------------------------------------
+#  Rate-limited LLM calls (every item is generated through one of these)
+# ---------------------------------------------------------------------------
+
+def MessagesText(messages: List[Dict[str, Any]]) -> str:
+    """
+    Concatenate the text of a chat message list (plain or content blocks).
+    """
+    parts: List[str] = []
+    for message in messages:
+        content = message["content"]
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content)
+    return "".join(parts)
+
+
+def _CallGPTOnce(echo: Optional[StreamEcho] = None, **kwargs: Any) -> Any:
+    """
+    OpenAIClient().responses.create(**kwargs), paced by the GPT rate limiter.
+    With echo, the response is streamed into it and the final response
+    returned.
+    """
+    limiter = GetRateLimiter("GPT", GPT_MODEL)
+    estimate = EstimateTokens(kwargs.get("input"))
+    limiter.Acquire(estimate)
+
+    if echo is None:
+        raw = OpenAIClient().responses.with_raw_response.create(**kwargs)
+        limiter.UpdateFromHeaders(raw.headers)
+        response = raw.parse()
+    else:
+        echo.Start()
+        raw = OpenAIClient().responses.with_raw_response.create(
+            stream=True, **kwargs
+        )
+        limiter.UpdateFromHeaders(raw.headers)
+        response = None
+        for event in raw.parse():
+            if event.type == "response.output_text.delta":
+                echo.Write(event.delta)
+            elif event.type == "response.completed":
+                response = event.response
+        echo.Finish()
+        if response is None:
+            raise RuntimeError("GPT stream ended without a completed response")
+
+    limiter.RecordUsage(
+        estimate, response.usage.input_tokens, response.usage.output_tokens
+    )
+    return response
+
+
+def _CallGPTChatOnce(**kwargs: Any) -> Any:
+    """
+    OpenAIClient().chat.completions.create(**kwargs), paced by the GPT rate
+    limiter.
+    """
+    limiter = GetRateLimiter("GPT", GPT_MODEL)
+    estimate = EstimateTokens(MessagesText(kwargs["messages"])) * kwargs.get("n", 1)
+    limiter.Acquire(estimate)
+
+    raw = OpenAIClient().chat.completions.with_raw_response.create(**kwargs)
+    limiter.UpdateFromHeaders(raw.headers)
+    completion = raw.parse()
+
+    limiter.RecordUsage(
+        estimate, completion.usage.prompt_tokens, completion.usage.completion_tokens
+    )
+    return completion
+
+
+def _CallClaudeOnce(echo: Optional[StreamEcho] = None, **kwargs: Any) -> Any:
+    """
+    AnthropicClient().messages.create(**kwargs), paced by the Claude rate
+    limiter. With echo, the message is streamed into it and the final
+    message returned.
+    """
+    limiter = GetRateLimiter("Claude", CLAUDE_MODEL)
+    estimate = EstimateTokens(MessagesText(kwargs["messages"]))
+    limiter.Acquire(estimate)
+
+    if echo is None:
+        raw = AnthropicClient().messages.with_raw_response.create(**kwargs)
+        limiter.UpdateFromHeaders(raw.headers)
+        response = raw.parse()
+    else:
+        echo.Start()
+        with AnthropicClient().messages.stream(**kwargs) as stream:
+            limiter.UpdateFromHeaders(stream.response.headers)
+            for text in stream.text_stream:
+                echo.Write(text)
+            response = stream.get_final_message()
+        echo.Finish()
+
+    limiter.RecordUsage(
+        estimate, response.usage.input_tokens, response.usage.output_tokens
+    )
+    return response
+
+
+def _CallGeminiOnce(
+    send: Callable[..., Any],
+    message: str,
+    echo: Optional[StreamEcho] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    send(message, **kwargs) -- a chat's send_message or a model's
+    generate_content -- paced by the Gemini rate limiter. The Gemini SDK
+    does not expose response headers, so only the local budget applies.
+    With echo, the response is streamed into it before being returned.
+    """
+    limiter = GetRateLimiter("Gemini", GEMINI_MODEL)
+    estimate = EstimateTokens(message)
+    limiter.Acquire(estimate)
+
+    if echo is None:
+        response = send(message, **kwargs)
+    else:
+        echo.Start()
+        response = send(message, stream=True, **kwargs)
+        for chunk in response:
+            echo.Write(GeminiChunkText(chunk))
+        echo.Finish()
+
+    in_tokens, out_tokens, _ = GeminiUsage(response)
+    limiter.RecordUsage(estimate, in_tokens, out_tokens)
+    return response
+
+
+def CallGPT(echo: Optional[StreamEcho] = None, **kwargs: Any) -> Tuple[Any, int]:
+    """
+    Rate-limited, retried (and, per HEDGE_LLMS, hedged) responses.create;
+    returns (response, retries). Streamed into echo when one is given, and
+    then hedged on time to first token.
+    """
+    if echo is not None:
+        return CallWithRetry(
+            "GPT", GPT_MODEL, CallWithHedgeStreamed, "GPT", _CallGPTOnce, echo, **kwargs
+        )
+    return CallWithRetry(
+        "GPT", GPT_MODEL, CallWithHedge, "GPT", _CallGPTOnce, **kwargs
+    )
+
+
+def CallGPTChat(**kwargs: Any) -> Tuple[Any, int]:
+    """
+    Rate-limited, retried, hedged chat.completions.create; returns
+    (completion, retries).
+    """
+    return CallWithRetry(
+        "GPT", GPT_MODEL, CallWithHedge, "GPT", _CallGPTChatOnce, **kwargs
+    )
+
+
+def CallClaude(echo: Optional[StreamEcho] = None, **kwargs: Any) -> Tuple[Any, int]:
+    """
+    Rate-limited, retried, hedged messages.create; returns
+    (response, retries). Streamed into echo when one is given, and then
+    hedged on time to first token.
+    """
+    if echo is not None:
+        return CallWithRetry(
+            "Claude",
+            CLAUDE_MODEL,
+            CallWithHedgeStreamed,
+            "Claude",
+            _CallClaudeOnce,
+            echo,
+            **kwargs,
+        )
+    return CallWithRetry(
+        "Claude", CLAUDE_MODEL, CallWithHedge, "Claude", _CallClaudeOnce, **kwargs
+    )
+
+
+def CallGemini(
+    send: Callable[..., Any],
+    message: str,
+    echo: Optional[StreamEcho] = None,
+    **kwargs: Any,
+) -> Tuple[Any, int]:
+    """
+    Rate-limited, retried send(message, **kwargs); returns (response, retries).
+    Streamed into echo when one is given.
+
+    Safe inside a chat: a failed send_message leaves the history untouched.
+    Never hedged, since a duplicate send_message would land in the history.
+    """
+    return CallWithRetry(
+        "Gemini", GEMINI_MODEL, _CallGeminiOnce, send, message, echo, **kwargs
+    )
+
+
+# ---------------------------------------------------------------------------
+#  Independent-sample strategy (GPT, Gemini, Claude)
+# ---------------------------------------------------------------------------
+
+# A sample function makes one stand-alone call asking for `count` candidates
+# and returns one (text, input_tokens, output_tokens, extra
+# PrintToFileAndScreen kwargs) tuple per candidate.
+SampleResult = Tuple[str, int, int, Dict[str, int]]
+SampleFn = Callable[[str, float, int, int], List[SampleResult]]
+
+# LLMs whose API returns a single answer per call: CANDIDATES_PER_CALL does
+# not apply, and every item gets its own (concurrent, separately timed) call
+SINGLE_CANDIDATE_LLMS = {"Claude"}
+
+
+def CandidatesPerCall(LLM: str) -> int:
+    """
+    How many independent items one call for LLM asks for.
+    """
+    if LLM in SINGLE_CANDIDATE_LLMS:
+        return 1
+    return max(1, CANDIDATES_PER_CALL.get(LLM, 1))
+
+
+def IndependentSampleSettings(index: int) -> Tuple[float, int]:
+    """
+    Return (temperature, seed) for independent item #index.
+    """
+    temp = INDEPENDENT_TEMP_SCHEDULE[(index - 1) % len(INDEPENDENT_TEMP_SCHEDULE)]
+    return temp, INDEPENDENT_SEED_BASE + index
+
+
+def SplitTokens(total: int, count: int) -> List[int]:
+    """
+    Split a per-call token count evenly over count items (the remainder goes
+    to the first ones), so per-item figures still add up to the call total.
+    """
+    share, remainder = divmod(total, count)
+    return [share + (1 if i < remainder else 0) for i in range(count)]
+
+
+def FollowupInputEstimate(first_input_tokens: int, output_tokens: List[int]) -> int:
+    """
+    Estimate the input tokens the follow-up strategy would have spent on the
+    same items: call #k re-sends the tier prompt plus every earlier answer
+    and follow-up request, so the total grows with the square of N.
+    """
+    followup_tokens = len(FOLLOWUP_PROMPT) // 4 + 1   # ~4 characters per token
+
+    total = 0
+    history = first_input_tokens
+    for out_tokens in output_tokens:
+        total += history
+        history += out_tokens + followup_tokens
+    return total
+
+
+def _TimedSample(
+    sample: SampleFn, prompt_text: str, temp: float, seed: int, count: int
+) -> Tuple[List[SampleResult], float]:
+    start_time = time.time()
+    results = sample(prompt_text, temp, seed, count)  # This is the LLM call
+    return results, time.time() - start_time
+
+
+class IndependentTierUsage:
+    """
+    Running token totals for one independent tier, for the comparison with
+    the follow-up strategy printed at the end.
+    """
+
+    def __init__(self) -> None:
+        self.prompt_tokens = 0
+        self.input_used: List[int] = []
+        self.outputs: List[int] = []
+
+
+def StartIndependentTier(
+    LLM: str, tier_code: str, file_name: str, item_per_tier: int
+) -> List[Tuple[int, int, float, int]]:
+    """
+    Append the run header for an independent tier and return its calls, as
+    (first item index, number of candidates, temperature, seed).
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n\n=============== NEW RUN ({LLM}, independent items) - {timestamp} "
+        f"===============\n\n",
+    )
+
+    per_call = CandidatesPerCall(LLM)
+
+    calls = []
+    for first in range(1, item_per_tier + 1, per_call):
+        count = min(per_call, item_per_tier - first + 1)
+        temp, seed = IndependentSampleSettings(first)
+        label = f"#{first}" if count == 1 else f"#{first}-#{first + count - 1}"
+        print(f"Generating {tier_code} ({LLM}) {label} (Temp = {temp})...")
+        calls.append((first, count, temp, seed))
+    return calls
+
+
+def WriteIndependentCall(
+    LLM: str,
+    tier_code: str,
+    first: int,
+    temp: float,
+    results: List[SampleResult],
+    elapsed: float,
+    file_name: str,
+    passage_name: str,
+    usage: IndependentTierUsage,
+) -> None:
+    """
+    Write the items one call returned, numbered from first.
+    """
+    # A call's candidates split its input tokens, so together they are one
+    # call's prompt
+    if not usage.prompt_tokens:
+        usage.prompt_tokens = sum(in_tokens for _, in_tokens, _, _ in results)
+
+    for offset, (text, in_tokens, out_tokens, extra) in enumerate(results):
+        PrintToFileAndScreen(
+            LLM,
+            tier_code,
+            first + offset,
+            text,
+            file_name,
+            passage_name,
+            elapsed,
+            in_tokens,
+            out_tokens,
+            temperature=temp,
+            **extra,
+        )
+        usage.input_used.append(in_tokens)
+        usage.outputs.append(out_tokens)
+
+
+def WriteIndependentError(
+    LLM: str, tier_code: str, first: int, error: Exception, file_name: str
+) -> None:
+    print(
+        f"An error occurred while processing Tier {tier_code} "
+        f"({LLM}) #{first}: {error}"
+    )
+    AppendToFile(
+        file_name,
+        "\n\n========== ERROR ==========\n\n"
+        f"An error occurred while generating item #{first} ({LLM}): {error}\n",
+    )
+
+
+def FinishIndependentTier(
+    LLM: str, tier_code: str, calls: int, usage: IndependentTierUsage
+) -> None:
+    """
+    Print the input tokens used next to an estimate for the follow-up
+    strategy.
+    """
+    if usage.input_used:
+        estimate = FollowupInputEstimate(usage.prompt_tokens, usage.outputs)
+        print(
+            f"\nTier {tier_code} ({LLM}): independent items used "
+            f"{sum(usage.input_used)} input tokens in {calls} calls; "
+            f"a follow-up chain would use ~{estimate}."
+        )
+
+
+def RunIndependentTier(
+    LLM: str,
+    sample: SampleFn,
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier independent items for a single tier.
+
+    Items are requested CandidatesPerCall(LLM) at a time; the candidates
+    of one call share its temperature, seed and elapsed time, and split its
+    token counts. Up to INDEPENDENT_ITEM_CONCURRENCY calls run at once, but
+    items are written to the tier file strictly in #1..#N order. Finishes by
+    printing the input tokens used next to an estimate for the follow-up
+    strategy.
+    """
+    calls = StartIndependentTier(LLM, tier_code, file_name, item_per_tier)
+    usage = IndependentTierUsage()
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(len(calls), INDEPENDENT_ITEM_CONCURRENCY)),
+        thread_name_prefix=f"{LLM}-{tier_code}-item",
+    ) as pool:
+        futures = [
+            (
+                first,
+                temp,
+                pool.submit(_TimedSample, sample, prompt_text, temp, seed, count),
+            )
+            for first, count, temp, seed in calls
+        ]
+
+        for first, temp, future in futures:
+            try:
+                results, elapsed = future.result()
+            except Exception as e:
+                WriteIndependentError(LLM, tier_code, first, e, file_name)
+                continue
+
+            WriteIndependentCall(
+                LLM,
+                tier_code,
+                first,
+                temp,
+                results,
+                elapsed,
+                file_name,
+                passage_name,
+                usage,
+            )
+
+    FinishIndependentTier(LLM, tier_code, len(calls), usage)
+
+
+def TierFunction(
+    LLM: str,
+    followup_tier: Callable[[str, str, str, int, str], None],
+    sample: SampleFn,
+) -> Callable[[str, str, str, int, str], None]:
+    """
+    Pick the per-tier function for GENERATION_STRATEGY.
+    """
+    if GENERATION_STRATEGY == "independent":
+        return partial(RunIndependentTier, LLM, sample)
+    return followup_tier
+
+
 # ---------------------------------------------------------------------------
 #  GPT runner
 # ---------------------------------------------------------------------------
@@ -46,40 +543,147 @@ def RunGPT(
     Run OpenAI GPT on all tiers, generating item_per_tier items per tier.
     """
 
-    # Quick startup test
-    try:
-        openai_client.responses.create(
+    print("\n\n********************* Starting GPT tiers... ")
+
+    run_tier = TierFunction("GPT", _RunGPTTier, _GPTSample)
+    RunTiersConcurrently("GPT", run_tier, tiers, item_per_tier, passage_name)
+
+
+def _GPTSample(
+    prompt_text: str, temp: float, seed: int, count: int
+) -> List[SampleResult]:
+    """
+    One stand-alone GPT call.
+
+    The Responses API returns a single answer and takes no seed, so several
+    candidates go through Chat Completions with n=count instead, which is
+    also sent the seed.
+    """
+    if count == 1:
+        response, retries = CallGPT(
             model=GPT_MODEL,
-            input="ping",
-            temperature=0,
+            input=prompt_text,
+            temperature=temp,
+            store=False,
         )
-    except Exception as e:
-        print("GPT failed startup test:", e)
-        return
+        return GPTSampleResults(response, retries)
+
+    completion, retries = CallGPTChat(
+        model=GPT_MODEL,
+        messages=[{"role": "user", "content": prompt_text}],
+        temperature=temp,
+        seed=seed,
+        n=count,
+    )
+    return GPTChatSampleResults(completion, retries)
 
-    print("\n\n********************* Starting GPT tiers... ")
 
-    for tier_code, prompt_text, file_name in tiers:
+def GPTSampleResults(response: Any, retries: int) -> List[SampleResult]:
+    """
+    The single item of a Responses API sample.
+    """
+    return [
+        (
+            response.output_text,
+            response.usage.input_tokens,
+            response.usage.output_tokens,
+            {"retries": retries},
+        )
+    ]
 
-        # Append a header for this new run
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(file_name, "a", encoding="utf-8") as f:
-            f.write(
-                f"\n\n\n=============== NEW RUN GPT - {timestamp} ===============\n\n"
-            )
 
-        try:
-            # -------- first item generation --------
-            print(f"\n\nGenerating {tier_code} (GPT) #1 (Temp = {FIRST_ITEM_TEMP})...\n")
+def GPTChatSampleResults(completion: Any, retries: int) -> List[SampleResult]:
+    """
+    The items of a Chat Completions sample, one per choice.
+    """
+    count = len(completion.choices)
+    in_split = SplitTokens(completion.usage.prompt_tokens, count)
+    out_split = SplitTokens(completion.usage.completion_tokens, count)
+    # Retries belong to the call, so only its first item carries them
+    return [
+        (
+            choice.message.content or "",
+            in_split[i],
+            out_split[i],
+            {"retries": retries if i == 0 else 0},
+        )
+        for i, choice in enumerate(completion.choices)
+    ]
+
+
+def _RunGPTTier(
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier GPT items for a single tier.
+    """
+
+    # Append a header for this new run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n\n=============== NEW RUN GPT - {timestamp} ===============\n\n",
+    )
+
+    try:
+        # -------- first item generation --------
+        print(f"\n\nGenerating {tier_code} (GPT) #1 (Temp = {FIRST_ITEM_TEMP})...\n")
+
+        store_GPT_state = item_per_tier > 1
+
+        echo = NewStreamEcho("GPT", tier_code, 1)
+        start_time = time.time()
+        response, retries = CallGPT(  # This is the LLM call
+            model=GPT_MODEL,
+            input=prompt_text,
+            temperature=FIRST_ITEM_TEMP,
+            store=store_GPT_state,
+            echo=echo,
+        )
+        end_time = time.time()
+        elapsed = end_time - start_time
+
+        PrintToFileAndScreen(
+            "GPT",
+            tier_code,
+            1,
+            response.output_text,
+            file_name,
+            passage_name,
+            elapsed,
+            response.usage.input_tokens,
+            response.usage.output_tokens,
+            retries=retries,
+            stream=echo,
+        )
+
+        if item_per_tier == 1:
+            return
+
+        prev_ID = response.id
+
+        # -------- ITEMS 2..N --------
+        for index in range(2, item_per_tier + 1):
+            is_last = index == item_per_tier
 
-            store_GPT_state = item_per_tier > 1
+            print(
+                f"\n\nGenerating {tier_code} (GPT) #{index} "
+                f"(Temp = {NEXT_ITEM_TEMP})..."
+            )
 
+            echo = NewStreamEcho("GPT", tier_code, index)
             start_time = time.time()
-            response = openai_client.responses.create(  # This is the LLM call
+            response, retries = CallGPT(  # This is the LLM call
                 model=GPT_MODEL,
-                input=prompt_text,
-                temperature=FIRST_ITEM_TEMP,
-                store=store_GPT_state,
+                previous_response_id=prev_ID,
+                input=FOLLOWUP_PROMPT,
+                temperature=NEXT_ITEM_TEMP,
+                store=not is_last,
+                echo=echo,
             )
             end_time = time.time()
             elapsed = end_time - start_time
@@ -87,68 +691,154 @@ def RunGPT(
             PrintToFileAndScreen(
                 "GPT",
                 tier_code,
-                1,
+                index,
                 response.output_text,
                 file_name,
                 passage_name,
                 elapsed,
                 response.usage.input_tokens,
                 response.usage.output_tokens,
+                retries=retries,
+                stream=echo,
             )
 
-            if item_per_tier == 1:
-                continue
+            if not is_last:
+                prev_ID = response.id
 
-            prev_ID = response.id
+    except Exception as e:
+        print(f"An error occurred while processing Tier {tier_code} (GPT): {e}")
+        AppendToFile(
+            file_name,
+            "\n\n========== ERROR ==========\n\n"
+            f"An error occurred while processing this tier (GPT): {e}\n",
+        )
 
-            # -------- ITEMS 2..N --------
-            for index in range(2, item_per_tier + 1):
-                is_last = index == item_per_tier
 
-                print(
-                    f"\n\nGenerating {tier_code} (GPT) #{index} "
-                    f"(Temp = {NEXT_ITEM_TEMP})..."
-                )
+# ---------------------------------------------------------------------------
+#  Gemini runner
+# ---------------------------------------------------------------------------
 
-                start_time = time.time()
-                response = openai_client.responses.create(  # This is the LLM call
-                    model=GPT_MODEL,
-                    previous_response_id=prev_ID,
-                    input=FOLLOWUP_PROMPT,
-                    temperature=NEXT_ITEM_TEMP,
-                    store=not is_last,
-                )
-                end_time = time.time()
-                elapsed = end_time - start_time
-
-                PrintToFileAndScreen(
-                    "GPT",
-                    tier_code,
-                    index,
-                    response.output_text,
-                    file_name,
-                    passage_name,
-                    elapsed,
-                    response.usage.input_tokens,
-                    response.usage.output_tokens,
-                )
+# Context caches created (or found) during this run, keyed by prompt checksum.
+# Finding or creating one holds that checksum's lock, so concurrent calls for
+# the same prompt (e.g. the independent strategy's samples) create one cache.
+_gemini_caches: Dict[str, Any] = {}
+_gemini_cache_locks: Dict[str, threading.Lock] = {}
+_gemini_caches_lock = threading.Lock()
 
-                if not is_last:
-                    prev_ID = response.id
 
-        except Exception as e:
-            print(f"An error occurred while processing Tier {tier_code} (GPT): {e}")
-            with open(file_name, "a", encoding="utf-8") as f:
-                f.write("\n\n========== ERROR ==========\n\n")
-                f.write(
-                    f"An error occurred while processing this tier (GPT): {e}\n"
+def _FindGeminiCache(display_name: str) -> Optional[Any]:
+    """
+    Return a live context cache with this display name left over from an
+    earlier run (still within its TTL), or None.
+    """
+    for cache in GeminiCaching().CachedContent.list():
+        if cache.display_name == display_name and cache.model.endswith(GEMINI_MODEL):
+            return cache
+    return None
+
+
+def _RenewGeminiCache(cache: Any) -> Optional[Any]:
+    """
+    Return cache once it has at least GEMINI_CACHE_MIN_TTL_MINUTES to live,
+    extending its TTL if needed, or None if it could not be extended (e.g.
+    it expired in the meantime).
+    """
+    expire_time = cache.expire_time
+    if expire_time.tzinfo is None:
+        expire_time = expire_time.replace(tzinfo=timezone.utc)
+    remaining = expire_time - datetime.now(timezone.utc)
+    if remaining >= timedelta(minutes=GEMINI_CACHE_MIN_TTL_MINUTES):
+        return cache
+
+    try:
+        cache.update(ttl=timedelta(minutes=GEMINI_CACHE_TTL_MINUTES))
+    except Exception as e:
+        print(f"Could not extend Gemini context cache {cache.name}: {e}")
+        return None
+    return cache
+
+
+def GeminiTierModel(prompt_text: str) -> Tuple[Any, str, int]:
+    """
+    Return (model, first_message, cache_write_tokens) for a Gemini tier chat.
+
+    When context caching is on and the prompt is large enough, all but the
+    last paragraph of prompt_text goes into an explicit context cache and the
+    model is bound to it; first_message is then only that last paragraph, so
+    Gemini still sees exactly prompt_text. Otherwise (or if caching fails)
+    this returns a plain model and the full prompt_text.
+
+    cache_write_tokens is non-zero only when this call created the cache.
+    """
+    if not GEMINI_CONTEXT_CACHING or len(prompt_text) < GEMINI_CACHE_MIN_CHARS:
+        return GenAI().GenerativeModel(GEMINI_MODEL), prompt_text, 0
+
+    # The cached part must be followed by a non-empty user turn
+    split_at = prompt_text.rstrip().rfind("\n\n")
+    if split_at <= 0:
+        return GenAI().GenerativeModel(GEMINI_MODEL), prompt_text, 0
+
+    cached_part = prompt_text[:split_at]
+    first_message = prompt_text[split_at:]
+
+    checksum = hashlib.sha256(cached_part.encode("utf-8")).hexdigest()
+    display_name = f"AIG {checksum[:32]}"
+    cache_write_tokens = 0
+
+    with _gemini_caches_lock:
+        checksum_lock = _gemini_cache_locks.setdefault(checksum, threading.Lock())
+
+    try:
+        with checksum_lock:
+            cache = _gemini_caches.get(checksum)
+            if cache is None:
+                cache = _FindGeminiCache(display_name)
+            if cache is not None:
+                cache = _RenewGeminiCache(cache)
+            if cache is None:
+                cache = GeminiCaching().CachedContent.create(
+                    model=GEMINI_MODEL,
+                    display_name=display_name,
+                    contents=[cached_part],
+                    ttl=timedelta(minutes=GEMINI_CACHE_TTL_MINUTES),
                 )
-            continue
+                cache_write_tokens = cache.usage_metadata.total_token_count
+            _gemini_caches[checksum] = cache
 
+    except Exception as e:
+        print(f"Gemini context cache unavailable, sending full prompt: {e}")
+        return GenAI().GenerativeModel(GEMINI_MODEL), prompt_text, 0
+
+    model = GenAI().GenerativeModel.from_cached_content(cached_content=cache)
+    return model, first_message, cache_write_tokens
+
+
+def GeminiUsage(response: Any) -> Tuple[int, int, int]:
+    """
+    Return (input_tokens, output_tokens, cache_read_tokens) for a Gemini
+    response; prompt_token_count already includes the cached tokens.
+    """
+    # FIXED: Check if metadata exists, then access attributes directly
+    if not response.usage_metadata:
+        return 0, 0, 0
+
+    usage = response.usage_metadata
+    return (
+        usage.prompt_token_count,
+        usage.candidates_token_count,
+        getattr(usage, "cached_content_token_count", 0) or 0,
+    )
+
+
+def GeminiChunkText(chunk: Any) -> str:
+    """
+    Text of one streamed Gemini chunk ("" for chunks with no text parts,
+    where chunk.text would raise).
+    """
+    if not chunk.candidates:
+        return ""
+    return "".join(part.text for part in chunk.candidates[0].content.parts)
 
-# ---------------------------------------------------------------------------
-#  Gemini runner
-# ---------------------------------------------------------------------------
 
 def RunGemini(
     tiers: List[tuple[str, str, str]],
@@ -159,125 +849,232 @@ def RunGemini(
     Run Google's Gemini on all tiers.
     """
 
-    # Quick startup test
+    print("\n\n********************* Starting Gemini tiers... ")
+
+    run_tier = TierFunction("Gemini", _RunGeminiTier, _GeminiSample)
+    RunTiersConcurrently("Gemini", run_tier, tiers, item_per_tier, passage_name)
+
+
+def _GeminiSample(
+    prompt_text: str, temp: float, seed: int, count: int
+) -> List[SampleResult]:
+    """
+    One stand-alone Gemini call for count candidates, seeded for
+    reproducible diversity.
+    """
+    model, first_message, cache_write = GeminiTierModel(prompt_text)
+    response, retries = CallGemini(
+        model.generate_content,
+        first_message,
+        generation_config=GenAI().types.GenerationConfig(
+            temperature=temp, seed=seed, candidate_count=count
+        ),
+        safety_settings=GEMINI_SAFETY_SETTINGS,
+    )
+    return GeminiSampleResults(response, retries, cache_write)
+
+
+def GeminiSampleResults(
+    response: Any, retries: int, cache_write: int
+) -> List[SampleResult]:
+    """
+    The items of a Gemini sample, one per candidate.
+    """
+    in_tokens, out_tokens, cache_read = GeminiUsage(response)
+
+    candidates = response.candidates
+    in_split = SplitTokens(in_tokens, len(candidates))
+    out_split = SplitTokens(out_tokens, len(candidates))
+    cache_read_split = SplitTokens(cache_read, len(candidates))
+
+    results: List[SampleResult] = []
+    for i, candidate in enumerate(candidates):
+        text = "".join(part.text for part in candidate.content.parts)
+        extra = {
+            # The cache write and any retries happen once per call, so only
+            # the first item carries them
+            "cache_write_tokens": cache_write if i == 0 else 0,
+            "cache_read_tokens": cache_read_split[i],
+            "retries": retries if i == 0 else 0,
+        }
+        results.append((text, in_split[i], out_split[i], extra))
+
+    return results
+
+
+def _RunGeminiTier(
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier Gemini items for a single tier.
+    """
     try:
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        model.generate_content("ping")
-    except Exception as e:
-        print("Gemini failed startup test:", e)
-        return
+        # Append a header for this new run
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        AppendToFile(
+            file_name,
+            f"\n\n\n=============== NEW RUN (Gemini) - {timestamp} "
+            f"==============="
+            f"\n\n",
+        )
 
-    print("\n\n********************* Starting Gemini tiers... ")
+        # Initialize the generative model & start chat session
+        # (the bulk of prompt_text may already sit in a context cache)
+        model, first_message, cache_write = GeminiTierModel(prompt_text)
+        chat = model.start_chat(history=[])
 
-    for tier_code, prompt_text, file_name in tiers:
-        try:
-            # Append a header for this new run
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(file_name, "a", encoding="utf-8") as f:
-                f.write(
-                    f"\n\n\n=============== NEW RUN (Gemini) - {timestamp} "
-                    f"==============="
-                    f"\n\n"
-                )
+        # --- Generation configurations ---
+        config_first_item = GenAI().types.GenerationConfig(
+            temperature=FIRST_ITEM_TEMP
+        )
+        config_next_items = GenAI().types.GenerationConfig(
+            temperature=NEXT_ITEM_TEMP
+        )
 
-            # Initialize the generative model & start chat session
-            model = genai.GenerativeModel(GEMINI_MODEL)
-            chat = model.start_chat(history=[])
+        # -------- first item generation --------
+        print(
+            f"Generating {tier_code} (Gemini) #1 (Temp = {FIRST_ITEM_TEMP})..."
+        )
 
-            # --- Generation configurations ---
-            config_first_item = genai.types.GenerationConfig(
-                temperature=FIRST_ITEM_TEMP
-            )
-            config_next_items = genai.types.GenerationConfig(
-                temperature=NEXT_ITEM_TEMP
-            )
+        echo = NewStreamEcho("Gemini", tier_code, 1)
+        start_time = time.time()
+        response, retries = CallGemini(  # This is the LLM call
+            chat.send_message,
+            first_message,
+            generation_config=config_first_item,
+            safety_settings=GEMINI_SAFETY_SETTINGS,
+            echo=echo,
+        )
+        end_time = time.time()
+        elapsed = end_time - start_time
+
+        in_tokens, out_tokens, cache_read = GeminiUsage(response)
+
+        PrintToFileAndScreen(
+            "Gemini",
+            tier_code,
+            1,
+            response.text,
+            file_name,
+            passage_name,
+            elapsed,
+            in_tokens,
+            out_tokens,
+            cache_write_tokens=cache_write,
+            cache_read_tokens=cache_read,
+            retries=retries,
+            stream=echo,
+        )
+
+        if item_per_tier == 1:
+            return
 
-            # -------- first item generation --------
+        # -------- ITEMS 2..N --------
+        for index in range(2, item_per_tier + 1):
             print(
-                f"Generating {tier_code} (Gemini) #1 (Temp = {FIRST_ITEM_TEMP})..."
+                f"Generating {tier_code} (Gemini) #{index} "
+                f"(Temp = {NEXT_ITEM_TEMP})..."
             )
 
+            echo = NewStreamEcho("Gemini", tier_code, index)
             start_time = time.time()
-            response = chat.send_message(  # This is the LLM call
-                prompt_text,
-                generation_config=config_first_item,
+            response, retries = CallGemini(  # This is the LLM call
+                chat.send_message,
+                FOLLOWUP_PROMPT,
+                generation_config=config_next_items,
                 safety_settings=GEMINI_SAFETY_SETTINGS,
+                echo=echo,
             )
             end_time = time.time()
             elapsed = end_time - start_time
 
-            # FIXED: Check if metadata exists, then access attributes directly
-            if response.usage_metadata:
-                in_tokens = response.usage_metadata.prompt_token_count
-                out_tokens = response.usage_metadata.candidates_token_count
-            else:
-                in_tokens = 0
-                out_tokens = 0
+            in_tokens, out_tokens, cache_read = GeminiUsage(response)
 
             PrintToFileAndScreen(
                 "Gemini",
                 tier_code,
-                1,
+                index,
                 response.text,
                 file_name,
                 passage_name,
                 elapsed,
                 in_tokens,
                 out_tokens,
+                cache_read_tokens=cache_read,
+                retries=retries,
+                stream=echo,
             )
 
-            if item_per_tier == 1:
-                continue
+    except Exception as e:
+        print(f"An error occurred while processing Tier {tier_code} (Gemini): {e}")
+        print("Moving to the next tier.")
+        AppendToFile(
+            file_name,
+            "\n\n========== ERROR ==========\n\n"
+            f"An error occurred: {e}\n",
+        )
 
-            # -------- ITEMS 2..N --------
-            for index in range(2, item_per_tier + 1):
-                print(
-                    f"Generating {tier_code} (Gemini) #{index} "
-                    f"(Temp = {NEXT_ITEM_TEMP})..."
-                )
+# ---------------------------------------------------------------------------
+#  Claude runner
+# ---------------------------------------------------------------------------
 
-                start_time = time.time()
-                response = chat.send_message(  # This is the LLM call
-                    FOLLOWUP_PROMPT,
-                    generation_config=config_next_items,
-                    safety_settings=GEMINI_SAFETY_SETTINGS,
-                )
-                end_time = time.time()
-                elapsed = end_time - start_time
-
-                # FIXED: Check if metadata exists, then access attributes directly
-                if response.usage_metadata:
-                    in_tokens = response.usage_metadata.prompt_token_count
-                    out_tokens = response.usage_metadata.candidates_token_count
-                else:
-                    in_tokens = 0
-                    out_tokens = 0
-
-                PrintToFileAndScreen(
-                    "Gemini",
-                    tier_code,
-                    index,
-                    response.text,
-                    file_name,
-                    passage_name,
-                    elapsed,
-                    in_tokens,
-                    out_tokens,
-                )
+def ClaudeRequestMessages(messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Return the conversation to send to Claude, with prompt-cache breakpoints.
 
-                time.sleep(1)
+    One breakpoint sits on the tier prompt (identical for every item in the
+    tier) and one on the newest user turn, so the next follow-up reads the
+    whole earlier conversation from the cache. The stored history itself
+    stays plain strings.
+    """
+    if not CLAUDE_PROMPT_CACHING:
+        return messages
+
+    last = len(messages) - 1
+    request: List[Dict[str, Any]] = []
+    for position, message in enumerate(messages):
+        if position in (0, last):
+            request.append(
+                {
+                    "role": message["role"],
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": message["content"],
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                }
+            )
+        else:
+            request.append(message)
 
-        except Exception as e:
-            print(f"An error occurred while processing Tier {tier_code} (Gemini): {e}")
-            print("Moving to the next tier.")
-            with open(file_name, "a", encoding="utf-8") as f:
-                f.write(f"\n\n========== ERROR ==========\n\n")
-                f.write(f"An error occurred: {e}\n")
-            continue
+    return request
+
+
+def ClaudeUsage(response: Any) -> Tuple[int, int, int, int]:
+    """
+    Return (input_tokens, output_tokens, cache_write_tokens, cache_read_tokens).
+
+    With caching on, Anthropic's usage.input_tokens only counts the uncached
+    part of the prompt, so the cached parts are added back in to keep
+    input_tokens comparable with earlier runs.
+    """
+    usage = response.usage
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+
+    return (
+        usage.input_tokens + cache_write + cache_read,
+        usage.output_tokens,
+        cache_write,
+        cache_read,
+    )
 
-# ---------------------------------------------------------------------------
-#  Claude runner
-# ---------------------------------------------------------------------------
 
 def RunClaude(
     tiers: List[tuple[str, str, str]],
@@ -288,119 +1085,168 @@ def RunClaude(
     Run Anthropic Claude on all tiers.
     """
 
-    # Quick startup test
+    print("\n\n********************* Starting Claude tiers... ")
+
+    run_tier = TierFunction("Claude", _RunClaudeTier, _ClaudeSample)
+    RunTiersConcurrently("Claude", run_tier, tiers, item_per_tier, passage_name)
+
+
+def _ClaudeSample(
+    prompt_text: str, temp: float, seed: int, count: int
+) -> List[SampleResult]:
+    """
+    One stand-alone Claude call. The Messages API takes no seed and returns
+    a single answer, so count is always 1 (see SINGLE_CANDIDATE_LLMS).
+    """
+    response, retries = CallClaude(
+        model=CLAUDE_MODEL,
+        max_tokens=4096,
+        temperature=temp,
+        messages=ClaudeRequestMessages([{"role": "user", "content": prompt_text}]),
+    )
+    return ClaudeSampleResults(response, retries)
+
+
+def ClaudeSampleResults(response: Any, retries: int) -> List[SampleResult]:
+    """
+    The single item of a Claude sample.
+    """
+    in_tokens, out_tokens, cache_write, cache_read = ClaudeUsage(response)
+    return [
+        (
+            response.content[0].text,
+            in_tokens,
+            out_tokens,
+            {
+                "cache_write_tokens": cache_write,
+                "cache_read_tokens": cache_read,
+                "retries": retries,
+            },
+        )
+    ]
+
+
+def _RunClaudeTier(
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier Claude items for a single tier.
+    """
+
+    # Append a header for this new run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n\n=============== NEW RUN (Claude) - {timestamp} "
+        f"==============="
+        f"\n\n",
+    )
+
     try:
-        anthropic_client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=1,
-            temperature=0,
-            messages=[{"role": "user", "content": "ping"}],
+        # -------- first item generation --------
+        print(
+            f"Generating {tier_code} (Claude) #1 (Temp = {FIRST_ITEM_TEMP})..."
         )
-    except Exception as e:
-        print("Claude failed startup test:", e)
-        return
 
-    print("\n\n********************* Starting Claude tiers... ")
+        messages: List[Dict[str, str]] = [
+            {"role": "user", "content": prompt_text}
+        ]
 
-    for tier_code, prompt_text, file_name in tiers:
+        echo = NewStreamEcho("Claude", tier_code, 1)
+        start_time = time.time()
+        response, retries = CallClaude(  # This is the LLM call
+            model=CLAUDE_MODEL,
+            max_tokens=4096,
+            temperature=FIRST_ITEM_TEMP,
+            messages=ClaudeRequestMessages(messages),
+            echo=echo,
+        )
+        end_time = time.time()
+        elapsed = end_time - start_time
+
+        response_text = response.content[0].text
+        in_tokens, out_tokens, cache_write, cache_read = ClaudeUsage(response)
+
+        PrintToFileAndScreen(
+            "Claude",
+            tier_code,
+            1,
+            response_text,
+            file_name,
+            passage_name,
+            elapsed,
+            in_tokens,
+            out_tokens,
+            cache_write_tokens=cache_write,
+            cache_read_tokens=cache_read,
+            retries=retries,
+            stream=echo,
+        )
 
-        # Append a header for this new run
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(file_name, "a", encoding="utf-8") as f:
-            f.write(
-                f"\n\n\n=============== NEW RUN (Claude) - {timestamp} "
-                f"==============="
-                f"\n\n"
-            )
+        if item_per_tier == 1:
+            return
 
-        try:
-            # -------- first item generation --------
+        # Add assistant response to conversation history
+        messages.append({"role": "assistant", "content": response_text})
+
+        # -------- ITEMS 2..N --------
+        for index in range(2, item_per_tier + 1):
             print(
-                f"Generating {tier_code} (Claude) #1 (Temp = {FIRST_ITEM_TEMP})..."
+                f"Generating {tier_code} (Claude) #{index} "
+                f"(Temp = {NEXT_ITEM_TEMP})..."
             )
 
-            messages: List[Dict[str, str]] = [
-                {"role": "user", "content": prompt_text}
-            ]
+            messages.append(
+                {
+                    "role": "user",
+                    "content": FOLLOWUP_PROMPT,
+                }
+            )
 
+            echo = NewStreamEcho("Claude", tier_code, index)
             start_time = time.time()
-            response = anthropic_client.messages.create(  # This is the LLM call
+            response, retries = CallClaude(  # This is the LLM call
                 model=CLAUDE_MODEL,
                 max_tokens=4096,
-                temperature=FIRST_ITEM_TEMP,
-                messages=messages,
+                temperature=NEXT_ITEM_TEMP,
+                messages=ClaudeRequestMessages(messages),
+                echo=echo,
             )
             end_time = time.time()
             elapsed = end_time - start_time
 
             response_text = response.content[0].text
+            in_tokens, out_tokens, cache_write, cache_read = ClaudeUsage(response)
 
             PrintToFileAndScreen(
                 "Claude",
                 tier_code,
-                1,
+                index,
                 response_text,
                 file_name,
                 passage_name,
                 elapsed,
-                response.usage.input_tokens,
-                response.usage.output_tokens,
+                in_tokens,
+                out_tokens,
+                cache_write_tokens=cache_write,
+                cache_read_tokens=cache_read,
+                retries=retries,
+                stream=echo,
             )
 
-            if item_per_tier == 1:
-                continue
-
-            # Add assistant response to conversation history
             messages.append({"role": "assistant", "content": response_text})
 
-            # -------- ITEMS 2..N --------
-            for index in range(2, item_per_tier + 1):
-                print(
-                    f"Generating {tier_code} (Claude) #{index} "
-                    f"(Temp = {NEXT_ITEM_TEMP})..."
-                )
-
-                messages.append(
-                    {
-                        "role": "user",
-                        "content": FOLLOWUP_PROMPT,
-                    }
-                )
-
-                start_time = time.time()
-                response = anthropic_client.messages.create(  # This is the LLM call
-                    model=CLAUDE_MODEL,
-                    max_tokens=4096,
-                    temperature=NEXT_ITEM_TEMP,
-                    messages=messages,
-                )
-                end_time = time.time()
-                elapsed = end_time - start_time
-
-                response_text = response.content[0].text
-
-                PrintToFileAndScreen(
-                    "Claude",
-                    tier_code,
-                    index,
-                    response_text,
-                    file_name,
-                    passage_name,
-                    elapsed,
-                    response.usage.input_tokens,
-                    response.usage.output_tokens,
-                )
-
-                messages.append({"role": "assistant", "content": response_text})
-
-        except Exception as e:
-            print(f"An error occurred while processing Tier {tier_code} (Claude): {e}")
-            with open(file_name, "a", encoding="utf-8") as f:
-                f.write("\n\n========== ERROR ==========\n\n")
-                f.write(
-                    f"An error occurred while processing this tier (Claude): {e}\n"
-                )
-            continue
+    except Exception as e:
+        print(f"An error occurred while processing Tier {tier_code} (Claude): {e}")
+        AppendToFile(
+            file_name,
+            "\n\n========== ERROR ==========\n\n"
+            f"An error occurred while processing this tier (Claude): {e}\n",
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -414,7 +1260,8 @@ def InitCopilotAuth() -> Optional[Tuple[str, Dict[str, str]]]:
     Adapted by Copilot and AMH, auth cleanup assisted by GPT-5.1.
     """
     try:
-        credentials = DeviceCodeCredential(
+        identity = LazyImport("azure.identity")
+        credentials = identity.DeviceCodeCredential(
             tenant_id=os.environ.get("AZURE_TENANT_ID"),
             client_id=os.environ.get("AZURE_CLIENT_ID"),
         )
@@ -435,20 +1282,38 @@ def InitCopilotAuth() -> Optional[Tuple[str, Dict[str, str]]]:
     return base_url, headers
 
 
+_copilot_auth: Optional[Tuple[str, Dict[str, str]]] = None
+_copilot_auth_lock = threading.Lock()
+
+
+def GetCopilotAuth() -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    InitCopilotAuth, done once per process (the preflight stage signs in,
+    the runners reuse it).
+    """
+    global _copilot_auth
+    with _copilot_auth_lock:
+        if _copilot_auth is None:
+            _copilot_auth = InitCopilotAuth()
+        return _copilot_auth
+
+
 def TestCopilotStartup() -> Optional[Tuple[str, Dict[str, str]]]:
     """
-    Quick startup test for Copilot.
+    Quick startup test for Copilot (run by the preflight stage).
 
     Returns (base_url, headers) if successful, or None on failure.
     """
     try:
-        auth = InitCopilotAuth()
+        auth = GetCopilotAuth()
         if auth is None:
             print("Copilot failed startup test: auth initialization failed.")
             return None
 
         base_url, headers = auth
 
+        httpx = LazyImport("httpx")
+
         # Minimal "ping": try to create an empty conversation
         with httpx.Client(timeout=COPILOT_PING_TIMEOUT) as client:
             resp = client.post(
@@ -471,7 +1336,7 @@ def TestCopilotStartup() -> Optional[Tuple[str, Dict[str, str]]]:
 
 
 def CreateCopilotConversation(
-    client: httpx.Client,
+    client: "httpx.Client",
     base_url: str,
     headers: Dict[str, str],
     tier_code: str,
@@ -514,116 +1379,313 @@ def RunCopilot(
     Run Microsoft Copilot (via Graph) on all tiers.
     """
 
-    startup = TestCopilotStartup()
-    if startup is None:
-        print("Skipping Copilot runs due to startup error.")
+    # Already signed in and checked by the preflight stage
+    auth = GetCopilotAuth()
+    if auth is None:
+        print("Skipping Copilot runs: auth initialization failed.")
         return
 
-    base_url, headers = startup
+    base_url, headers = auth
 
     print("\n\n********************* Starting Copilot tiers... ")
 
+    httpx = LazyImport("httpx")
+
+    # httpx.Client is thread-safe, so all tier threads share one connection pool
     with httpx.Client(timeout=COPILOT_CHAT_TIMEOUT) as client:
 
-        for tier_code, prompt_text, file_name in tiers:
+        def run_tier(
+            tier_code: str,
+            prompt_text: str,
+            file_name: str,
+            item_per_tier: int,
+            passage_name: str,
+        ) -> None:
+            _RunCopilotTier(
+                client,
+                base_url,
+                headers,
+                tier_code,
+                prompt_text,
+                file_name,
+                item_per_tier,
+                passage_name,
+            )
+
+        RunTiersConcurrently("Copilot", run_tier, tiers, item_per_tier, passage_name)
 
-            conversation_id = CreateCopilotConversation(
-                client=client,
-                base_url=base_url,
+
+def _RunCopilotTier(
+    client: "httpx.Client",
+    base_url: str,
+    headers: Dict[str, str],
+    tier_code: str,
+    prompt_text: str,
+    file_name: str,
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Generate item_per_tier Copilot items for a single tier, in its own
+    conversation.
+    """
+
+    conversation_id = CreateCopilotConversation(
+        client=client,
+        base_url=base_url,
+        headers=headers,
+        tier_code=tier_code,
+    )
+    if conversation_id is None:
+        return
+
+    # Header for this run
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    AppendToFile(
+        file_name,
+        f"\n\n=============== NEW RUN (Copilot) - {timestamp}  "
+        f"==============="
+        f"\n\n",
+    )
+
+    def post_chat(chat_payload: Dict[str, Any]) -> "httpx.Response":
+        limiter = GetRateLimiter("Copilot", "graph")
+        limiter.Acquire()
+
+        # The server stores every turn it receives, so a timeout after the
+        # request went out must not be retried (it would ask twice)
+        try:
+            chat_resp = client.post(
+                f"{base_url}/copilot/conversations/{conversation_id}/chat",
                 headers=headers,
-                tier_code=tier_code,
+                json=chat_payload,
             )
-            if conversation_id is None:
-                continue
+        except Exception as e:
+            RaiseIfMaybeDelivered(e)
+            raise
 
-            # Header for this run
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(file_name, "a", encoding="utf-8") as f:
-                f.write(
-                    f"\n\n=============== NEW RUN (Copilot) - {timestamp}  "
-                    f"==============="
-                    f"\n\n"
+        # Graph answers throttling with 429 + Retry-After
+        limiter.UpdateFromHeaders(chat_resp.headers)
+
+        if chat_resp.status_code in RETRYABLE_STATUS:
+            raise RetryableHTTPError(
+                chat_resp.status_code,
+                RetryAfterSeconds(chat_resp.headers),
+                chat_resp.text,
+            )
+        return chat_resp
+
+    def stream_chat(
+        chat_payload: Dict[str, Any], prompt: str, echo: StreamEcho
+    ) -> Tuple[Optional[str], str]:
+        """
+        Send over chatOverStream, echoing the reply as it grows; returns
+        (reply, "") or (None, error text).
+        """
+        limiter = GetRateLimiter("Copilot", "graph")
+        limiter.Acquire()
+
+        echo.Start()
+        # As in post_chat, a turn that may have reached the server (e.g. a
+        # read timeout mid-stream) is never retried
+        try:
+            with client.stream(
+                "POST",
+                f"{base_url}/copilot/conversations/{conversation_id}/chatOverStream",
+                headers=headers,
+                json=chat_payload,
+            ) as chat_resp:
+                limiter.UpdateFromHeaders(chat_resp.headers)
+
+                if chat_resp.status_code != 200:
+                    chat_resp.read()
+                    if chat_resp.status_code in RETRYABLE_STATUS:
+                        raise RetryableHTTPError(
+                            chat_resp.status_code,
+                            RetryAfterSeconds(chat_resp.headers),
+                            chat_resp.text,
+                        )
+                    return None, f"Status {chat_resp.status_code}: {chat_resp.text}"
+
+                # Every server-sent event carries the conversation so far,
+                # with the reply (so far) as its last message; other payloads
+                # (keep-alives, plain-text notices) are skipped
+                reply = ""
+                for line in chat_resp.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        event = json.loads(line[len("data:"):])
+                    except json.JSONDecodeError:
+                        continue
+                    messages = event.get("messages") if isinstance(event, dict) else None
+                    if not messages:
+                        continue
+                    text = messages[-1].get("text") or ""
+                    if text == prompt:
+                        continue
+                    echo.Write(text[len(reply):] if text.startswith(reply) else text)
+                    reply = text
+        except Exception as e:
+            RaiseIfMaybeDelivered(e)
+            raise
+
+        echo.Finish()
+        if not reply:
+            return None, "No reply text in the chat stream"
+        return reply, ""
+
+    def send_chat(
+        prompt: str, echo: Optional[StreamEcho]
+    ) -> Tuple[Optional[str], int]:
+        chat_payload = {
+            "message": {"text": prompt},
+            "locationHint": {"timeZone": "America/New_York"},
+        }
+
+        if echo is not None:
+            try:
+                (reply, error), retries = CallWithRetry(
+                    "Copilot", "graph", stream_chat, chat_payload, prompt, echo
                 )
+            except Exception as e:
+                print(f"ERROR during chat send (tier {tier_code}): {e}")
+                return None, 0
+            if reply is None:
+                print(f"ERROR during chat send (tier {tier_code}): {error}")
+            return reply, retries
 
-            def send_chat(prompt: str) -> Optional[str]:
-                chat_payload = {
-                    "message": {"text": prompt},
-                    "locationHint": {"timeZone": "America/New_York"},
-                }
+        try:
+            chat_resp, retries = CallWithRetry(
+                "Copilot", "graph", post_chat, chat_payload
+            )
+        except Exception as e:
+            print(f"ERROR during chat send (tier {tier_code}): {e}")
+            return None, 0
+
+        if chat_resp.status_code == 200:
+            data = chat_resp.json()
+            messages = data.get("messages")
+            if not messages:
+                print(f"ERROR: No messages returned (tier {tier_code}).")
+                print("Raw JSON:", chat_resp.text)
+                return None, retries
+            return messages[-1].get("text", ""), retries
 
-                chat_resp = client.post(
-                    f"{base_url}/copilot/conversations/{conversation_id}/chat",
-                    headers=headers,
-                    json=chat_payload,
-                )
+        print(f"ERROR during chat send (tier {tier_code}).")
+        print("Status:", chat_resp.status_code)
+        print("Raw JSON:", chat_resp.text)
+        return None, retries
 
-                if chat_resp.status_code == 200:
-                    data = chat_resp.json()
-                    messages = data.get("messages")
-                    if not messages:
-                        print(f"ERROR: No messages returned (tier {tier_code}).")
-                        print("Raw JSON:", chat_resp.text)
-                        return None
-                    return messages[-1].get("text", "")
+    # -------- first item --------
+    print(f"Generating {tier_code} (Copilot) #1...")
 
-                print(f"ERROR during chat send (tier {tier_code}).")
-                print("Status:", chat_resp.status_code)
-                print("Raw JSON:", chat_resp.text)
-                return None
+    echo = NewStreamEcho("Copilot", tier_code, 1)
+    start_time = time.time()
+    first_text, retries = send_chat(prompt_text, echo)  # This is the LLM call
+    end_time = time.time()
+    elapsed = end_time - start_time
 
-            # -------- first item --------
-            print(f"Generating {tier_code} (Copilot) #1...")
+    if first_text is None:
+        print(f"Skipping tier {tier_code} due to chat error.")
+        return
 
-            start_time = time.time()
-            first_text = send_chat(prompt_text)  # This is the LLM call
-            end_time = time.time()
-            elapsed = end_time - start_time
+    PrintToFileAndScreen(
+        "Copilot",
+        tier_code,
+        1,
+        first_text,
+        file_name,
+        passage_name,
+        elapsed,
+        0,
+        0,
+        retries=retries,
+        stream=echo,
+    )
 
-            if first_text is None:
-                print(f"Skipping tier {tier_code} due to chat error.")
-                continue
+    if item_per_tier == 1:
+        return
 
-            PrintToFileAndScreen(
-                "Copilot",
-                tier_code,
-                1,
-                first_text,
-                file_name,
-                passage_name,
-                elapsed,
-                0,
-                0,
+    # -------- ITEMS 2..N --------
+    for index in range(2, item_per_tier + 1):
+        print(f"Generating {tier_code} (Copilot) #{index}...")
+
+        echo = NewStreamEcho("Copilot", tier_code, index)
+        start_time = time.time()
+        next_text, retries = send_chat(FOLLOWUP_PROMPT, echo)
+        end_time = time.time()
+        elapsed = end_time - start_time
+
+        if next_text is None:
+            print(
+                f"Stopping tier {tier_code} after #{index-1} "
+                f"due to chat error."
             )
+            break
+
+        PrintToFileAndScreen(
+            "Copilot",
+            tier_code,
+            index,
+            next_text,
+            file_name,
+            passage_name,
+            elapsed,
+            0,
+            0,
+            retries=retries,
+            stream=echo,
+        )
 
-            if item_per_tier == 1:
-                continue
 
-            # -------- ITEMS 2..N --------
-            for index in range(2, item_per_tier + 1):
-                print(f"Generating {tier_code} (Copilot) #{index}...")
-
-                start_time = time.time()
-                next_text = send_chat(FOLLOWUP_PROMPT)
-                end_time = time.time()
-                elapsed = end_time - start_time
-
-                if next_text is None:
-                    print(
-                        f"Stopping tier {tier_code} after #{index-1} "
-                        f"due to chat error."
-                    )
-                    break
-
-                PrintToFileAndScreen(
-                    "Copilot",
-                    tier_code,
-                    index,
-                    next_text,
-                    file_name,
-                    passage_name,
-                    elapsed,
-                    0,
-                    0,
-                )
+# ---------------------------------------------------------------------------
+#  Cross-LLM scheduling
+# ---------------------------------------------------------------------------
+
+LLM_RUNNERS: Dict[str, Callable[[List[tuple[str, str, str]], int, str], None]] = {
+    "GPT": RunGPT,
+    "Gemini": RunGemini,
+    "Claude": RunClaude,
+    "Copilot": RunCopilot,
+}
+
+
+def RunSelectedLLMs(
+    LLMs_selected: List[str],
+    tiers: List[tuple[str, str, str]],
+    item_per_tier: int,
+    passage_name: str,
+) -> None:
+    """
+    Run every selected LLM at the same time, each in its own thread.
+
+    The LLMs share no rate limits, so total wall time is roughly that of the
+    slowest one instead of the sum of all of them. Output to the shared tier
+    files is block-atomic (see AppendToFile), and every item header names
+    its LLM, so the mixed files still break up cleanly.
+    """
+    # Keep the historical GPT, Gemini, Claude, Copilot launch order
+    selected = [name for name in LLM_RUNNERS if name in LLMs_selected]
+    if not selected:
+        return
+
+    if len(selected) == 1:
+        LLM_RUNNERS[selected[0]](tiers, item_per_tier, passage_name)
+        return
 
-                time.sleep(1)
+    print(f"\n\nRunning {', '.join(selected)} side by side...")
+
+    with ThreadPoolExecutor(
+        max_workers=len(selected), thread_name_prefix="LLM"
+    ) as pool:
+        futures = {
+            name: pool.submit(LLM_RUNNERS[name], tiers, item_per_tier, passage_name)
+            for name in selected
+        }
+
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"{name} run stopped with an unexpected error: {e}")
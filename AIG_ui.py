@@ -189,6 +189,41 @@ def AskLLMs() -> list[str]:
                 print("\nInvalid choice. Please enter a number from 1 to 5.")
 
 
+def AskRunnerBackend() -> str:
+    """
+    Ask the user which runner backend to use and return "threads", "async"
+    or "batch".
+
+    Threads and asyncio follow the same GENERATION_STRATEGY and write the
+    same items to the same files, so the two can be benchmarked against
+    each other. Only threads stream (STREAM_RESPONSES), so only threaded
+    items record TTFT, generation time and tokens/sec. Batch submits
+    everything to the providers' batch APIs (GPT and Claude only) and
+    waits, possibly for hours.
+    """
+    print("\n" * 3 + "═" * 45)
+    print("   Select a Runner Backend")
+    print("═" * 45)
+    print("  1) Threads (standard SDK clients)")
+    print("  2) asyncio (async SDK clients, no streaming)")
+    print("  3) Batch (offline, GPT and Claude only)")
+    print("═" * 45)
+
+    while True:
+
+        user_choice = input("Enter your choice (1–3): ").strip()
+
+        match user_choice:
+            case "1":
+                return "threads"
+            case "2":
+                return "async"
+            case "3":
+                return "batch"
+            case _:
+                print("\nInvalid choice. Please enter a number from 1 to 3.")
+
+
 def AskItemsPerTier() -> int:
     """
     Ask the user how many items per tier to generate (>=1).
@@ -1,9 +1,20 @@
 import re
-import random
 import os
-import csv
 import hashlib
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from multiprocessing import Manager
+from queue import Empty
+
+from Item_Store import (
+    open_item_store, checksum_seen, new_item_id, insert_item, store_passage,
+    load_file_mark, save_file_mark, export_items, export_parquet, PASSAGE_HEADER, PARQUET_DIRNAME,
+)
+from Item_NearDuplicates import minhash_signature, index_item, index_unindexed_items, NEAR_DUPLICATE_THRESHOLD
 
 def get_valid_standard_folders():
     """
@@ -121,6 +132,383 @@ def get_passage_text(passage_filename):
 
     return f"\n\n[Passage file '{passage_filename}' not found in '{passages_dir}/' directory.]"
 
+# Item metadata columns, in log order (shared by both item sources below)
+METADATA_FIELDS = [
+    "Tier", "LLM", "Item Index", "Temperature", "Input Tokens", "Output Tokens",
+    "Total Tokens", "Elapsed Time", "TTFT", "Generation Time", "Tokens/Sec",
+    "Cache Write Tokens", "Cache Read Tokens", "Retries"
+]
+
+def clean_item_text(text):
+    """
+    Strips banners and header lines from an item's text, leaving the body
+    that is saved and checksummed.
+    """
+    cleaned_body = text.strip()
+    cleaned_body = re.sub(r'\\\\', '', cleaned_body)
+    
+    # Cleaning sequence
+    cleaned_body = re.sub(r'^Passage:.*(\n|$)', '', cleaned_body, flags=re.MULTILINE)
+    cleaned_body = re.sub(r'^Tier\s+\w+.*(\n|$)', '', cleaned_body, flags=re.MULTILINE)
+    cleaned_body = re.sub(r'^=+\s*NEW RUN.*(\n|$)', '', cleaned_body, flags=re.MULTILINE)
+    return cleaned_body.strip()
+
+def extract_passage_filename(text):
+    """
+    Returns the passage file name from a "Passage: ..." line, or None.
+    """
+    passage_match = re.search(r'Passage:.*?\s+(.*)\.txt', text)
+    return passage_match.group(1).strip() + ".txt" if passage_match else None
+
+def normalize_newlines(text):
+    """
+    Converts CRLF and lone CR line endings to LF, as text-mode reading would.
+    """
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+# Line patterns for the streaming tier-file parser below
+NEW_ITEM_BANNER = re.compile(r'=+\s*NEW ITEM\s*=+', re.IGNORECASE)
+ITEM_MARKER = re.compile(r'(Question:|Item:|\d\.)')
+HEADER_LINE = re.compile(r'^(?:Passage:|Tier\s+\w+|=+\s*NEW RUN)')
+RUN_BANNER = re.compile(r'=+\s*NEW RUN.*?(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})')
+
+# (key, substring every match contains, pattern): the first line of a block
+# matching each pattern supplies that piece of metadata
+LINE_FACTS = [
+    ("meta", "temp=", re.compile(r'(Tier\s+\w+)\s*\((.*?)\).*?temp=([\d.]+)')),
+    ("index", "#", re.compile(r'Tier\s+\w+\s*\(.*?\)\s*#(\d+)')),
+    ("elapsed", "secs", re.compile(r'\(([\d.]+)\s*secs\)')),
+    ("tokens", "total", re.compile(r'\((\d+)\s*\+\s*(\d+)\s*=\s*(\d+)\s+total\s+tokens\)')),
+    ("input", "Input Tokens:", re.compile(r'Input Tokens:\s*(\d+)')),
+    ("output", "Output Tokens:", re.compile(r'Output Tokens:\s*(\d+)')),
+    ("total", "Total Tokens:", re.compile(r'Total Tokens:\s*(\d+)')),
+    # Streamed items also log time-to-first-token, generation time and tokens/sec
+    ("stream", "TTFT", re.compile(r'\(TTFT\s+([\d.]+)s,\s*gen\s+([\d.]+)s(?:,\s*([\d.]+)\s*tok/s)?\)')),
+    # Only logged when non-zero
+    ("cache", "cache:", re.compile(r'\(cache:\s*(\d+)\s+written,\s*(\d+)\s+read\)')),
+    ("retries", "retr", re.compile(r'\((\d+)\s+retr(?:y|ies)\)')),
+    ("passage", "Passage:", re.compile(r'Passage:.*?\s+(.*)\.txt')),
+]
+
+def new_block():
+    return {"facts": {}, "body": [], "is_item": False, "started": False, "run_time": None}
+
+def feed_block_line(block, line):
+    """
+    Adds one line (or the part of one between banners) to the current block:
+    records any metadata it carries and keeps it for the body unless it is
+    a header line.
+    """
+    facts = block["facts"]
+    for key, marker, pattern in LINE_FACTS:
+        if key not in facts and marker in line:
+            match = pattern.search(line)
+            if match:
+                facts[key] = match.groups()
+    if not block["is_item"] and ITEM_MARKER.search(line):
+        block["is_item"] = True
+    if "NEW RUN" in line:
+        run_match = RUN_BANNER.search(line)
+        if run_match:
+            block["run_time"] = run_match.group(1)
+
+    # Same cleaning as clean_item_text, a line at a time
+    if not block["started"]:
+        line = line.lstrip()
+        if not line:
+            return
+        block["started"] = True
+    if '\\\\' in line:
+        line = line.replace('\\\\', '')
+    if not HEADER_LINE.match(line):
+        block["body"].append(line)
+
+def finish_block(block, run_time):
+    """
+    Returns the item a finished block describes, or None if it holds no item.
+    run_time is when the run that wrote it started (its NEW RUN banner).
+    """
+    if not block["is_item"]:
+        return None
+    facts = block["facts"]
+    tier, llm, temp = facts.get("meta", ("N/A", "N/A", "N/A"))
+    item_index, = facts.get("index", ("N/A",))
+    elapsed_time, = facts.get("elapsed", ("N/A",))
+
+    if "tokens" in facts:
+        input_tokens, output_tokens, total_tokens = facts["tokens"]
+    else:
+        input_tokens, = facts.get("input", ("N/A",))
+        output_tokens, = facts.get("output", ("N/A",))
+        total_tokens, = facts.get("total", ("N/A",))
+
+    # Headers with "(x + y = z total tokens)" leave out zero cache and retry
+    # counts; older formats never logged them
+    logged_zero = "0" if "tokens" in facts else "N/A"
+    cache_write_tokens, cache_read_tokens = facts.get("cache", (logged_zero, logged_zero))
+    retries, = facts.get("retries", (logged_zero,))
+    ttft, generation_time, tokens_per_sec = facts.get("stream", ("N/A", "N/A", "N/A"))
+    passage = facts.get("passage")
+
+    return {
+        "Tier": tier,
+        "LLM": llm,
+        "Item Index": item_index,
+        "Temperature": temp,
+        "Input Tokens": input_tokens,
+        "Output Tokens": output_tokens,
+        "Total Tokens": total_tokens,
+        "Elapsed Time": elapsed_time,
+        "TTFT": ttft,
+        "Generation Time": generation_time,
+        "Tokens/Sec": tokens_per_sec or "N/A",
+        "Cache Write Tokens": cache_write_tokens,
+        "Cache Read Tokens": cache_read_tokens,
+        "Retries": retries,
+        "passage_filename": passage[0].strip() + ".txt" if passage else None,
+        "created": run_time,
+        "body": "".join(block["body"]).strip(),
+    }
+
+def parse_text_lines(lines):
+    """
+    Yields the items of a tier file's text, given line by line. Banners and
+    header lines are recognized as they stream past, so only the current
+    item is ever held in memory.
+    """
+    block = new_block()
+    # A NEW RUN banner ends the block of the previous run's last item, so it
+    # applies from the next block on
+    run_time = None
+    for line in lines:
+        parts = NEW_ITEM_BANNER.split(line) if '=' in line else (line,)
+        for index, part in enumerate(parts):
+            if index:
+                item = finish_block(block, run_time)
+                if item:
+                    yield item
+                run_time = block["run_time"] or run_time
+                block = new_block()
+            if part:
+                feed_block_line(block, part)
+
+    item = finish_block(block, run_time)
+    if item:
+        yield item
+
+def iter_text_lines(file_path, start=0, end=None):
+    """
+    Yields the lines of a text file from byte start up to byte end, with
+    newlines normalized to LF.
+    """
+    remaining = None if end is None else end - start
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        for raw_line in f:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                raw_line = raw_line[:remaining]
+                remaining -= len(raw_line)
+            if b'\r' not in raw_line:
+                yield raw_line.decode('utf-8')
+                continue
+            line = normalize_newlines(raw_line.decode('utf-8'))
+            # A lone CR becomes a line break of its own
+            *inner, last = line.split('\n')
+            for piece in inner:
+                yield piece + '\n'
+            if last:
+                yield last
+
+def format_number(value, digits):
+    """
+    Formats an optional number the way the text headers print it.
+    """
+    return "N/A" if value is None else f"{value:.{digits}f}"
+
+def record_to_item(record):
+    """
+    Converts one JSONL item record into the same shape parse_text_lines yields.
+    """
+    temperature = record.get("temperature")
+    return {
+        "Tier": f"Tier {record['tier']}",
+        "LLM": record["llm"],
+        "Item Index": str(record["index"]),
+        "Temperature": "N/A" if temperature is None else str(temperature),
+        "Input Tokens": str(record["input_tokens"]),
+        "Output Tokens": str(record["output_tokens"]),
+        "Total Tokens": str(record["total_tokens"]),
+        "Elapsed Time": format_number(record["elapsed"], 2),
+        "TTFT": format_number(record.get("ttft"), 2),
+        "Generation Time": format_number(record.get("generation_seconds"), 2),
+        "Tokens/Sec": format_number(record.get("tokens_per_sec"), 1),
+        "Cache Write Tokens": str(record.get("cache_write_tokens", "N/A")),
+        "Cache Read Tokens": str(record.get("cache_read_tokens", "N/A")),
+        "Retries": str(record.get("retries", "N/A")),
+        "passage_filename": extract_passage_filename(f"Passage: {record['passage']}"),
+        "created": record.get("timestamp"),
+        "body": clean_item_text(normalize_newlines(record["text"])),
+    }
+
+def iter_item_records(records_path, mark):
+    """
+    Yields the records of a JSONL sidecar from mark["records_offset"] on,
+    one line at a time, advancing the mark past each complete line. A torn
+    line (e.g. from a crash mid-write) is skipped with a warning.
+    """
+    with open(records_path, 'rb') as f:
+        f.seek(mark["records_offset"])
+        for line in f:
+            line_start = mark["records_offset"]
+            if line.endswith(b'\n'):
+                mark["records_offset"] += len(line)
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"         ! Skipping unreadable record at byte {line_start} in {os.path.basename(records_path)}")
+
+def records_file(file_path):
+    return os.path.splitext(file_path)[0] + ".jsonl"
+
+def new_file_mark():
+    return {"text_offset": 0, "records_offset": 0}
+
+def file_fingerprint(file_path, mark):
+    """
+    Hashes the first and last 4 KB of the already-read part of the tier file
+    and of its sidecar. Appending leaves it unchanged; rewriting or
+    truncating the file (e.g. restoring an older copy) changes it.
+    """
+    digest = hashlib.sha256()
+    for path, offset in ((file_path, mark["text_offset"]), (records_file(file_path), mark["records_offset"])):
+        if not offset:
+            continue
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read(min(offset, 4096)))
+                f.seek(max(0, offset - 4096))
+                digest.update(f.read(offset - f.tell()))
+        except OSError:
+            return ""
+    return digest.hexdigest()
+
+def iter_file_items(file_path, mark=None):
+    """
+    Yields the items of a tier file in one pass, starting where mark (the
+    high-water mark from new_file_mark or the last run) says the previous
+    run stopped. On return the mark has been advanced past everything read.
+
+    Items written since the JSONL sidecar ("X.jsonl" next to "X.txt") existed
+    are read from it directly; only the part of the text file before its
+    first record (older runs) is parsed, streaming.
+    """
+    if mark is None:
+        mark = new_file_mark()
+    records_path = records_file(file_path)
+    text_size = os.path.getsize(file_path)
+
+    records = iter_item_records(records_path, mark) if os.path.isfile(records_path) else iter(())
+    if mark["records_offset"]:
+        # The sidecar was already being read, so the legacy text is done
+        first_record = None
+        legacy_end = mark["text_offset"]
+    else:
+        first_record = next(records, None)
+        legacy_end = text_size if first_record is None else first_record["text_offset"]
+
+    if legacy_end > mark["text_offset"]:
+        yield from parse_text_lines(iter_text_lines(file_path, mark["text_offset"], legacy_end))
+        mark["text_offset"] = legacy_end
+
+    for record in itertools.chain([first_record] if first_record else [], records):
+        if re.search(r'(Question:|Item:|\d\.)', record["text"]):
+            yield record_to_item(record)
+
+# Worker processes for breaking up tier files (1 = break up in this process)
+BREAKUP_WORKERS = os.cpu_count() or 1
+
+# Workers send items back BREAKUP_CHUNK_ITEMS at a time, with at most
+# BREAKUP_CHUNKS_AHEAD chunks waiting per file, so memory stays bounded
+# however large the files are
+BREAKUP_CHUNK_ITEMS = 100
+BREAKUP_CHUNKS_AHEAD = 2
+
+def iter_item_chunks(file_path, mark):
+    """
+    Parses, checksums and MinHash-signs the new items of one tier file (the
+    CPU-bound part of a breakup), yielding lists of up to
+    BREAKUP_CHUNK_ITEMS (item, checksum, signature). Exhausting it leaves
+    mark advanced past everything read.
+    """
+    chunk = []
+    for item in iter_file_items(file_path, mark):
+        chunk.append((item, hashlib.sha256(item["body"].encode('utf-8')).hexdigest(), minhash_signature(item["body"])))
+        if len(chunk) == BREAKUP_CHUNK_ITEMS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def break_up_file(file_path, mark, chunks):
+    """
+    Worker process side of break_up_files: puts one file's item chunks on
+    the chunks queue, then None, and returns the advanced mark.
+    """
+    try:
+        for chunk in iter_item_chunks(file_path, mark):
+            chunks.put(chunk)
+    finally:
+        chunks.put(None)
+    return mark
+
+def queued_chunks(chunks, future, mark):
+    for chunk in iter(chunks.get, None):
+        yield chunk
+    mark.update(future.result())
+
+def break_up_files(files, workers):
+    """
+    Yields an iterator over each (file path, mark)'s item chunks, in order;
+    exhausting one leaves its mark advanced. With workers > 1 the files are
+    broken up in a process pool, at most 2 * workers files ahead of the one
+    being consumed.
+    """
+    if workers <= 1:
+        for file_path, mark in files:
+            yield iter_item_chunks(file_path, mark)
+        return
+
+    with Manager() as manager:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            # Files submitted and not yet consumed; the first is the one
+            # being consumed
+            pending = deque()
+            for file_path, mark in files:
+                chunks = manager.Queue(BREAKUP_CHUNKS_AHEAD)
+                pending.append((chunks, pool.submit(break_up_file, file_path, mark, chunks), mark))
+                if len(pending) > 2 * workers:
+                    yield queued_chunks(*pending[0])
+                    pending.popleft()
+            while pending:
+                yield queued_chunks(*pending[0])
+                pending.popleft()
+        finally:
+            # If the caller stopped early, drain the files still being broken
+            # up so no worker is left blocked on a full queue
+            pool.shutdown(wait=False, cancel_futures=True)
+            for chunks, future, _ in pending:
+                while not future.done():
+                    try:
+                        chunks.get(timeout=0.1)
+                    except Empty:
+                        pass
+            pool.shutdown()
+
 def process_items():
     # 1. Get List of Standards
     selected_standards = get_valid_standard_folders()
@@ -128,182 +516,164 @@ def process_items():
         print("No standards selected. Exiting.")
         return
 
-    # 2. Setup Folder Structure
+    # 2. Open the item database ('Individual Items/items.db')
     base_output_dir = "Individual Items"
-    os.makedirs(base_output_dir, exist_ok=True) # Ensure 'Individual Items' exists
+    open_start = time.perf_counter()
+    conn = open_item_store(base_output_dir)
+    print(f"Opened item database in {time.perf_counter() - open_start:.3f}s.")
     
-    # Create the timestamped subfolder for THIS run
+    # Items from THIS run are tagged with the run name (and exported to a
+    # folder of that name on request)
     timestamp_str = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
     run_folder_name = f"Items {timestamp_str}"
-    run_output_dir = os.path.join(base_output_dir, run_folder_name)
-    os.makedirs(run_output_dir, exist_ok=True)
-    
-    # 3. Load Existing Checksums to Prevent Duplicates
-    seen_checksums = set()
-    csv_filename = os.path.join(base_output_dir, "item_metadata_log.csv")
     
-    if os.path.isfile(csv_filename):
-        try:
-            with open(csv_filename, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                if "Checksum" in reader.fieldnames:
-                    for row in reader:
-                        if row["Checksum"]:
-                            seen_checksums.add(row["Checksum"])
-            print(f"Loaded {len(seen_checksums)} existing items from log to prevent duplicates.")
-        except Exception as e:
-            print(f"Warning: Could not read existing log for duplicates ({e})")
+    # 3. Duplicates are rejected by the database's unique checksum index,
+    #    which is opened, not rebuilt; time spent on it is reported below
+    index_seconds = 0.0
+    index_lookups = 0
+
+    # Near-duplicates are flagged (not rejected) against every stored item;
+    # items imported from the legacy log are indexed once, here
+    indexed = index_unindexed_items(conn)
+    if indexed:
+        print(f"Indexed {indexed} stored items for near-duplicate detection.")
+    total_near_count = 0
+
+    # Tier files are append-only: each file's high-water mark lets this run
+    # skip everything earlier runs already broke up
+    total_bytes_skipped = 0
+    total_bytes_read = 0
 
     print(f"\nProcessing {len(selected_standards)} folders...")
-    print(f"Saving items to: {run_output_dir}")
+    print(f"Saving items to the item database as run: {run_folder_name}")
 
-    all_csv_data = []
-    used_ids = set()
-    
     # Global counters
     total_processed_count = 0
     total_skipped_count = 0
     
     passage_cache = {}
 
-    # 4. Iterate through selected standards
+    # 4. Collect the (standard, tier file) units to break up
+    units = []
     for standard_folder in selected_standards:
-        print(f"\n---> Standard: {standard_folder}")
-        
-        file_paths = get_results_file(standard_folder)
-        if not file_paths: continue
+        for file_path in get_results_file(standard_folder) or []:
+            mark = load_file_mark(conn, file_path)
+            if mark and mark["fingerprint"] != file_fingerprint(file_path, mark):
+                print(f"   ! {os.path.basename(file_path)} was rewritten since the last run; reading it from the start.")
+                mark = None
+            units.append((standard_folder, file_path, mark or new_file_mark()))
+
+    # 5. Parse and checksum the units in parallel; chunks are merged as they
+    #    arrive but in unit order, and only this process touches the
+    #    database, so duplicates are rejected exactly as a serial run would
+    workers = min(BREAKUP_WORKERS, len(units))
+    parse_start = time.perf_counter()
+    marks = [dict(start_mark) for _, _, start_mark in units]
+    unit_chunks = break_up_files([(u[1], mark) for u, mark in zip(units, marks)], workers)
+    try:
+        current_standard = None
+        for (standard_folder, file_path, start_mark), mark, chunks in zip(units, marks, unit_chunks):
+            if standard_folder != current_standard:
+                current_standard = standard_folder
+                print(f"\n---> Standard: {standard_folder}")
 
-        for file_path in file_paths:
             file_name_only = os.path.basename(file_path)
             print(f"     ... Breaking up file: {file_name_only}")
             
             # File-specific counters
             file_new_count = 0
             file_skipped_count = 0
+            file_near_count = 0
+            # Items from before NEW RUN banners had timestamps date from the file
+            file_modified = datetime.fromtimestamp(os.path.getmtime(file_path))
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            blocks = re.split(r'=+\s*NEW ITEM\s*=+', content, flags=re.IGNORECASE)
-
-            for block in blocks:
-                if not re.search(r'(Question:|Item:|\d\.)', block): 
-                    continue
-
-                # Generate ID
-                while True:
-                    item_id = str(random.randint(10000, 99999))
-                    if item_id not in used_ids:
-                        used_ids.add(item_id)
-                        break
-
-                # Extract Metadata
-                meta_match = re.search(r'(Tier\s+\w+)\s*\((.*?)\).*?temp=([\d.]+)', block)
-                tier = meta_match.group(1) if meta_match else "N/A"
-                llm = meta_match.group(2) if meta_match else "N/A"
-                temp = meta_match.group(3) if meta_match else "N/A"
-                
-                time_match = re.search(r'\(([\d.]+)\s*secs\)', block)
-                elapsed_time = time_match.group(1) if time_match else "N/A"
-
-                token_match = re.search(r'\((\d+)\s*\+\s*(\d+)\s*=\s*(\d+)\s+total\s+tokens\)', block)
-                if token_match:
-                    input_tokens, output_tokens, total_tokens = token_match.groups()
-                else:
-                    in_tok = re.search(r'Input Tokens:\s*(\d+)', block)
-                    out_tok = re.search(r'Output Tokens:\s*(\d+)', block)
-                    tot_tok = re.search(r'Total Tokens:\s*(\d+)', block)
-                    input_tokens = in_tok.group(1) if in_tok else "N/A"
-                    output_tokens = out_tok.group(1) if out_tok else "N/A"
-                    total_tokens = tot_tok.group(1) if tot_tok else "N/A"
-
-                # Extract Passage Name
-                passage_match = re.search(r'Passage:.*?\s+(.*)\.txt', block)
-                passage_filename = passage_match.group(1).strip() + ".txt" if passage_match else None
-
-                # Clean Text
-                cleaned_body = block.strip()
-                cleaned_body = re.sub(r'\\\\', '', cleaned_body)
-                
-                # Cleaning sequence
-                cleaned_body = re.sub(r'^Passage:.*(\n|$)', '', cleaned_body, flags=re.MULTILINE)
-                cleaned_body = re.sub(r'^Tier\s+\w+.*(\n|$)', '', cleaned_body, flags=re.MULTILINE)
-                cleaned_body = re.sub(r'^=+\s*NEW RUN.*(\n|$)', '', cleaned_body, flags=re.MULTILINE)
-                cleaned_body = cleaned_body.strip()
-
-                # --- DUPLICATE CHECK ---
-                item_checksum = hashlib.sha256(cleaned_body.encode('utf-8')).hexdigest()
-                
-                if item_checksum in seen_checksums:
-                    file_skipped_count += 1
-                    total_skipped_count += 1
-                    continue # SKIP saving this item
-                
-                # Add to seen list
-                seen_checksums.add(item_checksum)
-                # -----------------------
-
-                # Fetch Passage Content
-                full_passage_content = ""
-                if passage_filename:
-                    if passage_filename not in passage_cache:
+            start_offsets = start_mark["text_offset"] + start_mark["records_offset"]
+            total_bytes_skipped += start_offsets
+            
+            # One transaction per results file (items and its new mark)
+            with conn:
+                for item, item_checksum, signature in itertools.chain.from_iterable(chunks):
+                    passage_filename = item["passage_filename"]
+                    cleaned_body = item["body"]
+
+                    # --- DUPLICATE CHECK ---
+                    index_start = time.perf_counter()
+                    duplicate = checksum_seen(conn, item_checksum)
+                    index_seconds += time.perf_counter() - index_start
+                    index_lookups += 1
+                    
+                    if duplicate:
+                        file_skipped_count += 1
+                        total_skipped_count += 1
+                        continue # SKIP saving this item
+                    # -----------------------
+
+                    # Time-sortable ID from when the item was written and its
+                    # checksum, so it is the same on every rebuild
+                    created = datetime.fromisoformat(item["created"]) if item["created"] else file_modified
+                    item_id = new_item_id(created, item_checksum)
+
+                    # Keep one copy of each passage's text
+                    if passage_filename and passage_filename not in passage_cache:
                         passage_cache[passage_filename] = get_passage_text(passage_filename)
-                    full_passage_content = passage_cache[passage_filename]
-
-                # Save Item File (Content + Passage)
-                safe_passage_name = passage_filename if passage_filename else "Unknown_Passage"
-                item_file_name = f"{standard_folder.strip()} {item_id} {safe_passage_name}"
-                
-                file_content = (
-                    f"Standard: {standard_folder}\n"
-                    f"ID: {item_id}\n"
-                    f"Passage: {safe_passage_name}\n\n"
-                    f"{cleaned_body}"
-                    f"{full_passage_content}"
-                )
-                
-                with open(os.path.join(run_output_dir, item_file_name), 'w', encoding='utf-8') as out_f:
-                    out_f.write(file_content)
-
-                # Log to list (Adding Checksum)
-                all_csv_data.append({
-                    "Run Timestamp": run_folder_name, 
-                    "Random ID": item_id,
-                    "Standard": standard_folder,
-                    "Passage": safe_passage_name,
-                    "Tier": tier,
-                    "LLM": llm,
-                    "Temperature": temp,
-                    "Input Tokens": input_tokens,
-                    "Output Tokens": output_tokens,
-                    "Total Tokens": total_tokens,
-                    "Elapsed Time": elapsed_time,
-                    "Checksum": item_checksum 
-                })
-                file_new_count += 1
-                total_processed_count += 1
+                        passage_text = passage_cache[passage_filename]
+                        if passage_text.startswith(PASSAGE_HEADER):
+                            store_passage(conn, passage_filename, passage_text[len(PASSAGE_HEADER):])
+                        else:
+                            print(f"         {passage_text.strip()}")
+
+                    safe_passage_name = passage_filename if passage_filename else "Unknown_Passage"
+                    row = {
+                        "Run Timestamp": run_folder_name,
+                        "Random ID": item_id,
+                        "Standard": standard_folder,
+                        "Passage": safe_passage_name,
+                    }
+                    row.update({field: item[field] for field in METADATA_FIELDS})
+                    row["Checksum"] = item_checksum
+
+                    # Inserting also adds the checksum to the index
+                    index_start = time.perf_counter()
+                    row_id = insert_item(conn, row, cleaned_body)
+                    index_seconds += time.perf_counter() - index_start
+
+                    # --- NEAR-DUPLICATE CHECK ---
+                    similar = index_item(conn, row_id, signature)
+                    if similar and similar[0][1] >= NEAR_DUPLICATE_THRESHOLD:
+                        file_near_count += 1
+                        total_near_count += 1
+
+                    file_new_count += 1
+                    total_processed_count += 1
+
+                mark["fingerprint"] = file_fingerprint(file_path, mark)
+                save_file_mark(conn, file_path, mark)
+            total_bytes_read += mark["text_offset"] + mark["records_offset"] - start_offsets
             
             # Print file-level stats
             print(f"         * {file_new_count} new items added.")
             print(f"         * {file_skipped_count} duplicate items rejected.")
+            if file_near_count:
+                print(f"         * {file_near_count} new items flagged as near-duplicates.")
+    finally:
+        unit_chunks.close()
+    breakup_seconds = time.perf_counter() - parse_start
 
-    # 5. Handle CSV Logging (Append to MASTER log)
-    if all_csv_data:
-        csv_fields = [
-            "Run Timestamp", "Random ID", "Standard", "Passage", 
-            "Tier", "LLM", "Temperature", "Input Tokens", 
-            "Output Tokens", "Total Tokens", "Elapsed Time", "Checksum"
-        ]
-        
-        file_exists = os.path.isfile(csv_filename)
-        
-        with open(csv_filename, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=csv_fields)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerows(all_csv_data)
-        
-        print(f"\nLog updated: {csv_filename}")
+    # 6. Per-item files and the CSV log are written only on request
+    if total_processed_count:
+        answer = input(f"\nExport this run's {total_processed_count} items to files? (y/N): ").strip().lower()
+        if answer in ('y', 'yes'):
+            export_items(conn, os.path.join(base_output_dir, run_folder_name), run=run_folder_name)
+
+        # Keep the Parquet dataset current once it has been created
+        # (python Item_Store.py); this run only adds its own partitions
+        parquet_dir = os.path.join(base_output_dir, PARQUET_DIRNAME)
+        if os.path.isdir(parquet_dir):
+            try:
+                export_parquet(conn, parquet_dir, run=run_folder_name)
+            except ImportError:
+                print(f"pyarrow is not installed; {parquet_dir} was not updated.")
+    conn.close()
 
     # Final Summary
     print("\n" + "="*30)
@@ -311,6 +681,12 @@ def process_items():
     print("="*30)
     print(f"Total new items added:      {total_processed_count}")
     print(f"Total duplicates rejected:  {total_skipped_count}")
+    print(f"Near-duplicates flagged:    {total_near_count} (clusters: python Item_NearDuplicates.py)")
+    print(f"Bytes read / skipped:       {total_bytes_read:,} / {total_bytes_skipped:,}")
+    print(f"Breakup time:               {breakup_seconds:.2f}s ({len(units)} files, {max(workers, 1)} processes)")
+    if index_lookups:
+        per_lookup_us = index_seconds / index_lookups * 1e6
+        print(f"Duplicate index time:       {index_seconds:.3f}s ({per_lookup_us:.0f} us/item)")
     print("="*30)
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+import csv
+import os
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+
+from Item_Store import open_item_store, STORE_DIR
+from Item_NearDuplicates import normalize_item_text
+
+# Cap on similarity cells computed at once (8 bytes each), so a block of
+# rows against a whole (standard, passage) group stays around 128 MB
+BLOCK_CELLS = 1 << 24
+
+# Dimensions diversity is summarized over
+DIMENSIONS = [("tier", "Tier"), ("llm", "LLM"), ("temperature", "Temperature")]
+
+def load_items(conn, standard=None):
+    """
+    Returns stored items (optionally for one standard) ordered so that each
+    (standard, passage) group is contiguous.
+    """
+    query = "SELECT id, item_id, standard, passage, tier, llm, temperature, body FROM items"
+    params = ()
+    if standard is not None:
+        query += " WHERE standard = ?"
+        params = (standard,)
+    return conn.execute(query + " ORDER BY standard, passage, id", params).fetchall()
+
+def tfidf_matrix(documents):
+    """
+    Builds an L2-normalized TF-IDF matrix (CSR, one row per document) from
+    lists of words, with smoothed IDF: ln((1 + n) / (1 + df)) + 1.
+    """
+    vocabulary = {}
+    indices, data, indptr = [], [], [0]
+    for words in documents:
+        counts = {}
+        for word in words:
+            term = vocabulary.setdefault(word, len(vocabulary))
+            counts[term] = counts.get(term, 0) + 1
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    tf = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(documents), len(vocabulary)),
+    )
+    df = np.bincount(tf.indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(documents)) / (1 + df)) + 1
+    tfidf = tf.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ tfidf
+
+def encode(values):
+    """
+    Returns (codes array, labels) for a column of values, None as "N/A".
+    """
+    labels = sorted({"N/A" if v is None else str(v) for v in values})
+    lookup = {label: code for code, label in enumerate(labels)}
+    return np.array([lookup["N/A" if v is None else str(v)] for v in values], dtype=np.int64), labels
+
+def group_bounds(items):
+    """
+    Yields (start, end) row ranges of each (standard, passage) group.
+    """
+    start = 0
+    for i in range(1, len(items) + 1):
+        if i == len(items) or (items[i]["standard"], items[i]["passage"]) != (items[start]["standard"], items[start]["passage"]):
+            yield start, i
+            start = i
+
+def diversity_summary(items):
+    """
+    Compares every item with the other items written for the same standard
+    and passage (items for different passages are trivially dissimilar), in
+    blocks of rows so memory stays bounded.
+
+    Returns {dimension: {"labels", "pair_sum", "pair_count", "nearest_sum",
+    "items"}}, where pair_* accumulate cosine similarity over ordered pairs
+    by (row label, column label) and nearest_sum sums each item's highest
+    similarity to any other item, by label.
+    """
+    matrix = tfidf_matrix([normalize_item_text(item["body"] or "") for item in items])
+
+    summary = {}
+    codes = {}
+    for column, _ in DIMENSIONS:
+        codes[column], labels = encode([item[column] for item in items])
+        k = len(labels)
+        summary[column] = {
+            "labels": labels,
+            "pair_sum": np.zeros((k, k)),
+            "pair_count": np.zeros((k, k)),
+            "nearest_sum": np.zeros(k),
+            "items": np.zeros(k),
+        }
+
+    for start, end in group_bounds(items):
+        size = end - start
+        if size < 2:
+            continue
+        group = matrix[start:end]
+        block_rows = max(1, BLOCK_CELLS // size)
+
+        for block_start in range(0, size, block_rows):
+            block_end = min(size, block_start + block_rows)
+            similarity = (group[block_start:block_end] @ group.T).toarray()
+
+            # An item is not compared with itself
+            rows = np.arange(block_end - block_start)
+            similarity[rows, rows + block_start] = np.nan
+            nearest = np.nanmax(similarity, axis=1)
+            valid = ~np.isnan(similarity)
+
+            for column, _ in DIMENSIONS:
+                stats = summary[column]
+                k = len(stats["labels"])
+                row_codes = codes[column][start + block_start:start + block_end]
+                col_codes = codes[column][start:end]
+                pair_codes = (row_codes[:, None] * k + col_codes[None, :])[valid]
+                stats["pair_sum"] += np.bincount(pair_codes, weights=similarity[valid], minlength=k * k).reshape(k, k)
+                stats["pair_count"] += np.bincount(pair_codes, minlength=k * k).reshape(k, k)
+                stats["nearest_sum"] += np.bincount(row_codes, weights=nearest, minlength=k)
+                stats["items"] += np.bincount(row_codes, minlength=k)
+    return summary
+
+def format_similarity(total, count):
+    return f"{total / count:.3f}" if count else "  -  "
+
+def print_summary(summary):
+    """
+    Prints, per dimension, each value's mean similarity within the value,
+    to other values, and to each item's nearest neighbour (lower = more
+    diverse), then the value-by-value mean similarity matrix.
+    """
+    for column, title in DIMENSIONS:
+        stats = summary[column]
+        labels = stats["labels"]
+        within = np.diag(stats["pair_sum"])
+        within_count = np.diag(stats["pair_count"])
+        across = stats["pair_sum"].sum(axis=1) - within
+        across_count = stats["pair_count"].sum(axis=1) - within_count
+
+        print("\n" + "="*64)
+        print(f"   Diversity by {title} (mean cosine similarity; lower = more diverse)")
+        print("="*64)
+        print(f"{title:<14}{'Items':>7}{'Within':>10}{'Across':>10}{'Nearest':>10}")
+        for i, label in enumerate(labels):
+            if not stats["items"][i]:
+                continue
+            print(f"{label:<14}{int(stats['items'][i]):>7}"
+                  f"{format_similarity(within[i], within_count[i]):>10}"
+                  f"{format_similarity(across[i], across_count[i]):>10}"
+                  f"{format_similarity(stats['nearest_sum'][i], stats['items'][i]):>10}")
+
+        if len(labels) > 1:
+            print(f"\n{title} x {title}:")
+            print(" " * 14 + "".join(f"{label[:9]:>10}" for label in labels))
+            for i, label in enumerate(labels):
+                print(f"{label[:13]:<14}" + "".join(
+                    f"{format_similarity(stats['pair_sum'][i, j], stats['pair_count'][i, j]):>10}"
+                    for j in range(len(labels))))
+
+def write_summary_csv(summary, csv_path):
+    """
+    Writes one row per (dimension, value, other value) with its mean
+    similarity and pair count.
+    """
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Dimension", "Value", "Other Value", "Mean Similarity", "Pairs"])
+        for column, title in DIMENSIONS:
+            stats = summary[column]
+            for i, label in enumerate(stats["labels"]):
+                for j, other in enumerate(stats["labels"]):
+                    count = int(stats["pair_count"][i, j])
+                    if count:
+                        writer.writerow([title, label, other, round(stats["pair_sum"][i, j] / count, 4), count])
+    print(f"\nDiversity summary saved to: {csv_path}")
+
+def diversity_menu():
+    """
+    Lets the user pick a standard (or all), then prints and saves its
+    diversity summary.
+    """
+    conn = open_item_store()
+    standards = [row[0] for row in conn.execute("SELECT DISTINCT standard FROM items ORDER BY standard")]
+    if not standards:
+        print("The item database is empty. Run Item_Breakup.py first.")
+        return
+
+    print("\n" + "="*40)
+    print("   Item Diversity Analysis")
+    print("="*40)
+    print("0. [ALL STANDARDS]")
+    for i, standard in enumerate(standards, 1):
+        print(f"{i}. {standard}")
+    print("="*40)
+
+    choice_str = input("\nSelect a standard number (or '0' for all): ").strip()
+    if choice_str in ('0', 'all'):
+        standard = None
+    else:
+        try:
+            standard = standards[int(choice_str) - 1]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+
+    items = load_items(conn, standard)
+    conn.close()
+    groups = sum(1 for _ in group_bounds(items))
+    print(f"\nComparing {len(items)} items in {groups} standard/passage groups...")
+
+    summary = diversity_summary(items)
+    print_summary(summary)
+
+    timestamp_str = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+    write_summary_csv(summary, os.path.join(STORE_DIR, f"Diversity {timestamp_str}.csv"))
+
+if __name__ == "__main__":
+    diversity_menu()
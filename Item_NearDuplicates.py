@@ -0,0 +1,221 @@
+import re
+import csv
+import hashlib
+import os
+import random
+from array import array
+from datetime import datetime
+
+from Item_Store import open_item_store, STORE_DIR
+
+# MinHash signature length, split into LSH_BANDS bands of ROWS_PER_BAND
+# values. Two items share a bucket in some band with probability
+# 1 - (1 - s^ROWS_PER_BAND)^LSH_BANDS for Jaccard similarity s: about 50% at
+# s = 0.42 and over 99.9% at s = 0.7, so any threshold from
+# MIN_STORED_SIMILARITY up is served from the stored pairs.
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+
+# Pairs at least this similar are recorded; the report threshold can be
+# anything from here up
+MIN_STORED_SIMILARITY = 0.5
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+SHINGLE_WORDS = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures are stored, so the permutations must never change
+_rng = random.Random(20260116)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+# Where the stem and options end (answer key or rationales follow)
+_ANSWER_SECTION = re.compile(r'^\W*(correct answer|answer key|rationales?)\b', re.IGNORECASE | re.MULTILINE)
+# "A.", "(B)", "c)" option labels, so reordered options shingle the same
+_OPTION_LABEL = re.compile(r'^\W*[a-h][.)]\s+', re.IGNORECASE | re.MULTILINE)
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+def normalize_item_text(body):
+    """
+    Returns the words of an item's stem and options: lowercased, without
+    option labels, punctuation or markdown, and without the answer key and
+    rationales that follow them.
+    """
+    answer_section = _ANSWER_SECTION.search(body)
+    if answer_section:
+        body = body[:answer_section.start()]
+    body = _OPTION_LABEL.sub('', body)
+    return _WORD.findall(body.lower())
+
+def shingle_hashes(words):
+    """
+    Returns the 32-bit hashes of the item's SHINGLE_WORDS-word shingles.
+    """
+    if len(words) < SHINGLE_WORDS:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little') for s in shingles]
+
+def minhash_signature(body):
+    """
+    Returns the item's MinHash signature (NUM_PERMUTATIONS 32-bit values).
+    """
+    hashes = shingle_hashes(normalize_item_text(body))
+    return array('I', [
+        min([(a * h + b) % _MERSENNE_PRIME for h in hashes]) & _MAX_HASH
+        for a, b in _PERMUTATIONS
+    ])
+
+def band_buckets(signature):
+    """
+    Returns one (band, bucket) key per LSH band of a signature.
+    """
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return buckets
+
+def estimated_similarity(signature, other):
+    """
+    Estimates Jaccard similarity as the fraction of matching MinHash values.
+    """
+    return sum(1 for x, y in zip(signature, other) if x == y) / NUM_PERMUTATIONS
+
+def index_item(conn, item_row, signature):
+    """
+    Stores an item's signature and LSH buckets, and records every earlier
+    item in a shared bucket that is at least MIN_STORED_SIMILARITY similar.
+    Returns [(other row id, similarity)], most similar first.
+    """
+    buckets = band_buckets(signature)
+    candidates = set()
+    for band, bucket in buckets:
+        rows = conn.execute("SELECT item FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket))
+        candidates.update(row[0] for row in rows)
+    candidates.discard(item_row)
+
+    similar = []
+    for other in sorted(candidates):
+        other_signature = array('I')
+        other_signature.frombytes(conn.execute(
+            "SELECT signature FROM item_signatures WHERE item = ?", (other,)
+        ).fetchone()[0])
+        similarity = estimated_similarity(signature, other_signature)
+        if similarity >= MIN_STORED_SIMILARITY:
+            similar.append((other, similarity))
+
+    conn.execute("INSERT OR REPLACE INTO item_signatures (item, signature) VALUES (?, ?)", (item_row, signature.tobytes()))
+    conn.executemany("INSERT INTO lsh_buckets (band, bucket, item) VALUES (?, ?, ?)",
+                     [(band, bucket, item_row) for band, bucket in buckets])
+    conn.executemany("INSERT OR REPLACE INTO near_duplicates (item, other, similarity) VALUES (?, ?, ?)",
+                     [(item_row, other, similarity) for other, similarity in similar])
+
+    similar.sort(key=lambda pair: -pair[1])
+    return similar
+
+def index_unindexed_items(conn):
+    """
+    Signs and indexes stored items that have no signature yet (e.g. items
+    imported from the old CSV log), oldest first. Returns how many.
+    """
+    rows = conn.execute(
+        "SELECT id, body FROM items WHERE id NOT IN (SELECT item FROM item_signatures) ORDER BY id"
+    ).fetchall()
+    with conn:
+        for row in rows:
+            index_item(conn, row["id"], minhash_signature(row["body"] or ""))
+    return len(rows)
+
+def near_duplicate_clusters(conn, threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Groups items linked by near-duplicate pairs at or above threshold.
+    Returns clusters (lists of item row ids, oldest first), largest first.
+    """
+    parent = {}
+
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for item, other in conn.execute("SELECT item, other FROM near_duplicates WHERE similarity >= ?", (threshold,)):
+        parent[find(item)] = find(other)
+
+    clusters = {}
+    for x in parent:
+        clusters.setdefault(find(x), []).append(x)
+    return sorted((sorted(c) for c in clusters.values()), key=lambda c: (-len(c), c[0]))
+
+def first_line(body):
+    for line in (body or "").splitlines():
+        line = line.strip(" #*")
+        if line:
+            return line[:90]
+    return ""
+
+def report_clusters(conn, threshold=NEAR_DUPLICATE_THRESHOLD, csv_path=None):
+    """
+    Prints each near-duplicate cluster and, given csv_path, writes one row
+    per clustered item.
+    """
+    clusters = near_duplicate_clusters(conn, threshold)
+    print(f"\n{len(clusters)} near-duplicate clusters at similarity >= {threshold:.2f} "
+          f"({sum(len(c) for c in clusters)} items)")
+
+    csv_rows = []
+    for number, cluster in enumerate(clusters, 1):
+        print(f"\nCluster {number} ({len(cluster)} items)")
+        for row_id in cluster:
+            item = conn.execute("SELECT * FROM items WHERE id = ?", (row_id,)).fetchone()
+            temperature = "N/A" if item["temperature"] is None else item["temperature"]
+            print(f"   {item['item_id']}  {item['standard'].strip()}  {item['tier']} ({item['llm']}, temp={temperature})  "
+                  f"{first_line(item['body'])}")
+            csv_rows.append({
+                "Cluster": number, "Random ID": item["item_id"], "Standard": item["standard"],
+                "Passage": item["passage"], "Tier": item["tier"], "LLM": item["llm"],
+                "Temperature": item["temperature"], "Run Timestamp": item["run"],
+            })
+
+    if csv_path:
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=["Cluster", "Random ID", "Standard", "Passage", "Tier",
+                                                   "LLM", "Temperature", "Run Timestamp"])
+            writer.writeheader()
+            writer.writerows(csv_rows)
+        print(f"\nCluster report saved to: {csv_path}")
+    return clusters
+
+def near_duplicates_menu():
+    """
+    Indexes any unsigned items, then reports clusters at a chosen threshold.
+    """
+    conn = open_item_store()
+    indexed = index_unindexed_items(conn)
+    if indexed:
+        print(f"Indexed {indexed} items for near-duplicate detection.")
+
+    threshold_str = input(f"\nSimilarity threshold ({MIN_STORED_SIMILARITY}-1.0, Enter for {NEAR_DUPLICATE_THRESHOLD}): ").strip()
+    try:
+        threshold = float(threshold_str) if threshold_str else NEAR_DUPLICATE_THRESHOLD
+    except ValueError:
+        print("Invalid threshold.")
+        return
+    if threshold < MIN_STORED_SIMILARITY:
+        print(f"Pairs below {MIN_STORED_SIMILARITY} are not recorded; using {MIN_STORED_SIMILARITY}.")
+        threshold = MIN_STORED_SIMILARITY
+
+    timestamp_str = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+    report_clusters(conn, threshold, os.path.join(STORE_DIR, f"Near Duplicates {timestamp_str}.csv"))
+    conn.close()
+
+if __name__ == "__main__":
+    near_duplicates_menu()
@@ -0,0 +1,171 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Item_Store import open_item_store, STORE_DIR
+
+# List prices in USD per million (input, output, cache write, cache read)
+# tokens for the model each LLM runs (see AIG_config); update them with the
+# models. LLMs without a price (e.g. Copilot) are left out of the
+# items-per-dollar table. Gemini context-cache storage is not included.
+PRICES_PER_MILLION = {
+    "GPT": (1.25, 10.00, 1.25, 0.125),
+    "Claude": (15.00, 75.00, 18.75, 1.50),
+    "Gemini": (2.00, 12.00, 2.00, 0.20),
+}
+
+# input_tokens always includes cache reads; it includes cache writes only
+# for Claude (a Gemini context cache is created by its own call, logged on
+# the tier's first item)
+CACHE_WRITES_IN_INPUT = {"Claude"}
+
+PERCENTILES = [50, 90, 99]
+GROUP_COLUMNS = ["llm", "tier", "temperature"]
+
+STATS_COLUMNS = [
+    "run", "standard", "tier", "llm", "item_index", "temperature",
+    "input_tokens", "output_tokens", "elapsed", "generation_time", "tokens_per_sec",
+    "cache_write_tokens", "cache_read_tokens", "retries",
+]
+
+def load_stats_frame(conn):
+    """
+    Loads the numeric item metadata into a DataFrame (NULLs as NaN), with a
+    throughput column (logged tokens/sec where the item was streamed, else
+    output tokens over elapsed time) and a cost column, with cached prompt
+    tokens priced at the cache rates.
+    """
+    frame = pd.read_sql_query(f"SELECT {', '.join(STATS_COLUMNS)} FROM items", conn)
+    # A column that is NULL throughout (e.g. no streamed items yet) loads as object
+    numeric = STATS_COLUMNS[4:]
+    frame[numeric] = frame[numeric].astype("float64")
+    frame = frame[frame["llm"].notna() & (frame["llm"] != "N/A")]
+
+    fallback = frame["output_tokens"] / frame["elapsed"].where(frame["elapsed"] > 0)
+    frame["throughput"] = frame["tokens_per_sec"].fillna(fallback)
+
+    prices = frame["llm"].map(lambda llm: PRICES_PER_MILLION.get(llm, (np.nan,) * 4))
+    input_price, output_price, write_price, read_price = (prices.str[i] for i in range(4))
+    # Items logged before cache counts were kept are priced as uncached
+    cache_write = frame["cache_write_tokens"].fillna(0)
+    cache_read = frame["cache_read_tokens"].fillna(0)
+    uncached_input = frame["input_tokens"] - cache_read - cache_write.where(frame["llm"].isin(CACHE_WRITES_IN_INPUT), 0)
+    frame["cost"] = (
+        uncached_input * input_price + cache_write * write_price
+        + cache_read * read_price + frame["output_tokens"] * output_price
+    ) / 1e6
+    return frame
+
+def percentile_table(frame, column, keys=GROUP_COLUMNS):
+    """
+    Returns p50/p90/p99 of column per group, plus the group's item count.
+    """
+    grouped = frame.groupby(keys, dropna=False)[column]
+    table = grouped.quantile([p / 100 for p in PERCENTILES]).unstack()
+    table.columns = [f"p{p}" for p in PERCENTILES]
+    table.insert(0, "items", grouped.count())
+    return table
+
+def token_table(frame, keys=GROUP_COLUMNS):
+    columns = ["input_tokens", "cache_write_tokens", "cache_read_tokens", "output_tokens"]
+    return frame.groupby(keys, dropna=False)[columns].mean().round(0)
+
+def inflation_table(frame):
+    """
+    Returns, per LLM and tier, the median input tokens at each follow-up
+    index as a multiple of the median at index 1 (later items in a chat
+    resend everything before them).
+    """
+    indexed = frame[frame["item_index"].notna()]
+    medians = indexed.groupby(["llm", "tier", "item_index"])["input_tokens"].median().unstack("item_index")
+    if medians.empty or 1 not in medians.columns:
+        return medians
+    inflation = medians.div(medians[1], axis=0)
+    inflation.columns = [f"#{int(index)}" for index in inflation.columns]
+    return inflation.round(2)
+
+def cost_table(frame, keys=("llm", "tier")):
+    """
+    Returns items, retries, total cost and items per dollar per group, for
+    priced LLMs.
+    """
+    priced = frame[frame["cost"].notna()]
+    grouped = priced.groupby(list(keys))
+    table = pd.DataFrame({
+        "items": grouped.size(), "retries": grouped["retries"].sum(), "cost_usd": grouped["cost"].sum(),
+    })
+    table["items_per_dollar"] = table["items"] / table["cost_usd"].where(table["cost_usd"] > 0)
+    return table.round({"cost_usd": 2, "items_per_dollar": 1})
+
+def build_report(frame):
+    """
+    Returns the report's tables, by name.
+    """
+    return {
+        "Elapsed Time (s)": percentile_table(frame, "elapsed").round(2),
+        "Throughput (tokens/s)": percentile_table(frame, "throughput").round(1),
+        "Mean Tokens per Item": token_table(frame),
+        "Input-Token Inflation by Follow-Up Index": inflation_table(frame),
+        "Items per Dollar": cost_table(frame),
+    }
+
+def print_report(report):
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        for title, table in report.items():
+            print("\n" + "="*60)
+            print(f"   {title}")
+            print("="*60)
+            print(table.to_string() if not table.empty else "(no data)")
+
+def export_report(report, export_dir):
+    """
+    Writes one CSV per report table.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    for title, table in report.items():
+        file_name = title.replace("/", " per ").replace("(", "").replace(")", "") + ".csv"
+        table.to_csv(os.path.join(export_dir, file_name))
+    print(f"\nReport saved to: {export_dir}")
+
+def stats_menu():
+    """
+    Prints the run-statistics report (optionally for one standard) and
+    offers to save it as CSV files.
+    """
+    conn = open_item_store()
+    frame = load_stats_frame(conn)
+    conn.close()
+    if frame.empty:
+        print("The item database has no items with run metadata. Run Item_Breakup.py first.")
+        return
+
+    standards = sorted(frame["standard"].unique())
+    print("\n" + "="*40)
+    print("   Run Statistics")
+    print("="*40)
+    print("0. [ALL STANDARDS]")
+    for i, standard in enumerate(standards, 1):
+        print(f"{i}. {standard}")
+    print("="*40)
+
+    choice_str = input("\nSelect a standard number (or '0' for all): ").strip()
+    if choice_str not in ('0', 'all'):
+        try:
+            frame = frame[frame["standard"] == standards[int(choice_str) - 1]]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+
+    report = build_report(frame)
+    print(f"\n{len(frame)} items from {frame['run'].nunique()} runs")
+    print_report(report)
+
+    answer = input("\nSave the report as CSV files? (y/N): ").strip().lower()
+    if answer in ('y', 'yes'):
+        timestamp_str = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+        export_report(report, os.path.join(STORE_DIR, f"Stats {timestamp_str}"))
+
+if __name__ == "__main__":
+    stats_menu()
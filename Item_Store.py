@@ -0,0 +1,441 @@
+import os
+import csv
+import sqlite3
+from datetime import datetime
+
+# The item database lives next to the legacy log it replaces
+STORE_DIR = "Individual Items"
+DB_FILENAME = "items.db"
+LEGACY_CSV_FILENAME = "item_metadata_log.csv"
+# Columnar copy of the item metadata (see export_parquet)
+PARQUET_DIRNAME = "items.parquet"
+
+PASSAGE_HEADER = "\n\n================== Passage Text =================\n\n"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id              INTEGER PRIMARY KEY,
+    item_id         TEXT NOT NULL UNIQUE,
+    run             TEXT NOT NULL,
+    standard        TEXT NOT NULL,
+    passage         TEXT NOT NULL,
+    tier            TEXT,
+    llm             TEXT,
+    item_index      INTEGER,
+    temperature     REAL,
+    input_tokens    INTEGER,
+    output_tokens   INTEGER,
+    total_tokens    INTEGER,
+    elapsed         REAL,
+    ttft            REAL,
+    generation_time REAL,
+    tokens_per_sec  REAL,
+    cache_write_tokens INTEGER,
+    cache_read_tokens  INTEGER,
+    retries         INTEGER,
+    checksum        TEXT NOT NULL UNIQUE,
+    body            TEXT,
+    legacy_id       TEXT
+);
+CREATE INDEX IF NOT EXISTS items_standard    ON items (standard);
+CREATE INDEX IF NOT EXISTS items_passage     ON items (passage);
+CREATE INDEX IF NOT EXISTS items_tier        ON items (tier);
+CREATE INDEX IF NOT EXISTS items_llm         ON items (llm);
+CREATE INDEX IF NOT EXISTS items_temperature ON items (temperature);
+CREATE INDEX IF NOT EXISTS items_run         ON items (run);
+
+CREATE TABLE IF NOT EXISTS passages (
+    name TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+
+-- How far Item_Breakup has read each (append-only) tier file and its sidecar
+CREATE TABLE IF NOT EXISTS file_marks (
+    path           TEXT PRIMARY KEY,
+    text_offset    INTEGER NOT NULL,
+    records_offset INTEGER NOT NULL,
+    fingerprint    TEXT NOT NULL
+);
+
+-- Near-duplicate detection (Item_NearDuplicates): each item's MinHash
+-- signature, its LSH bucket per band, and the similar pairs found
+CREATE TABLE IF NOT EXISTS item_signatures (
+    item      INTEGER PRIMARY KEY REFERENCES items (id),
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band   INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    item   INTEGER NOT NULL REFERENCES items (id)
+);
+CREATE INDEX IF NOT EXISTS lsh_buckets_bucket ON lsh_buckets (band, bucket);
+CREATE TABLE IF NOT EXISTS near_duplicates (
+    item       INTEGER NOT NULL REFERENCES items (id),
+    other      INTEGER NOT NULL REFERENCES items (id),
+    similarity REAL NOT NULL,
+    PRIMARY KEY (item, other)
+);
+CREATE INDEX IF NOT EXISTS near_duplicates_similarity ON near_duplicates (similarity);
+"""
+
+# Log/CSV column -> items column, for the metadata Item_Breakup collects
+COLUMN_NAMES = {
+    "Run Timestamp": "run",
+    "Random ID": "item_id",
+    "Standard": "standard",
+    "Passage": "passage",
+    "Tier": "tier",
+    "LLM": "llm",
+    "Item Index": "item_index",
+    "Temperature": "temperature",
+    "Input Tokens": "input_tokens",
+    "Output Tokens": "output_tokens",
+    "Total Tokens": "total_tokens",
+    "Elapsed Time": "elapsed",
+    "TTFT": "ttft",
+    "Generation Time": "generation_time",
+    "Tokens/Sec": "tokens_per_sec",
+    "Cache Write Tokens": "cache_write_tokens",
+    "Cache Read Tokens": "cache_read_tokens",
+    "Retries": "retries",
+    "Checksum": "checksum",
+}
+
+NUMERIC_COLUMNS = {
+    "item_index": int, "temperature": float, "input_tokens": int, "output_tokens": int,
+    "total_tokens": int, "elapsed": float, "ttft": float,
+    "generation_time": float, "tokens_per_sec": float,
+    "cache_write_tokens": int, "cache_read_tokens": int, "retries": int,
+}
+
+# Decimal places the text headers (and so the old log) print timings with
+EXPORT_DIGITS = {"elapsed": 2, "ttft": 2, "generation_time": 2, "tokens_per_sec": 1}
+
+def to_number(value, kind):
+    """
+    Converts a logged value ("0.7", "N/A", "") to a number, or None.
+    """
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+def row_to_columns(row):
+    """
+    Maps a log-style row (CSV column names) to items columns, with numbers
+    typed and "N/A" stored as NULL.
+    """
+    columns = {}
+    for field, column in COLUMN_NAMES.items():
+        value = row.get(field)
+        if column in NUMERIC_COLUMNS:
+            value = to_number(value, NUMERIC_COLUMNS[column])
+        columns[column] = value
+    return columns
+
+def open_item_store(base_output_dir=STORE_DIR):
+    """
+    Opens (creating if needed) the item database, importing the legacy CSV
+    log and per-item files the first time.
+    """
+    os.makedirs(base_output_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(base_output_dir, DB_FILENAME))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+
+    if conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0:
+        import_legacy_log(conn, base_output_dir)
+    return conn
+
+def checksum_seen(conn, checksum):
+    """
+    Duplicate check against the unique checksum index (an index seek, so
+    its cost does not grow with the size of the history).
+    """
+    return conn.execute("SELECT 1 FROM items WHERE checksum = ?", (checksum,)).fetchone() is not None
+
+# Crockford base32, as in ULIDs (no I, L, O or U), so IDs sort as strings
+ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ID_LENGTH = 26
+
+def encode_item_id(value):
+    chars = []
+    for _ in range(ID_LENGTH):
+        value, digit = divmod(value, 32)
+        chars.append(ID_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+def new_item_id(created, checksum):
+    """
+    Returns a ULID-style item ID: 48 bits of creation time (ms since the
+    epoch) then the first 80 bits of the item's checksum, as 26 base32
+    characters. IDs sort by creation time and the same item always gets the
+    same ID; since stored checksums are unique, two items can only collide
+    if their checksums share 80 bits, and the UNIQUE item_id index would
+    refuse that insert rather than store a duplicate ID.
+    """
+    milliseconds = int(created.timestamp() * 1000)
+    return encode_item_id((milliseconds << 80) | int(checksum[:20], 16))
+
+def query_items_created(conn, start, end, columns="*"):
+    """
+    Returns items created in [start, end) (datetimes), oldest first, by a
+    range scan of the item_id index.
+    """
+    low = encode_item_id(int(start.timestamp() * 1000) << 80)
+    high = encode_item_id(int(end.timestamp() * 1000) << 80)
+    return conn.execute(
+        f"SELECT {columns} FROM items WHERE item_id >= ? AND item_id < ? "
+        "ORDER BY item_id",
+        (low, high),
+    ).fetchall()
+
+def insert_item(conn, row, body):
+    """
+    Inserts one item (a log-style row plus its cleaned body) and returns its
+    row id, or None, without inserting, if an item with the same checksum
+    is already stored. Call inside a transaction; the caller commits in
+    batches.
+    """
+    columns = row_to_columns(row)
+    columns["body"] = body
+    names = ", ".join(columns)
+    marks = ", ".join("?" for _ in columns)
+    cursor = conn.execute(
+        f"INSERT INTO items ({names}) VALUES ({marks}) ON CONFLICT (checksum) DO NOTHING",
+        tuple(columns.values()),
+    )
+    return cursor.lastrowid if cursor.rowcount == 1 else None
+
+def store_passage(conn, name, text):
+    """
+    Keeps one copy of each passage's text (exports append it to every item).
+    """
+    conn.execute(
+        "INSERT INTO passages (name, text) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET text = excluded.text",
+        (name, text),
+    )
+
+def load_file_mark(conn, path):
+    """
+    Returns the high-water mark saved for a tier file, or None.
+    """
+    row = conn.execute(
+        "SELECT text_offset, records_offset, fingerprint FROM file_marks WHERE path = ?",
+        (os.path.normpath(path),),
+    ).fetchone()
+    return dict(row) if row else None
+
+def save_file_mark(conn, path, mark):
+    conn.execute(
+        "INSERT INTO file_marks (path, text_offset, records_offset, fingerprint) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (path) DO UPDATE SET text_offset = excluded.text_offset, "
+        "records_offset = excluded.records_offset, fingerprint = excluded.fingerprint",
+        (os.path.normpath(path), mark["text_offset"], mark["records_offset"], mark["fingerprint"]),
+    )
+
+def import_legacy_log(conn, base_output_dir):
+    """
+    One-time import of item_metadata_log.csv, with each item's body read
+    back from its per-item file when that file still exists.
+
+    The old random IDs were only unique within a run, so items are re-keyed
+    with new_item_id (dated from their run's folder name) and the old ID is
+    kept in legacy_id.
+    """
+    csv_filename = os.path.join(base_output_dir, LEGACY_CSV_FILENAME)
+    if not os.path.isfile(csv_filename):
+        return
+    log_modified = datetime.fromtimestamp(os.path.getmtime(csv_filename))
+
+    imported = 0
+    with open(csv_filename, 'r', newline='', encoding='utf-8') as f, conn:
+        for row in csv.DictReader(f):
+            if not row.get("Checksum"):
+                continue
+            body, passage_text = read_item_file(base_output_dir, row)
+            try:
+                created = datetime.strptime(row["Run Timestamp"], "Items %Y-%m-%d %H-%M-%S")
+            except (TypeError, ValueError):
+                created = log_modified
+            item_row = insert_item(conn, dict(row, **{"Random ID": new_item_id(created, row["Checksum"])}), body)
+            if item_row:
+                conn.execute("UPDATE items SET legacy_id = ? WHERE id = ?", (row["Random ID"], item_row))
+                imported += 1
+            if passage_text and row.get("Passage"):
+                store_passage(conn, row["Passage"], passage_text)
+
+    print(f"Imported {imported} items from {csv_filename} into the item database.")
+
+def item_file_name(row):
+    """
+    The per-item file name Item_Breakup has always used.
+    """
+    return f"{row['Standard'].strip()} {row['Random ID']} {row['Passage']}"
+
+def read_item_file(base_output_dir, row):
+    """
+    Returns (body, passage text) from a legacy per-item file, or (None, None).
+    """
+    path = os.path.join(base_output_dir, row["Run Timestamp"], item_file_name(row))
+    if not os.path.isfile(path):
+        return None, None
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Drop the "Standard:/ID:/Passage:" header, then split off the passage
+    _, _, content = content.partition("\n\n")
+    body, _, passage_text = content.partition(PASSAGE_HEADER)
+    return body, passage_text or None
+
+def query_items(conn, columns="*", **filters):
+    """
+    Returns stored items matching column=value filters, e.g.
+    query_items(conn, standard="RL 8.1", llm="GPT").
+    """
+    unknown = set(filters) - set(COLUMN_NAMES.values())
+    if unknown:
+        raise ValueError(f"Unknown item columns: {', '.join(sorted(unknown))}")
+    where = " AND ".join(f"{column} = ?" for column in filters) or "1"
+    return conn.execute(f"SELECT {columns} FROM items WHERE {where} ORDER BY id", tuple(filters.values())).fetchall()
+
+def export_value(item, column):
+    """
+    Formats a stored value the way the CSV log has always shown it.
+    """
+    value = item[column]
+    if value is None:
+        return "N/A"
+    if column in EXPORT_DIGITS:
+        return f"{value:.{EXPORT_DIGITS[column]}f}"
+    return value
+
+def export_items(conn, export_dir, **filters):
+    """
+    Writes matching items in the classic layout: one "<Standard> <ID>
+    <Passage>" text file per item plus an item_metadata_log.csv.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    passages = dict(conn.execute("SELECT name, text FROM passages").fetchall())
+    items = query_items(conn, **filters)
+
+    csv_rows = []
+    for item in items:
+        row = {field: export_value(item, column) for field, column in COLUMN_NAMES.items()}
+
+        passage_text = passages.get(item["passage"])
+        full_passage_content = f"{PASSAGE_HEADER}{passage_text}" if passage_text else ""
+        file_content = (
+            f"Standard: {item['standard']}\n"
+            f"ID: {item['item_id']}\n"
+            f"Passage: {item['passage']}\n\n"
+            f"{item['body'] or ''}"
+            f"{full_passage_content}"
+        )
+        with open(os.path.join(export_dir, item_file_name(row)), 'w', encoding='utf-8') as out_f:
+            out_f.write(file_content)
+        csv_rows.append(row)
+
+    with open(os.path.join(export_dir, LEGACY_CSV_FILENAME), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(COLUMN_NAMES))
+        writer.writeheader()
+        writer.writerows(csv_rows)
+
+    print(f"Exported {len(items)} items to: {export_dir}")
+    return len(items)
+
+def parquet_schema():
+    """
+    The typed schema of the Parquet export (all items columns but the body).
+    """
+    import pyarrow as pa
+
+    # Parquet dictionary-encodes repetitive strings (passage, tier, llm) on
+    # its own, so they stay plain strings in the schema
+    return pa.schema([
+        ("item_id", pa.string()),
+        ("run", pa.string()),
+        ("standard", pa.string()),
+        ("passage", pa.string()),
+        ("tier", pa.string()),
+        ("llm", pa.string()),
+        ("item_index", pa.int32()),
+        ("temperature", pa.float32()),
+        ("input_tokens", pa.int32()),
+        ("output_tokens", pa.int32()),
+        ("total_tokens", pa.int32()),
+        ("elapsed", pa.float32()),
+        ("ttft", pa.float32()),
+        ("generation_time", pa.float32()),
+        ("tokens_per_sec", pa.float32()),
+        ("cache_write_tokens", pa.int32()),
+        ("cache_read_tokens", pa.int32()),
+        ("retries", pa.int32()),
+        ("checksum", pa.string()),
+        ("legacy_id", pa.string()),
+    ])
+
+def export_parquet(conn, dataset_dir=None, **filters):
+    """
+    Writes matching items' metadata as a zstd-compressed Parquet dataset
+    partitioned by standard and run (hive layout, e.g.
+    standard=RL%208.1/run=Items%20.../part-0.parquet). Partitions being
+    written replace any earlier copy; other partitions are kept, so a run
+    can be added without rewriting the rest. Needs pyarrow.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if dataset_dir is None:
+        dataset_dir = os.path.join(STORE_DIR, PARQUET_DIRNAME)
+    schema = parquet_schema()
+    items = query_items(conn, ", ".join(schema.names), **filters)
+    table = pa.Table.from_pylist([dict(item) for item in items], schema=schema)
+
+    ds.write_dataset(
+        table,
+        dataset_dir,
+        format="parquet",
+        partitioning=["standard", "run"],
+        partitioning_flavor="hive",
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+    print(f"Wrote {len(items)} items to the Parquet dataset: {dataset_dir}")
+    return len(items)
+
+def export_menu():
+    """
+    Lets the user export one run, or every stored item, to files or to the
+    Parquet dataset.
+    """
+    conn = open_item_store()
+    runs = [r[0] for r in conn.execute("SELECT run FROM items GROUP BY run ORDER BY run")]
+
+    print("\n" + "="*40)
+    print("   Export Items to Files")
+    print("="*40)
+    print("0. [EXPORT ALL ITEMS]")
+    for i, run in enumerate(runs, 1):
+        print(f"{i}. {run}")
+    print("="*40)
+
+    choice_str = input("\nSelect a run number (or '0' for all): ").strip()
+    filters = {}
+    if choice_str not in ('0', 'all'):
+        try:
+            filters["run"] = runs[int(choice_str) - 1]
+        except (ValueError, IndexError):
+            print("Invalid selection.")
+            return
+
+    format_str = input("Export as 1. text files + CSV or 2. Parquet dataset? (1/2): ").strip()
+    if format_str == '2':
+        export_parquet(conn, **filters)
+    else:
+        timestamp_str = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+        export_items(conn, os.path.join(STORE_DIR, f"Export {timestamp_str}"), **filters)
+    conn.close()
+
+if __name__ == "__main__":
+    export_menu()